@@ -0,0 +1,199 @@
+"""배치 파이프라인 - 여러 원고를 동시에 처리하여 비디오를 대량 생성합니다."""
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from main_ import full_pipeline
+from utils.api_limits import configure_api_concurrency
+from utils.time_utils import format_hms
+
+
+def _item_id(item: Dict[str, Any], index: int) -> str:
+    """배치 항목 ID (출력 디렉터리 이름으로도 사용)를 결정합니다.
+
+    Raises:
+        ValueError: ID가 `.` / `..` 처럼 점으로만 이루어진 경우 (output_root 밖으로 벗어남)
+    """
+    raw = str(item.get("id") or f"item_{index:04d}")
+    item_id = re.sub(r"[^\w.-]", "_", raw)
+    if not item_id.strip("."):
+        raise ValueError(f"배치 항목 {index}의 id를 출력 디렉터리 이름으로 쓸 수 없습니다: {raw!r}")
+    return item_id
+
+
+def resolve_item_ids(items: List[Dict[str, Any]]) -> List[str]:
+    """항목 순서대로 고유한 ID를 반환합니다.
+
+    같은 ID(정리 후 기준)가 이미 쓰였으면 `_{index}`를 붙여, 동시에 실행되는 항목이
+    같은 출력 디렉터리를 공유하며 서로의 결과를 덮어쓰지 않게 합니다.
+
+    Raises:
+        ValueError: 출력 디렉터리 이름으로 쓸 수 없는 ID가 있는 경우
+    """
+    item_ids: List[str] = []
+    used = set()
+    for index, item in enumerate(items):
+        item_id = _item_id(item, index)
+        if item_id in used:
+            item_id = f"{item_id}_{index}"
+        suffix = 1
+        while item_id in used:
+            item_id = f"{_item_id(item, index)}_{index}_{suffix}"
+            suffix += 1
+        used.add(item_id)
+        item_ids.append(item_id)
+    return item_ids
+
+
+def batch_pipeline(
+    items: List[Dict[str, Any]],
+    output_root: str,
+    max_workers: int = 2,
+    api_limits: Optional[Dict[str, int]] = None,
+    **common_options: Any,
+) -> List[Dict[str, Any]]:
+    """
+    배치 비디오 생성 파이프라인
+
+    각 항목을 `full_pipeline`으로 처리하되, 최대 `max_workers`개를 동시에 실행합니다.
+    외부 API 동시 요청 수는 항목 수와 관계없이 공급자별로 전역 제한되며,
+    캐시(챕터 분할/이미지/TTS)는 프로세스 안에서 모든 항목이 공유합니다.
+    한 항목이 실패해도 나머지 항목은 계속 처리됩니다.
+
+    Args:
+        items: 배치 항목 리스트. 각 항목은 `manuscript`(필수)와 선택적 `id`,
+            그리고 항목별로 덮어쓸 `full_pipeline` 옵션을 가질 수 있습니다.
+        output_root: 출력 루트 디렉터리 (항목별 하위 디렉터리에 저장)
+        max_workers: 동시에 처리할 최대 항목 수 (기본값: 2)
+        api_limits: 공급자별 동시 요청 수
+            (예: {"openai_images": 8, "openai_responses": 4, "google_tts": 16})
+        **common_options: 모든 항목에 공통으로 적용할 `full_pipeline` 옵션
+
+    Returns:
+        항목 순서대로 정렬된 결과 리스트
+        - 성공: {"id", "status": "success", "result", "elapsed"}
+        - 실패: {"id", "status": "error", "error", "elapsed"}
+    """
+    item_ids = resolve_item_ids(items)
+    if api_limits:
+        configure_api_concurrency(**api_limits)
+
+    output_root = os.path.abspath(output_root)
+    os.makedirs(output_root, exist_ok=True)
+
+    def run_item(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        item_id = item_ids[index]
+        start = time.time()
+        try:
+            options = dict(common_options)
+            options.update({k: v for k, v in item.items() if k not in ("id", "manuscript")})
+            options["output_dir"] = os.path.join(output_root, item_id)
+            result = full_pipeline(manuscript=item["manuscript"], **options)
+            return {
+                "id": item_id,
+                "status": "success",
+                "result": result,
+                "elapsed": time.time() - start,
+            }
+        except Exception as e:
+            print(f"❌ 배치 항목 실패 [{item_id}]: {e}")
+            return {
+                "id": item_id,
+                "status": "error",
+                "error": f"{type(e).__name__}: {e}",
+                "elapsed": time.time() - start,
+            }
+
+    batch_start = time.time()
+    workers = max(1, min(max_workers, len(items) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_item, i, item) for i, item in enumerate(items)]
+        results = [future.result() for future in futures]
+
+    succeeded = sum(1 for r in results if r["status"] == "success")
+    print("\n====================================")
+    print(f"📦 배치 완료: 성공 {succeeded} / 전체 {len(results)}")
+    print(f"⏱ 전체 소요 시간: {format_hms(time.time() - batch_start)}")
+    print("====================================\n")
+
+    return results
+
+
+def _load_items(paths: List[str]) -> List[Dict[str, Any]]:
+    """CLI 입력 파일을 배치 항목으로 변환합니다.
+
+    - `.jsonl`: 한 줄에 하나의 항목 JSON
+    - 그 외: 파일 전체를 하나의 원고로 사용 (id = 파일 이름)
+    """
+    items: List[Dict[str, Any]] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                items.extend(json.loads(line) for line in f if line.strip())
+            else:
+                name = os.path.splitext(os.path.basename(path))[0]
+                items.append({"id": name, "manuscript": f.read()})
+    return items
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="여러 원고로 비디오를 일괄 생성합니다.")
+    parser.add_argument("inputs", nargs="+", help="원고 .txt 파일 또는 항목 .jsonl 파일")
+    parser.add_argument("--output-dir", default="./outputs/batch")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 처리할 원고 수")
+    parser.add_argument("--images-limit", type=int, default=None, help="OpenAI 이미지 동시 요청 수")
+    parser.add_argument("--responses-limit", type=int, default=None, help="OpenAI 응답 동시 요청 수")
+    parser.add_argument("--tts-limit", type=int, default=None, help="Google TTS 동시 요청 수")
+    parser.add_argument("--google-key-file", default=None)
+    parser.add_argument("--tts-voice", default=None)
+    parser.add_argument("--bgm-genre", default=None)
+    parser.add_argument("--bgm-type", default=None)
+    parser.add_argument("--bgm-volume", type=int, default=30)
+    parser.add_argument("--video-encoder", default="auto")
+    parser.add_argument(
+        "--subtitle-mode",
+        default="burn",
+        choices=["burn", "soft", "sprite"],
+        help="자막 방식 (항목 JSON의 subtitle_mode가 우선)",
+    )
+    parser.add_argument(
+        "--stream-segments", action="store_true", help="챕터 분할 응답을 스트리밍으로 받아 이미지 생성을 앞당김"
+    )
+    parser.add_argument("--resume", action="store_true", help="항목별 실행 매니페스트에서 이어서 진행")
+    args = parser.parse_args()
+
+    limits = {
+        name: value
+        for name, value in (
+            ("openai_images", args.images_limit),
+            ("openai_responses", args.responses_limit),
+            ("google_tts", args.tts_limit),
+        )
+        if value is not None
+    }
+
+    batch_results = batch_pipeline(
+        _load_items(args.inputs),
+        output_root=args.output_dir,
+        max_workers=args.workers,
+        api_limits=limits,
+        google_key_file=args.google_key_file,
+        tts_voice=args.tts_voice,
+        bgm_genre=args.bgm_genre,
+        bgm_type=args.bgm_type,
+        bgm_volume=args.bgm_volume,
+        video_encoder=args.video_encoder,
+        subtitle_mode=args.subtitle_mode,
+        stream_segments=args.stream_segments,
+        resume=args.resume,
+    )
+
+    results_path = os.path.join(os.path.abspath(args.output_dir), "batch_results.json")
+    with open(results_path, "w", encoding="utf-8") as f:
+        json.dump(batch_results, f, ensure_ascii=False, indent=2)
+    print(f"📝 배치 결과 저장: {results_path}")
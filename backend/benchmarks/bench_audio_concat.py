@@ -0,0 +1,108 @@
+"""TTS 청크 오디오 병합 벤치마크 - moviepy 방식과 디코딩 없는 병합 방식을 비교합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bench_audio_concat --hours 2 --chunk-seconds 120
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from utils.audio_utils import FFMPEG, concat_audio_files
+
+METHODS = ["moviepy", "ffmpeg", "bytes"]
+
+
+def make_synthetic_chunks(work_dir: str, total_seconds: float, chunk_seconds: float) -> List[str]:
+    """Google TTS MP3 출력과 비슷한 형식(24kHz mono)의 합성 청크들을 만듭니다."""
+    template = os.path.join(work_dir, "template.mp3")
+    subprocess.run(
+        [
+            FFMPEG, "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=24000:duration={chunk_seconds}",
+            "-ac", "1", "-c:a", "libmp3lame", "-b:a", "32k",
+            template,
+        ],
+        check=True,
+    )
+
+    count = max(1, int(round(total_seconds / chunk_seconds)))
+    paths = []
+    for index in range(count):
+        path = os.path.join(work_dir, f"chunk_{index}.mp3")
+        shutil.copyfile(template, path)
+        paths.append(path)
+    return paths
+
+
+def run_one(method: str, paths: List[str], output_path: str) -> Dict[str, float]:
+    """한 가지 병합 방식을 실행하고 소요 시간과 최대 메모리를 측정합니다."""
+    start = time.perf_counter()
+    concat_audio_files(paths, output_path, method=method)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss: Linux는 KB 단위
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return {
+        "method": method,
+        "seconds": elapsed,
+        "peak_rss_mb": max(self_rss, child_rss),
+        "output_mb": os.path.getsize(output_path) / 1024 ** 2,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, default=2.0)
+    parser.add_argument("--chunk-seconds", type=float, default=120.0)
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # 자식 프로세스: 방식별로 별도 프로세스에서 측정해야 최대 메모리가 섞이지 않음
+    if args.run_one:
+        with open(os.path.join(args.work_dir, "chunks.json"), "r", encoding="utf-8") as f:
+            paths = json.load(f)
+        output_path = os.path.join(args.work_dir, f"out_{args.run_one}.mp3")
+        print(json.dumps(run_one(args.run_one, paths, output_path)))
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        print(f"▶ 합성 오디오 생성: {args.hours}시간, 청크 {args.chunk_seconds}초")
+        paths = make_synthetic_chunks(work_dir, args.hours * 3600, args.chunk_seconds)
+        with open(os.path.join(work_dir, "chunks.json"), "w", encoding="utf-8") as f:
+            json.dump(paths, f)
+
+        results = []
+        for method in args.methods:
+            proc = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_audio_concat",
+                    "--run-one", method, "--work-dir", work_dir,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"\n청크 {len(paths)}개")
+    print(f"{'method':<10}{'seconds':>10}{'peak RSS(MB)':>15}{'output(MB)':>12}")
+    for r in results:
+        print(
+            f"{r['method']:<10}{r['seconds']:>10.2f}"
+            f"{r['peak_rss_mb']:>15.1f}{r['output_mb']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""전체 파이프라인 오프라인 벤치마크 - 대체 클라이언트로 원고 크기별 스테이지 성능을 측정합니다.
+
+OpenAI / Google TTS 자격 증명 없이 `full_pipeline`을 끝까지 실행합니다 (ffmpeg는 필요).
+결과는 트레이스 스팬에서 스테이지별 소요 시간, 외부 호출 수, 재시도 횟수를 모아 출력합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bench_pipeline --scenarios 1k 10k 50k
+    python -m benchmarks.bench_pipeline --scenarios 200k --latency 0.3 --failure-rate 0.05
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from benchmarks.fake_clients import FakeOpenAIClient, FakeTTSClient
+from main_ import full_pipeline
+from utils.auth import reset_clients, set_client_overrides
+from utils.rate_limiter import DEFAULT_RATE_LIMITS, configure_rate_limits
+
+# 시나리오: 원고 글자 수와 챕터 수
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "1k": {"chars": 1_000, "chapters": 3},
+    "10k": {"chars": 10_000, "chapters": 6},
+    "50k": {"chars": 50_000, "chapters": 12},
+    "200k": {"chars": 200_000, "chapters": 24},
+    "500k": {"chars": 500_000, "chapters": 40},
+}
+
+_WORDS = [
+    "바람이", "조용히", "마을을", "지나갔다", "그는", "오래된", "편지를", "펼쳤다",
+    "강물은", "어둠", "속에서", "빛났고", "사람들은", "서로를", "바라보았다", "문득",
+    "기억이", "떠올랐다", "길은", "멀었지만", "발걸음은", "가벼웠다", "하늘에는", "별이",
+]
+
+
+def make_manuscript(chars: int, seed: int = 0) -> str:
+    """지정한 길이의 결정적인 한국어 합성 원고를 만듭니다."""
+    rng = random.Random(seed)
+    sentences: List[str] = []
+    length = 0
+    while length < chars:
+        words = rng.sample(_WORDS, rng.randint(4, 9))
+        sentence = " ".join(words) + rng.choice([".", ".", ".", "!", "?"])
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)[:chars]
+
+
+def summarize_trace(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """트레이스 스팬에서 스테이지별 시간, 호출 수, 재시도, 캐시 적중을 집계합니다."""
+    stages = {}
+    calls: Counter = Counter()
+    seconds: Counter = Counter()
+    retries = 0
+    cache_hits = 0
+    for record in spans:
+        attributes = record["attributes"]
+        kind = attributes.get("kind")
+        if kind == "stage":
+            stages[attributes["stage"]] = round(record["duration"] or 0.0, 3)
+        elif kind in ("api", "ffmpeg"):
+            calls[record["name"]] += 1
+            seconds[record["name"]] += record["duration"] or 0.0
+        retries += attributes.get("retries", 0)
+        cache_hits += 1 if attributes.get("cache_hit") else 0
+    return {
+        "stages": stages,
+        "calls": dict(calls),
+        "call_seconds": {name: round(value, 3) for name, value in seconds.items()},
+        "retries": retries,
+        "cache_hits": cache_hits,
+    }
+
+
+def run_scenario(name: str, args: argparse.Namespace, work_dir: str) -> Dict[str, Any]:
+    """시나리오 하나를 새 출력 디렉터리에서 실행하고 측정 결과를 반환합니다."""
+    scenario = SCENARIOS[name]
+    chapters = args.chapters or scenario["chapters"]
+    manuscript = make_manuscript(scenario["chars"], seed=args.seed)
+
+    set_client_overrides(
+        openai_client=FakeOpenAIClient(
+            chapter_count=chapters,
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+            chunk_latency=args.llm_chunk_latency,
+        ),
+        tts_client=FakeTTSClient(
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            seed=args.seed + 1,
+        ),
+    )
+
+    # tts_pipe의 GCP 인증 설정을 통과시키기 위한 빈 키 파일
+    key_file = os.path.join(work_dir, "fake_gcp_key.json")
+    with open(key_file, "w", encoding="utf-8") as f:
+        f.write("{}")
+
+    output_dir = os.path.join(work_dir, name)
+    start = time.perf_counter()
+    try:
+        result = full_pipeline(
+            manuscript=manuscript,
+            output_dir=output_dir,
+            google_key_file=key_file,
+            img_size=args.img_size,
+            use_cache=args.use_cache,
+            video_encoder=args.video_encoder,
+            render_mode=args.render_mode,
+            subtitle_mode=args.subtitle_mode,
+            stream_segments=args.stream_segments,
+        )
+    except Exception as e:
+        return {
+            "scenario": name,
+            "chars": scenario["chars"],
+            "chapters": chapters,
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+    finally:
+        reset_clients()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "chars": scenario["chars"],
+        "chapters": chapters,
+        "status": "success",
+        "seconds": round(elapsed, 3),
+        "chars_per_second": round(scenario["chars"] / elapsed, 1),
+        "video_mb": round(os.path.getsize(result["output_video"]) / 1024 ** 2, 2),
+        **summarize_trace(result["trace_spans"]),
+    }
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    stage_names = ["t2i", "prep", "tts", "sync", "render"]
+    header = f"{'scenario':>9} {'chars':>8} {'ch':>3} {'total':>8} " + " ".join(
+        f"{name:>8}" for name in stage_names
+    ) + f" {'retries':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if r["status"] != "success":
+            print(f"{r['scenario']:>9} {r['chars']:>8} {r['chapters']:>3}  ❌ {r['error']}")
+            continue
+        stages = " ".join(f"{r['stages'].get(name, 0.0):8.2f}" for name in stage_names)
+        print(
+            f"{r['scenario']:>9} {r['chars']:>8} {r['chapters']:>3} {r['seconds']:8.2f} "
+            f"{stages} {r['retries']:>7}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", nargs="+", default=["1k", "10k", "50k"], choices=list(SCENARIOS))
+    parser.add_argument("--chapters", type=int, default=None, help="시나리오 기본 챕터 수 대신 사용할 값")
+    parser.add_argument("--latency", type=float, default=0.0, help="대체 API 호출당 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 지연 최대값(초)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="대체 API 호출 실패 확률")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--img-size", default="1536x1024")
+    parser.add_argument("--video-encoder", default="libx264")
+    parser.add_argument("--render-mode", default="single", choices=["single", "parallel", "event"])
+    parser.add_argument("--subtitle-mode", default="burn", choices=["burn", "soft", "sprite"])
+    parser.add_argument(
+        "--llm-chunk-latency", type=float, default=0.0,
+        help="챕터 분할 응답 조각당 생성 시간(초)",
+    )
+    parser.add_argument("--stream-segments", action="store_true", help="챕터 분할 스트리밍 모드")
+    parser.add_argument("--use-cache", action="store_true", help="디스크 캐시 사용 (기본: 사용 안 함)")
+    parser.add_argument("--real-rate-limits", action="store_true", help="공급자 레이트 리밋 유지")
+    parser.add_argument("--keep-outputs", action="store_true")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    # 벤치마크 캐시가 실제 캐시를 오염시키지 않도록 분리
+    os.environ["VIDEO_CACHE_DIR"] = os.path.join(work_dir, "cache")
+    if not args.real_rate_limits:
+        configure_rate_limits(
+            **{provider: {"rpm": None, "tpm": None} for provider in DEFAULT_RATE_LIMITS}
+        )
+
+    results = []
+    try:
+        for name in args.scenarios:
+            print(f"\n🏁 시나리오 {name} 시작")
+            results.append(run_scenario(name, args, work_dir))
+    finally:
+        if not args.keep_outputs:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print()
+    print_table(results)
+    if args.keep_outputs:
+        print(f"\n📁 출력 보존: {work_dir}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"📝 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
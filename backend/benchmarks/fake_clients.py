@@ -0,0 +1,243 @@
+"""오프라인 벤치마크용 대체 클라이언트 - OpenAI / Google TTS 없이 파이프라인을 실행합니다.
+
+`utils.auth.set_client_overrides`로 설치하면 `full_pipeline`이 실제 API 대신 사용합니다.
+
+- FakeOpenAIClient: 결정적인 챕터 JSON(`responses.create`, `stream=True` 지원)과 단색 PNG(`images.generate`)
+- FakeTTSClient: SSML mark 시각이 포함된 무음 MP3(`synthesize_speech`)
+
+두 클라이언트 모두 호출 지연(latency)과 실패율(failure_rate)을 설정할 수 있으며,
+실패는 재시도 대상인 503 오류로 발생하므로 재시도/서킷 브레이커 경로도 함께 측정됩니다.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+# 합성 음성 속도 (speaking_rate 1.0 기준 초당 글자 수)
+CHARS_PER_SECOND = 7.0
+
+# MPEG-2 Layer III, 32kbps, 24kHz, mono 프레임 (Google TTS MP3 출력과 같은 계열)
+# 프레임 크기 = 72000 * 32 / 24000 = 96 바이트, 프레임당 576 샘플 (24ms)
+_MP3_FRAME_HEADER = bytes([0xFF, 0xF3, 0x44, 0xC0])
+_MP3_FRAME_SIZE = 96
+_MP3_FRAME_SECONDS = 576 / 24000
+
+# 스트리밍 응답 한 조각(delta)의 글자 수
+STREAM_CHUNK_CHARS = 32
+
+_MARK_PATTERN = re.compile(r"<mark name='([^']+)'/>(.*?)(?:<break time='([\d.]+)s'/>|$)", re.S)
+
+
+class FakeAPIError(Exception):
+    """실제 SDK의 일시적 서버 오류를 흉내 냅니다 (재시도 대상)."""
+
+    status_code = 503
+
+
+class _FaultInjector:
+    """호출마다 지연을 주고, 설정된 확률로 실패시킵니다 (스레드 안전, 시드 고정)."""
+
+    def __init__(self, latency: float, jitter: float, failure_rate: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def __call__(self, name: str) -> None:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise FakeAPIError(f"{name}: injected failure")
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    body = kind + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+
+@lru_cache(maxsize=64)
+def synthetic_png(width: int, height: int, color: tuple) -> bytes:
+    """단색 RGB PNG를 만듭니다 (Pillow 없이 zlib만 사용)."""
+    row = b"\x00" + bytes(color) * width
+    raw = row * height
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(raw, 6))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def synthetic_mp3(seconds: float) -> bytes:
+    """주어진 길이의 무음 MP3(MPEG-2 Layer III 프레임 나열)를 만듭니다."""
+    frames = max(1, int(round(seconds / _MP3_FRAME_SECONDS)))
+    frame = _MP3_FRAME_HEADER + b"\x00" * (_MP3_FRAME_SIZE - len(_MP3_FRAME_HEADER))
+    return frame * frames
+
+
+def _split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in re.findall(r"[^.!?]+[.!?]?", text) if s.strip()]
+
+
+def fake_chapters(text: str, chapter_count: int) -> List[Dict[str, Any]]:
+    """원문을 문장 단위로 균등 분할한 결정적 챕터 리스트를 만듭니다."""
+    sentences = _split_sentences(text) or [text]
+    chapter_count = max(1, min(chapter_count, len(sentences)))
+    chapters = []
+    for index in range(chapter_count):
+        first = sentences[index * len(sentences) // chapter_count]
+        seed = _digest(f"{index}:{first}").hex()[:8]
+        chapters.append(
+            {
+                "chapter_number": index + 1,
+                "chapter_title": f"챕터{index + 1}",
+                "chapter_summary": first,
+                "chapter_start_sentence": first,
+                "Era/Style": f"Synthetic style {seed}.",
+                "Scene": f"Synthetic scene {seed}.",
+                "Environment": "Flat studio lighting.",
+                "Mood/Tone": "Calm.",
+                "Symbolic_imagery": "A single color field.",
+                "Context_bleed": "None.",
+                "Output_requirements": "no text",
+            }
+        )
+    return chapters
+
+
+class _FakeResponses:
+    def __init__(self, owner: "FakeOpenAIClient"):
+        self._owner = owner
+
+    def create(
+        self,
+        model: str,
+        input: str,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ):
+        self._owner.faults("responses.create")
+        # 입력 = 프롬프트 JSON + "\n\n" + 원문
+        text = input.split("\n\n", 1)[-1]
+        payload = json.dumps(
+            {"chapters": fake_chapters(text, self._owner.chapter_count)},
+            ensure_ascii=False,
+        )
+        output_text = f"```json\n{payload}\n```"
+        pieces = [
+            output_text[i:i + STREAM_CHUNK_CHARS]
+            for i in range(0, len(output_text), STREAM_CHUNK_CHARS)
+        ]
+        if stream:
+            return self._stream(pieces)
+
+        # 비스트리밍 응답은 생성이 모두 끝난 뒤 반환
+        if self._owner.chunk_latency > 0:
+            time.sleep(self._owner.chunk_latency * len(pieces))
+        message = SimpleNamespace(content=[SimpleNamespace(text=output_text)])
+        return SimpleNamespace(output_text=output_text, output=[message])
+
+    def _stream(self, pieces: List[str]):
+        """Responses API 스트리밍 이벤트(`response.output_text.delta`)를 흉내 냅니다."""
+        for piece in pieces:
+            if self._owner.chunk_latency > 0:
+                time.sleep(self._owner.chunk_latency)
+            yield SimpleNamespace(type="response.output_text.delta", delta=piece)
+        yield SimpleNamespace(type="response.completed")
+
+
+class _FakeImages:
+    def __init__(self, owner: "FakeOpenAIClient"):
+        self._owner = owner
+
+    def generate(self, model: str, prompt: str, size: str = "1024x1024", **kwargs: Any):
+        self._owner.faults("images.generate")
+        width, height = (int(v) for v in size.split("x"))
+        color = tuple(_digest(prompt)[:3])
+        png = synthetic_png(width, height, color)
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=base64.b64encode(png).decode())])
+
+
+class FakeOpenAIClient:
+    """OpenAI 클라이언트 대체 객체.
+
+    Args:
+        chapter_count: 응답할 챕터 수 (문장 수보다 많으면 문장 수로 제한)
+        latency: 호출당 기본 지연(초)
+        jitter: 추가 지연 최대값(초, 균등 분포)
+        failure_rate: 호출 실패 확률 (0~1)
+        seed: 지연/실패 난수 시드
+        chunk_latency: 챕터 분할 응답의 조각(`STREAM_CHUNK_CHARS`자)당 생성 시간(초).
+            응답 길이에 비례하는 LLM 생성 시간을 흉내 내며, 스트리밍이면 조각마다 나눠 도착합니다.
+    """
+
+    def __init__(
+        self,
+        chapter_count: int = 3,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        chunk_latency: float = 0.0,
+    ):
+        self.chapter_count = chapter_count
+        self.chunk_latency = chunk_latency
+        self.faults = _FaultInjector(latency, jitter, failure_rate, seed)
+        self.responses = _FakeResponses(self)
+        self.images = _FakeImages(self)
+
+
+class FakeTTSClient:
+    """Google TextToSpeechClient 대체 객체.
+
+    SSML의 `<mark>` 이름과 문장 길이로 시각을 계산해 timepoints를 돌려주고,
+    같은 길이의 무음 MP3를 `audio_content`로 반환합니다.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 1,
+        chars_per_second: float = CHARS_PER_SECOND,
+    ):
+        self.chars_per_second = chars_per_second
+        self.faults = _FaultInjector(latency, jitter, failure_rate, seed)
+
+    def synthesize_speech(self, request: Any = None, **kwargs: Any):
+        self.faults("synthesize_speech")
+        ssml = request.input.ssml
+        rate = request.audio_config.speaking_rate or 1.0
+
+        timepoints = []
+        position = 0.0
+        for name, sentence, pause in _MARK_PATTERN.findall(ssml):
+            timepoints.append(SimpleNamespace(mark_name=name, time_seconds=position))
+            position += len(sentence) / (self.chars_per_second * rate)
+            position += float(pause or 0)
+
+        return SimpleNamespace(audio_content=synthetic_mp3(position), timepoints=timepoints)
@@ -2,14 +2,68 @@
 
 import os
 import time
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from pipeline.t2i_pipeline import t2i_pipe
 from pipeline.tts_pipeline import tts_pipe
-from pipeline.sync_pipeline import sync_pipe
-from pipeline.render_pipeline import ren_pipe
+from pipeline.sync_pipeline import resolve_bgm, sync_pipe
+from pipeline.render_pipeline import RENDER_MODES, ren_pipe, resolve_render_size
+from utils.cache_utils import make_cache_key
+from utils.encoder_utils import SUPPORTED_ENCODERS
+from utils.image_prep import prepare_chapter_images
+from utils.img_gen_prompt import get_chapter_image_filename, get_default_img_prompt
+from utils.run_manifest import RunManifest
+from utils.sentence_index import sentence_index_path
+from utils.stage_scheduler import StageFunc, run_stage_graph, print_stage_report
+from utils.subtitle_modes import validate_subtitle_mode
 from utils.text_normalizer import normalize_text
 from utils.time_utils import format_hms
+from utils.tracing import span, start_trace
+
+# 스테이지 요약 출력용 라벨
+STAGE_LABELS = {
+    "t2i": "🖼 T2I 단계",
+    "prep": "🪄 이미지 전처리 단계",
+    "tts": "🎤 TTS + 자막 단계",
+    "sync": "🎧 BGM 믹싱 단계",
+    "render": "🎬 렌더링 단계",
+}
+
+# 트레이스 내보내기 파일 이름 (output_dir 기준)
+TRACE_JSONL_FILENAME = "trace_spans.jsonl"
+TRACE_OTLP_FILENAME = "trace_otlp.json"
+
+
+def checkpointed_stage(
+    manifest: RunManifest,
+    name: str,
+    inputs_hash: str,
+    func: StageFunc,
+    output_files: Callable[[Any], List[str]],
+) -> StageFunc:
+    """스테이지 함수를 실행 매니페스트 체크포인트로 감쌉니다.
+
+    resume 모드에서 입력 해시가 같고 출력 파일이 남아 있는 완료 스테이지는
+    실행하지 않고 기록된 출력을 그대로 반환합니다.
+    스테이지 출력은 JSON으로 기록되므로 튜플은 리스트로 복원됩니다.
+    """
+    def run(results: Dict[str, Any]) -> Any:
+        if manifest.resume:
+            outputs = manifest.completed_outputs(name, inputs_hash)
+            if outputs is not None:
+                print(f"⏭ {STAGE_LABELS.get(name, name)} 건너뜀 (resume)")
+                return outputs
+
+        manifest.start_stage(name, inputs_hash)
+        try:
+            outputs = func(results)
+        except BaseException as exc:
+            manifest.fail_stage(name, exc)
+            raise
+        manifest.complete_stage(name, outputs, output_files(outputs))
+        return outputs
+
+    return run
 
 
 def full_pipeline(
@@ -28,11 +82,24 @@ def full_pipeline(
     img_prompt_json: Optional[str] = None,
     img_size: str = "1536x1024",
     img_quality: str = "low",
-) -> Dict[str, str]:
+    img_max_workers: int = 4,
+    tts_max_workers: int = 8,
+    use_cache: bool = True,
+    fuse_bgm_mix: bool = True,
+    video_encoder: str = "auto",
+    render_mode: str = "single",
+    subtitle_mode: str = "burn",
+    prescale_images: bool = True,
+    stream_segments: bool = False,
+    resume: bool = False,
+    progress_callback: Optional[Callable[[str, str], None]] = None,
+) -> Dict[str, Any]:
     """
     전체 비디오 생성 파이프라인
     
-    각 파이프라인 스테이지를 순차적으로 호출하여 최종 비디오를 생성합니다.
+    각 파이프라인 스테이지를 의존성 그래프에 따라 실행하여 최종 비디오를 생성합니다.
+    (T2I → 이미지 전처리)와 (TTS → BGM 믹싱)은 서로 독립적이므로 동시에 실행되고,
+    렌더링 단계에서 합류합니다.
     
     Args:
         manuscript: 원고 텍스트
@@ -50,14 +117,47 @@ def full_pipeline(
         img_prompt_json: 이미지 프롬프트 JSON (선택사항)
         img_size: 이미지 크기 (기본값: "1536x1024")
         img_quality: 이미지 품질 (기본값: "low")
+        img_max_workers: 동시에 진행할 최대 이미지 생성 요청 수 (기본값: 4)
+        tts_max_workers: 동시에 합성할 최대 TTS 청크 수 (기본값: 8)
+        use_cache: 디스크 캐시 사용 여부 (기본값: True)
+        fuse_bgm_mix: BGM 믹싱을 렌더링 ffmpeg 그래프에 합칠지 여부 (기본값: True)
+        video_encoder: 비디오 인코더 ("auto", "h264_nvenc", "libx264", "libx265")
+        render_mode: 렌더링 방식 ("single", 세그먼트 병렬 "parallel", 이벤트 기반 VFR "event")
+        subtitle_mode: 자막 방식 ("burn": 영상에 입힘, "soft": mov_text 트랙 + WebVTT 사이드카,
+            "sprite": 자막 줄별 PNG 스프라이트 overlay, single 모드 전용)
+        prescale_images: 챕터 이미지를 렌더링 해상도로 미리 리사이즈/크롭할지 여부 (기본값: True)
+        stream_segments: 챕터 분할 응답을 스트리밍으로 받아 완성된 챕터부터
+            이미지 생성을 시작할지 여부 (기본값: False)
+        resume: True이면 `output_dir`의 실행 매니페스트를 읽어 완료된 스테이지,
+            챕터 이미지, TTS 청크를 건너뜁니다 (기본값: False)
+        progress_callback: 스테이지 진행 콜백 (스테이지 이름, "started"/"completed"/"failed")
         
     Returns:
-        생성된 파일 경로들을 담은 딕셔너리
+        생성된 파일 경로들과 트레이스를 담은 딕셔너리
+        - trace_spans: 스테이지/외부 API 호출/ffmpeg 스팬 리스트
+          (소요 시간, 입출력 바이트, 재시도 횟수, 캐시 적중 여부)
+        - subtitle_vtt: WebVTT 사이드카 경로 (subtitle_mode="soft"일 때만, 아니면 None)
+        - trace_jsonl / trace_otlp: JSON Lines / OTLP JSON으로 내보낸 트레이스 파일 경로
+          (실패한 실행에서도 기록됨)
     """
     print("🎚 TTS SPEED =", tts_speed)
     print("🔊 TTS VOLUME =", tts_volume)
     print("🎵 BGM VOLUME =", bgm_volume)
 
+    # 옵션 검증 (T2I/TTS 비용이 발생하기 전에 실패)
+    validate_subtitle_mode(subtitle_mode)
+    if render_mode not in RENDER_MODES:
+        raise ValueError(
+            f"지원하지 않는 render_mode 입니다: {render_mode} (가능: {', '.join(RENDER_MODES)})"
+        )
+    if subtitle_mode == "sprite" and render_mode != "single":
+        raise ValueError("subtitle_mode='sprite'는 render_mode='single'에서만 지원합니다.")
+    if video_encoder != "auto" and video_encoder not in SUPPORTED_ENCODERS:
+        raise ValueError(
+            f"지원하지 않는 video_encoder 입니다: {video_encoder} "
+            f"(가능: auto, {', '.join(SUPPORTED_ENCODERS)})"
+        )
+
     total_start = time.time()
 
     # 출력 디렉터리 설정
@@ -73,69 +173,182 @@ def full_pipeline(
     # TTS 속도 변환 (100 → 1.0)
     tts_rate = (tts_speed or 100) / 100.0
 
-    # 1) 이미지 생성 (T2I)
-    print("\n▶ T2I 파이프라인 시작...")
-    t2i_start = time.time()
-    chapters, chapters_json_path = t2i_pipe(
-        input_text=txt_content,
-        output_dir=output_dir,
-        img_prompt_json=img_prompt_json,
-        img_size=img_size,
-        img_quality=img_quality,
-        total_start=total_start,
+    # 실행 매니페스트 (스테이지 입력 해시는 의존 스테이지 해시를 포함)
+    manifest = RunManifest(output_dir, resume=resume)
+    t2i_hash = make_cache_key(
+        "t2i", txt_content, img_prompt_json or get_default_img_prompt(), img_size, img_quality
     )
-    t2i_elapsed = time.time() - t2i_start
-    print(f"✔ T2I 파이프라인 완료: {format_hms(t2i_elapsed)}")
-
-    # 2) TTS + 자막 생성
-    print("\n▶ TTS + 자막 파이프라인 시작...")
-    tts_start = time.time()
-    tts_audio_path, subtitle_json_path = tts_pipe(
-        input_text=txt_content,
-        output_dir=output_dir,
-        google_key_file=google_key_file,
-        voice_name=tts_voice,
-        speaking_rate=tts_rate,
+    tts_hash = make_cache_key("tts", txt_content, tts_voice, tts_rate)
+    sync_hash = make_cache_key(
+        "sync", tts_hash, bgm_genre, bgm_type, bgm_volume, fuse_bgm_mix
     )
-    tts_elapsed = time.time() - tts_start
-    print(f"✔ TTS + 자막 파이프라인 완료: {format_hms(tts_elapsed)}")
-
-    # 3) BGM 믹싱
-    print("\n▶ BGM 믹싱 파이프라인 시작...")
-    sync_start = time.time()
-    final_audio_path = sync_pipe(
-        tts_audio_path=tts_audio_path,
-        output_dir=output_dir,
-        bgm_genre=bgm_genre,
-        bgm_type=bgm_type,
-        bgm_volume=bgm_volume or 0,
+    render_size = resolve_render_size(video_ratio)
+    prep_hash = make_cache_key("prep", t2i_hash, render_size, prescale_images)
+    render_hash = make_cache_key(
+        "render", prep_hash, sync_hash, font_path, video_ratio, video_encoder, render_mode,
+        subtitle_mode,
     )
-    sync_elapsed = time.time() - sync_start
-    print(f"✔ BGM 믹싱 파이프라인 완료: {format_hms(sync_elapsed)}")
-
-    # 4) 최종 렌더링
-    print("\n▶ 렌더링 파이프라인 시작...")
-    render_start = time.time()
-    output_video = ren_pipe(
-        output_dir=output_dir,
-        subtitle_json_path=subtitle_json_path,
-        final_audio_path=final_audio_path,
-        chapters_json_path=chapters_json_path,
-        font_path=font_path,
-        video_ratio=video_ratio,
+
+    # 스테이지 의존성 그래프
+    # (T2I → 이미지 전처리) ‖ (TTS → BGM 믹싱) → 렌더링
+    # TTS는 txt_content만 필요하므로 T2I와 동시에 실행합니다.
+    def run_t2i(results):
+        print("\n▶ T2I 파이프라인 시작...")
+        chapters, chapters_json_path = t2i_pipe(
+            input_text=txt_content,
+            output_dir=output_dir,
+            img_prompt_json=img_prompt_json,
+            img_size=img_size,
+            img_quality=img_quality,
+            total_start=total_start,
+            img_max_workers=img_max_workers,
+            use_cache=use_cache,
+            manifest=manifest,
+            stream_segments=stream_segments,
+        )
+        print("✔ T2I 파이프라인 완료")
+        return chapters, chapters_json_path
+
+    def run_prep(results):
+        if not prescale_images:
+            return None
+        chapters, _ = results["t2i"]
+        width, height = render_size
+        print(f"\n▶ 이미지 전처리 시작 ({width}x{height})...")
+        image_paths = prepare_chapter_images(
+            [os.path.join(output_dir, get_chapter_image_filename(ch)) for ch in chapters],
+            width,
+            height,
+        )
+        print("✔ 이미지 전처리 완료")
+        return image_paths
+
+    def run_tts(results):
+        print("\n▶ TTS + 자막 파이프라인 시작...")
+        tts_audio_path, subtitle_json_path = tts_pipe(
+            input_text=txt_content,
+            output_dir=output_dir,
+            google_key_file=google_key_file,
+            voice_name=tts_voice,
+            speaking_rate=tts_rate,
+            max_workers=tts_max_workers,
+            use_cache=use_cache,
+            manifest=manifest,
+        )
+        print("✔ TTS + 자막 파이프라인 완료")
+        return tts_audio_path, subtitle_json_path
+
+    def run_sync(results):
+        tts_audio_path, _ = results["tts"]
+        if fuse_bgm_mix:
+            # 믹싱은 렌더링 단계에서 수행 (BGM 경로/볼륨만 결정)
+            return tts_audio_path, resolve_bgm(bgm_genre, bgm_type, bgm_volume or 0)
+
+        print("\n▶ BGM 믹싱 파이프라인 시작...")
+        final_audio_path = sync_pipe(
+            tts_audio_path=tts_audio_path,
+            output_dir=output_dir,
+            bgm_genre=bgm_genre,
+            bgm_type=bgm_type,
+            bgm_volume=bgm_volume or 0,
+        )
+        print("✔ BGM 믹싱 파이프라인 완료")
+        return final_audio_path, None
+
+    def run_render(results):
+        print("\n▶ 렌더링 파이프라인 시작...")
+        _, chapters_json_path = results["t2i"]
+        _, subtitle_json_path = results["tts"]
+        final_audio_path, bgm = results["sync"]
+        bgm_path, bgm_db = bgm if bgm else (None, 0.0)
+        output_video = ren_pipe(
+            output_dir=output_dir,
+            subtitle_json_path=subtitle_json_path,
+            final_audio_path=final_audio_path,
+            chapters_json_path=chapters_json_path,
+            font_path=font_path,
+            video_ratio=video_ratio,
+            bgm_path=bgm_path,
+            bgm_db=bgm_db,
+            video_encoder=video_encoder,
+            render_mode=render_mode,
+            subtitle_mode=subtitle_mode,
+            image_paths=results["prep"],
+        )
+        print("✔ 렌더링 파이프라인 완료")
+        return output_video
+
+    subtitle_vtt = (
+        os.path.join(os.path.abspath(output_dir), "subtitle.vtt")
+        if subtitle_mode == "soft"
+        else None
     )
-    render_elapsed = time.time() - render_start
-    print(f"✔ 렌더링 파이프라인 완료: {format_hms(render_elapsed)}")
+
+    def render_files(output_video) -> List[str]:
+        return [output_video] + ([subtitle_vtt] if subtitle_vtt else [])
+
+    def t2i_files(outputs) -> List[str]:
+        chapters, chapters_json_path = outputs
+        return [chapters_json_path] + [
+            os.path.join(output_dir, get_chapter_image_filename(ch)) for ch in chapters
+        ]
+
+    def tts_files(outputs) -> List[str]:
+        tts_audio_path, subtitle_json_path = outputs
+        return [tts_audio_path, subtitle_json_path, sentence_index_path(subtitle_json_path)]
+
+    def sync_files(outputs) -> List[str]:
+        final_audio_path, bgm = outputs
+        return [final_audio_path] + ([bgm[0]] if bgm else [])
+
+    stages = {
+        "t2i": (
+            checkpointed_stage(manifest, "t2i", t2i_hash, run_t2i, t2i_files),
+            [],
+        ),
+        "tts": (
+            checkpointed_stage(manifest, "tts", tts_hash, run_tts, tts_files),
+            [],
+        ),
+        "prep": (
+            checkpointed_stage(manifest, "prep", prep_hash, run_prep, lambda paths: paths or []),
+            ["t2i"],
+        ),
+        "sync": (
+            checkpointed_stage(manifest, "sync", sync_hash, run_sync, sync_files),
+            ["tts"],
+        ),
+        "render": (
+            checkpointed_stage(manifest, "render", render_hash, run_render, render_files),
+            ["t2i", "prep", "sync"],
+        ),
+    }
+    with start_trace("full_pipeline", output_dir=output_dir) as trace:
+        try:
+            with span(
+                "pipeline",
+                kind="pipeline",
+                manuscript_chars=len(txt_content),
+                render_mode=render_mode,
+                subtitle_mode=subtitle_mode,
+                resume=resume,
+            ):
+                results, timings = run_stage_graph(stages, on_event=progress_callback)
+        finally:
+            trace_jsonl = trace.write_jsonl(os.path.join(output_dir, TRACE_JSONL_FILENAME))
+            trace_otlp = trace.write_otlp(os.path.join(output_dir, TRACE_OTLP_FILENAME))
+
+    _, chapters_json_path = results["t2i"]
+    tts_audio_path, subtitle_json_path = results["tts"]
+    final_audio_path, _ = results["sync"]
+    output_video = results["render"]
 
     total_elapsed = time.time() - total_start
 
     print("\n====================================")
     print("🎉 전체 파이프라인 완료")
     print("====================================")
-    print(f"🖼 T2I 단계: {format_hms(t2i_elapsed)}")
-    print(f"🎤 TTS + 자막 단계: {format_hms(tts_elapsed)}")
-    print(f"🎧 BGM 믹싱 단계: {format_hms(sync_elapsed)}")
-    print(f"🎬 렌더링 단계: {format_hms(render_elapsed)}")
+    print_stage_report(stages, timings, labels=STAGE_LABELS)
     print(f"⏱ 전체 소요 시간: {format_hms(total_elapsed)}")
     print("====================================\n")
 
@@ -145,6 +358,10 @@ def full_pipeline(
         "subtitle_json": subtitle_json_path,
         "tts_audio": tts_audio_path,
         "final_audio": final_audio_path,
+        "subtitle_vtt": subtitle_vtt,
+        "trace_spans": trace.to_dicts(),
+        "trace_jsonl": trace_jsonl,
+        "trace_otlp": trace_otlp,
     }
 
 
@@ -2,13 +2,22 @@
 - 오로지 Modal 관련 기능만 포함
 """
 
+import contextlib
+import mimetypes
 import os
+import re
+import shutil
 import sys
 import modal
 import tempfile
 import base64
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Request
 
 # ------------------------------------------------------------------------------------
 # 1) backend 경로 설정
@@ -52,29 +61,85 @@ image = (
         "python-dotenv==1.0.1",
         "fastapi[standard]",
     )
+    .env({"VIDEO_CACHE_DIR": "/cache", "ARTIFACT_STORE_DIR": "/artifacts"})
     .add_local_dir(backend_dir, "/root/backend", copy=True)
 )
 
+# 컨테이너 간 공유 캐시 (이미지 등) - VIDEO_CACHE_DIR 에 마운트
+cache_volume = modal.Volume.from_name("video-pipeline-cache", create_if_missing=True)
+
+# 결과물 저장소 - ARTIFACT_STORE_DIR 에 마운트
+artifact_volume = modal.Volume.from_name("video-pipeline-artifacts", create_if_missing=True)
+
+# 비동기 작업 상태 저장소 (job_id → 상태 딕셔너리)
+job_status = modal.Dict.from_name("video-job-status", create_if_missing=True)
+
+# 캐시 Volume의 runs/ 아래 디렉터리 이름으로 쓰이므로 경로 구분자/점 없이 제한
+RUN_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# full_pipeline 스테이지 → 진행 상황 표시 이름
+JOB_STAGES = {"t2i": "T2I", "prep": "prep", "tts": "TTS", "sync": "BGM", "render": "render"}
+
 # ------------------------------------------------------------------------------------
 # 4) backend import
 # ------------------------------------------------------------------------------------
 
 from main_ import full_pipeline
+from batch_ import batch_pipeline, resolve_item_ids
+from utils.artifact_store import get_artifact_store, new_artifact_prefix, parse_range_header
+from utils.cache_utils import get_cache_root
+from utils.encoder_utils import CPU_ENCODERS
 
 # ------------------------------------------------------------------------------------
 # 5) create_video
 # ------------------------------------------------------------------------------------
 
-@app.function(
-    image=image,
-    secrets=[
-        modal.Secret.from_name("openai-secret"),
-        modal.Secret.from_name("gcp-secret"),
-    ],
-    gpu=modal.gpu.A10G(),
-    timeout=3600,
-)
-def create_video(
+def _update_job(job_id: str, **fields: Any) -> None:
+    """작업 상태 딕셔너리의 일부 필드를 갱신합니다."""
+    status = job_status.get(job_id) or {"job_id": job_id, "stages": {}}
+    status.update(fields)
+    status["updated_at"] = time.time()
+    job_status[job_id] = status
+
+
+def _job_progress_callback(job_id: str) -> Callable[[str, str], None]:
+    """스테이지 이벤트를 작업 상태에 기록하는 콜백을 만듭니다.
+
+    T2I와 TTS 스테이지가 동시에 보고할 수 있으므로 갱신을 잠금으로 직렬화합니다.
+    """
+    lock = threading.Lock()
+
+    def on_event(stage: str, event: str) -> None:
+        with lock:
+            status = job_status.get(job_id) or {"job_id": job_id, "stages": {}}
+            stages = status.setdefault("stages", {})
+            stages[JOB_STAGES.get(stage, stage)] = event
+            done = sum(1 for state in stages.values() if state == "completed")
+            status["progress"] = done / len(JOB_STAGES)
+            status["updated_at"] = time.time()
+            job_status[job_id] = status
+
+    return on_event
+
+
+def _run_video_job(manuscript: str, job_id: Optional[str], **options) -> Dict[str, str]:
+    """비디오를 생성하고, job_id가 있으면 진행 상황과 최종 상태를 `job_status`에 기록합니다."""
+    if job_id is None:
+        return _create_video(manuscript, **options)
+
+    _update_job(job_id, state="running")
+    try:
+        response = _create_video(
+            manuscript, progress_callback=_job_progress_callback(job_id), **options
+        )
+    except Exception as e:
+        _update_job(job_id, state="failed", error=str(e))
+        raise
+    _update_job(job_id, state="completed", progress=1.0)
+    return response
+
+
+def _create_video(
     manuscript: str,
     manuscript_source: Optional[str] = None,
     tts_voice: Optional[str] = None,
@@ -86,46 +151,142 @@ def create_video(
     video_ratio: Optional[str] = None,
     img_size: str = "1536x1024",
     img_quality: str = "low",
+    img_max_workers: int = 4,
+    video_encoder: str = "auto",
+    render_mode: str = "single",
+    subtitle_mode: str = "burn",
+    stream_segments: bool = False,
+    delivery: str = "base64",
+    run_id: Optional[str] = None,
+    progress_callback: Optional[Callable[[str, str], None]] = None,
 ) -> Dict[str, str]:
+    """GPU/CPU 함수가 공유하는 비디오 생성 본문
+
+    delivery
+    - "base64": 기존 방식. 응답에 동영상 전체를 base64로 포함
+    - "artifact": 동영상을 아티팩트 저장소(Volume)에 저장하고 참조만 반환
+      (`download_artifact` 엔드포인트로 Range 요청 지원)
+
+    subtitle_mode
+    - "burn": 자막을 영상에 입힘 (기본값)
+    - "soft": mov_text 자막 트랙 + WebVTT 사이드카 (응답에 `subtitle_vtt` 포함)
+    - "sprite": 자막 줄별 PNG 스프라이트 overlay (render_mode="single" 전용)
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        output_dir = os.path.join(temp_dir, "outputs")
+    run_id
+    - None: 임시 디렉터리에서 실행 (실패 시 중간 결과 소실)
+    - 지정: 캐시 Volume의 `runs/{run_id}`에서 resume 모드로 실행하므로,
+      같은 run_id로 다시 호출하면 완료된 스테이지/이미지/TTS 청크를 건너뜁니다.
+      결과 전달에 성공하면 실행 디렉터리는 삭제되고(응답에서 로컬 `*_path` 항목도 제외),
+      실패한 실행만 Volume에 남습니다. run_id는 `RUN_ID_PATTERN` 형식이어야 합니다.
+    """
+
+    with contextlib.ExitStack() as stack:
+        if run_id:
+            output_dir = _run_output_dir(run_id)
+        else:
+            temp_dir = stack.enter_context(tempfile.TemporaryDirectory())
+            output_dir = os.path.join(temp_dir, "outputs")
         font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
 
-        result = full_pipeline(
-            manuscript=manuscript,
-            manuscript_source=manuscript_source,
-            tts_voice=tts_voice,
-            bgm_genre=bgm_genre,
-            bgm_type=bgm_type,
-            tts_volume=tts_volume,
-            tts_speed=tts_speed,
-            bgm_volume=bgm_volume,
-            video_ratio=video_ratio,
-            output_dir=output_dir,
-            font_path=font_path,
-            img_size=img_size,
-            img_quality=img_quality,
-        )
+        try:
+            result = full_pipeline(
+                manuscript=manuscript,
+                manuscript_source=manuscript_source,
+                tts_voice=tts_voice,
+                bgm_genre=bgm_genre,
+                bgm_type=bgm_type,
+                tts_volume=tts_volume,
+                tts_speed=tts_speed,
+                bgm_volume=bgm_volume,
+                video_ratio=video_ratio,
+                output_dir=output_dir,
+                font_path=font_path,
+                img_size=img_size,
+                img_quality=img_quality,
+                img_max_workers=img_max_workers,
+                video_encoder=video_encoder,
+                render_mode=render_mode,
+                subtitle_mode=subtitle_mode,
+                stream_segments=stream_segments,
+                resume=bool(run_id),
+                progress_callback=progress_callback,
+            )
+        finally:
+            # 새로 생성된 캐시 항목과 실행 체크포인트를 다른 컨테이너와 공유
+            # (실패해도 커밋해야 재시도 시 이어서 진행 가능)
+            cache_volume.commit()
 
-        response = {
-            "output_video_path": result["output_video"],
-            "chapters_json_path": result["chapters_json"],
-            "subtitle_json_path": result["subtitle_json"],
-            "final_audio_path": result["final_audio"],
-        }
+        response = _deliver_result(result, delivery)
 
-        if os.path.exists(result["output_video"]):
-            with open(result["output_video"], "rb") as f:
-                video_data = f.read()
-                response["output_video_base64"] = base64.b64encode(video_data).decode()
-                response["output_video_size"] = len(video_data)
+        if run_id and os.path.exists(result["output_video"]):
+            # 전달이 끝난 실행 디렉터리는 resume에 더 이상 필요 없으므로 Volume에서 제거
+            runs_root = os.path.realpath(os.path.join(get_cache_root(), "runs"))
+            if os.path.dirname(os.path.realpath(output_dir)) != runs_root:
+                raise RuntimeError(f"runs/ 밖의 디렉터리는 삭제하지 않습니다: {output_dir}")
+            shutil.rmtree(output_dir, ignore_errors=True)
+            cache_volume.commit()
+            # 삭제된 파일을 가리키는 로컬 경로는 응답에서 제외
+            response = {
+                key: value for key, value in response.items() if not key.endswith("_path")
+            }
 
         return response
 
-# ------------------------------------------------------------------------------------
-# 6) Web Endpoint (Next.js)
-# ------------------------------------------------------------------------------------
+
+def _run_output_dir(run_id: str) -> str:
+    """run_id의 실행 디렉터리 (`{캐시 루트}/runs/{run_id}`).
+
+    Raises:
+        ValueError: run_id가 `RUN_ID_PATTERN`에 맞지 않는 경우 (`.`/`..` 등 경로 탈출 방지)
+    """
+    if not RUN_ID_PATTERN.fullmatch(run_id):
+        raise ValueError(f"run_id는 영문/숫자/_/- 1~64자여야 합니다: {run_id!r}")
+    return os.path.join(get_cache_root(), "runs", run_id)
+
+
+def _deliver_result(result: Dict[str, Any], delivery: str) -> Dict[str, Any]:
+    """파이프라인 결과를 응답 형식(base64 또는 아티팩트 참조)으로 변환합니다."""
+    response = {
+        "output_video_path": result["output_video"],
+        "chapters_json_path": result["chapters_json"],
+        "subtitle_json_path": result["subtitle_json"],
+        "final_audio_path": result["final_audio"],
+        "trace_spans": result["trace_spans"],
+    }
+
+    if not os.path.exists(result["output_video"]):
+        return response
+
+    subtitle_vtt = result.get("subtitle_vtt")
+    if subtitle_vtt and not os.path.exists(subtitle_vtt):
+        subtitle_vtt = None
+
+    if delivery == "artifact":
+        store = get_artifact_store()
+        prefix = new_artifact_prefix()
+        ref = store.put_file(
+            result["output_video"],
+            f"{prefix}/{os.path.basename(result['output_video'])}",
+        )
+        response["output_video_ref"] = ref
+        response["output_video_size"] = ref["size"]
+        if subtitle_vtt:
+            response["subtitle_vtt_ref"] = store.put_file(
+                subtitle_vtt, f"{prefix}/{os.path.basename(subtitle_vtt)}"
+            )
+        artifact_volume.commit()
+        return response
+
+    with open(result["output_video"], "rb") as f:
+        video_data = f.read()
+        response["output_video_base64"] = base64.b64encode(video_data).decode()
+        response["output_video_size"] = len(video_data)
+    if subtitle_vtt:
+        with open(subtitle_vtt, "r", encoding="utf-8") as f:
+            response["subtitle_vtt"] = f.read()
+
+    return response
+
 
 @app.function(
     image=image,
@@ -135,36 +296,381 @@ def create_video(
     ],
     gpu=modal.gpu.A10G(),
     timeout=3600,
+    volumes={"/cache": cache_volume, "/artifacts": artifact_volume},
+)
+def create_video(manuscript: str, job_id: Optional[str] = None, **options) -> Dict[str, str]:
+    """GPU(A10G) 컨테이너에서 비디오 생성 (NVENC 사용 가능)"""
+    return _run_video_job(manuscript, job_id, **options)
+
+
+@app.function(
+    image=image,
+    secrets=[
+        modal.Secret.from_name("openai-secret"),
+        modal.Secret.from_name("gcp-secret"),
+    ],
+    cpu=8.0,
+    memory=8192,
+    timeout=3600,
+    volumes={"/cache": cache_volume, "/artifacts": artifact_volume},
+)
+def create_video_cpu(manuscript: str, job_id: Optional[str] = None, **options) -> Dict[str, str]:
+    """CPU 전용 컨테이너에서 비디오 생성 (libx264/libx265)"""
+    options.setdefault("video_encoder", "libx264")
+    return _run_video_job(manuscript, job_id, **options)
+
+@app.function(
+    image=image,
+    secrets=[
+        modal.Secret.from_name("openai-secret"),
+        modal.Secret.from_name("gcp-secret"),
+    ],
+    cpu=16.0,
+    memory=32768,
+    timeout=6 * 3600,
+    volumes={"/cache": cache_volume, "/artifacts": artifact_volume},
 )
+def create_video_batch(
+    items: List[Dict[str, Any]],
+    max_workers: int = 4,
+    api_limits: Optional[Dict[str, int]] = None,
+    job_id: Optional[str] = None,
+    **options,
+) -> List[Dict[str, Any]]:
+    """여러 원고를 한 컨테이너에서 병렬 처리합니다 (CPU 인코딩).
+
+    클라이언트/캐시/API 동시 요청 제한을 항목들이 공유하며,
+    성공한 항목의 동영상은 아티팩트 저장소에 저장되어 참조로 반환됩니다.
+    """
+    options.setdefault("video_encoder", "libx264")
+    options.setdefault("font_path", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+    if job_id is not None:
+        _update_job(job_id, state="running")
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = batch_pipeline(
+                items,
+                output_root=temp_dir,
+                max_workers=max_workers,
+                api_limits=api_limits,
+                **options,
+            )
+
+            store = get_artifact_store()
+            prefix = new_artifact_prefix()
+            for item in results:
+                if item["status"] != "success":
+                    continue
+                output_video = item.pop("result")["output_video"]
+                if os.path.exists(output_video):
+                    item["output_video_ref"] = store.put_file(
+                        output_video, f"{prefix}/{item['id']}.mp4"
+                    )
+
+        cache_volume.commit()
+        artifact_volume.commit()
+    except Exception as e:
+        if job_id is not None:
+            _update_job(job_id, state="failed", error=str(e))
+        raise
+
+    if job_id is not None:
+        _update_job(job_id, state="completed", progress=1.0)
+    return results
+
+# ------------------------------------------------------------------------------------
+# 6) Web Endpoint (Next.js)
+# ------------------------------------------------------------------------------------
+
+def _video_options_from_request(request: Dict) -> Dict[str, Any]:
+    """웹 요청 본문에서 create_video 옵션을 추출합니다."""
+    return {
+        "manuscript_source": request.get("manuscript_source"),
+        "tts_voice": request.get("tts_voice"),
+        "bgm_genre": request.get("bgm_genre"),
+        "bgm_type": request.get("bgm_type"),
+        "tts_volume": request.get("tts_volume", 100),
+        "tts_speed": request.get("tts_speed"),
+        "bgm_volume": request.get("bgm_volume", 30),
+        "video_ratio": request.get("video_ratio"),
+        "img_size": request.get("img_size", "1536x1024"),
+        "img_quality": request.get("img_quality", "low"),
+        "img_max_workers": request.get("img_max_workers", 4),
+        "video_encoder": request.get("video_encoder", "auto"),
+        "render_mode": request.get("render_mode", "single"),
+        "subtitle_mode": request.get("subtitle_mode", "burn"),
+        "stream_segments": request.get("stream_segments", False),
+        "delivery": request.get("delivery", "base64"),
+        # 지정한 경우에만 캐시 Volume의 runs/{run_id}에서 resume 모드로 실행
+        "run_id": request.get("run_id"),
+    }
+
+
+# 배치 요청 최상위에서 옵션 외에 허용하는 키
+BATCH_REQUEST_KEYS = ("items", "max_workers", "api_limits", "delivery")
+# 단건 create_video 전용이라 배치(full_pipeline)에는 넘기지 않는 옵션
+BATCH_EXCLUDED_OPTIONS = ("delivery", "run_id")
+
+
+def _invalid_run_id_response(options: Dict[str, Any]):
+    """run_id가 형식에 맞지 않으면 400 응답을, 아니면 None을 반환합니다."""
+    from fastapi.responses import JSONResponse
+
+    run_id = options.get("run_id")
+    if run_id is None or (isinstance(run_id, str) and RUN_ID_PATTERN.fullmatch(run_id)):
+        return None
+    return JSONResponse(
+        {"status": "error", "error": "run_id는 영문/숫자/_/- 1~64자여야 합니다."},
+        status_code=400,
+    )
+
+
+def _select_video_function(video_encoder: str):
+    """CPU 인코더를 요청하면 GPU 없는 컨테이너 함수를 선택합니다."""
+    return create_video_cpu if video_encoder in CPU_ENCODERS else create_video
+
+
+# 웹 티어는 요청 중계만 하므로 GPU를 할당하지 않습니다.
+@app.function(image=image, timeout=3600)
 @modal.web_endpoint(method="POST")
 def web_create_video(request: Dict) -> Dict:
-    """Modal 웹 엔드포인트: 비디오 생성"""
+    """Modal 웹 엔드포인트: 비디오 생성 (완료까지 대기하는 동기 방식)"""
     try:
         manuscript = request.get("manuscript")
         if not manuscript:
             return {"status": "error", "error": "manuscript 필드가 필요합니다."}
 
-        result = create_video.remote(
-            manuscript=manuscript,
-            manuscript_source=request.get("manuscript_source"),
-            tts_voice=request.get("tts_voice"),
-            bgm_genre=request.get("bgm_genre"),
-            bgm_type=request.get("bgm_type"),
-            tts_volume=request.get("tts_volume", 100),
-            tts_speed=request.get("tts_speed"),
-            bgm_volume=request.get("bgm_volume", 30),
-            video_ratio=request.get("video_ratio"),
-            img_size=request.get("img_size", "1536x1024"),
-            img_quality=request.get("img_quality", "low"),
-        )
+        options = _video_options_from_request(request)
+        invalid = _invalid_run_id_response(options)
+        if invalid is not None:
+            return invalid
+        target = _select_video_function(options["video_encoder"])
+        result = target.remote(manuscript=manuscript, **options)
 
         return {"status": "success", "result": result}
 
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
+
+@app.function(image=image)
+@modal.web_endpoint(method="POST")
+def submit_video_job(request: Dict) -> Dict:
+    """비동기 작업 제출: 파이프라인을 spawn하고 job_id를 즉시 반환합니다.
+
+    결과 전달 방식 기본값은 "artifact" 입니다 (응답 크기 최소화).
+    """
+    try:
+        manuscript = request.get("manuscript")
+        if not manuscript:
+            return {"status": "error", "error": "manuscript 필드가 필요합니다."}
+
+        options = _video_options_from_request(request)
+        invalid = _invalid_run_id_response(options)
+        if invalid is not None:
+            return invalid
+        options["delivery"] = request.get("delivery", "artifact")
+        target = _select_video_function(options["video_encoder"])
+
+        job_id = uuid.uuid4().hex
+        job_status[job_id] = {
+            "job_id": job_id,
+            "state": "queued",
+            "stages": {},
+            "progress": 0.0,
+            "created_at": time.time(),
+            "updated_at": time.time(),
+        }
+        call = target.spawn(manuscript=manuscript, job_id=job_id, **options)
+        # 워커의 상태 갱신과 겹치지 않도록 호출 ID는 별도 키에 저장
+        job_status[f"call:{job_id}"] = call.object_id
+
+        return {"status": "success", "job_id": job_id}
+
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@app.function(image=image)
+@modal.web_endpoint(method="POST")
+def submit_video_batch(request: Dict) -> Dict:
+    """배치 작업 제출: {"items": [{"id", "manuscript", ...}], "max_workers", "api_limits", ...}
+
+    상태/결과는 단건 작업과 같은 `get_video_job_status` / `get_video_job_result` 로 조회합니다.
+    """
+    from fastapi.responses import JSONResponse
+
+    try:
+        items = request.get("items") or []
+        if not items or any(not item.get("manuscript") for item in items):
+            return {"status": "error", "error": "모든 items 항목에 manuscript 필드가 필요합니다."}
+
+        # full_pipeline에 넘길 수 있는 옵션만 허용 (create_video 전용 옵션 제외)
+        option_keys = set(_video_options_from_request({})) - set(BATCH_EXCLUDED_OPTIONS)
+        unknown = set(request) - option_keys - set(BATCH_REQUEST_KEYS)
+        for item in items:
+            unknown |= set(item) - option_keys - {"id", "manuscript"}
+        if unknown:
+            return JSONResponse(
+                {"status": "error", "error": f"지원하지 않는 옵션입니다: {', '.join(sorted(unknown))}"},
+                status_code=400,
+            )
+        try:
+            resolve_item_ids(items)
+        except ValueError as e:
+            return JSONResponse({"status": "error", "error": str(e)}, status_code=400)
+
+        options = {
+            key: value
+            for key, value in _video_options_from_request(request).items()
+            if key in option_keys
+        }
+        items = [
+            {
+                **{key: item[key] for key in ("id", "manuscript") if key in item},
+                **{
+                    key: value
+                    for key, value in _video_options_from_request(item).items()
+                    if key in item
+                },
+            }
+            for item in items
+        ]
+
+        job_id = uuid.uuid4().hex
+        job_status[job_id] = {
+            "job_id": job_id,
+            "state": "queued",
+            "stages": {},
+            "progress": 0.0,
+            "item_count": len(items),
+            "created_at": time.time(),
+            "updated_at": time.time(),
+        }
+        call = create_video_batch.spawn(
+            items,
+            max_workers=request.get("max_workers", 4),
+            api_limits=request.get("api_limits"),
+            job_id=job_id,
+            **options,
+        )
+        job_status[f"call:{job_id}"] = call.object_id
+
+        return {"status": "success", "job_id": job_id}
+
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+def _refresh_job_status(job_id: str, status: Dict) -> Dict:
+    """queued/running 작업의 FunctionCall을 확인해, 워커가 죽었거나 시간 초과면 failed로 기록합니다.
+
+    워커가 비정상 종료하면 스스로 상태를 갱신하지 못해 running에 머물기 때문입니다.
+    """
+    call_id = job_status.get(f"call:{job_id}")
+    if status.get("state") not in ("queued", "running") or not call_id:
+        return status
+
+    try:
+        modal.FunctionCall.from_id(call_id).get(timeout=0)
+        return status
+    except modal.exception.FunctionTimeoutError as e:
+        error = f"작업 시간 초과: {e}"
+    except (TimeoutError, modal.exception.TimeoutError):
+        return status
+    except Exception as e:
+        error = str(e) or type(e).__name__
+
+    status = {**status, "state": "failed", "error": error}
+    job_status[job_id] = status
+    return status
+
+
+@app.function(image=image)
+@modal.web_endpoint(method="GET")
+def get_video_job_status(job_id: str) -> Dict:
+    """작업 상태 조회: state(queued/running/completed/failed)와 스테이지별 진행 상황"""
+    status = job_status.get(job_id)
+    if status is None:
+        return {"status": "error", "error": f"작업을 찾을 수 없습니다: {job_id}"}
+    return {"status": "success", "job": _refresh_job_status(job_id, status)}
+
+
+@app.function(image=image)
+@modal.web_endpoint(method="GET")
+def get_video_job_result(job_id: str) -> Dict:
+    """작업 결과 조회: 완료되지 않았으면 즉시 pending 상태를 반환합니다 (대기하지 않음)."""
+    status = job_status.get(job_id)
+    if status is None:
+        return {"status": "error", "error": f"작업을 찾을 수 없습니다: {job_id}"}
+
+    status = _refresh_job_status(job_id, status)
+    state = status.get("state")
+    if state == "failed":
+        return {"status": "error", "error": status.get("error"), "job": status}
+    call_id = job_status.get(f"call:{job_id}")
+    if state != "completed" or not call_id:
+        return {"status": "pending", "job": status}
+
+    try:
+        result = modal.FunctionCall.from_id(call_id).get(timeout=0)
+    except modal.exception.FunctionTimeoutError as e:
+        return {"status": "error", "error": f"작업 시간 초과: {e}", "job": status}
+    except (TimeoutError, modal.exception.TimeoutError):
+        return {"status": "pending", "job": status}
+    except Exception as e:
+        return {"status": "error", "error": str(e), "job": status}
+
+    return {"status": "success", "result": result, "job": status}
+
+# ------------------------------------------------------------------------------------
+# 7) 아티팩트 다운로드 (Range 지원)
+# ------------------------------------------------------------------------------------
+
+@app.function(
+    image=image,
+    volumes={"/artifacts": artifact_volume},
+    timeout=3600,
+)
+@modal.web_endpoint(method="GET")
+def download_artifact(key: str, request: Request):
+    """아티팩트를 청크 단위로 스트리밍합니다 (HTTP Range → 206 Partial Content)."""
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    store = get_artifact_store()
+    try:
+        if not store.exists(key):
+            # 다른 컨테이너가 방금 커밋한 파일일 수 있으므로 한 번 갱신
+            artifact_volume.reload()
+        size = store.size(key)
+    except (ValueError, FileNotFoundError) as e:
+        return JSONResponse({"status": "error", "error": str(e)}, status_code=404)
+
+    content_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+    headers = {"Accept-Ranges": "bytes", "Content-Type": content_type}
+    try:
+        byte_range = parse_range_header(request.headers.get("range"), size)
+    except ValueError:
+        return JSONResponse(
+            {"status": "error", "error": "잘못된 Range 요청입니다."},
+            status_code=416,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(store.iter_range(key), headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        store.iter_range(key, start, end), status_code=206, headers=headers
+    )
+
 # ------------------------------------------------------------------------------------
-# 7) 로컬 테스트
+# 8) 로컬 테스트
 # ------------------------------------------------------------------------------------
 
 if __name__ == "__main__":
@@ -1,10 +1,15 @@
 """비디오 렌더링 파이프라인 - 이미지, 오디오, 자막을 결합하여 최종 비디오를 생성합니다."""
 
 import os
-from typing import Optional
+from typing import List, Optional
 
+from utils.event_render import run_event_merge
+from utils.parallel_render import run_parallel_merge
 from utils.render import WIDTH, HEIGHT, run_final_merge
 
+# 지원하는 렌더링 방식 (sprite 자막은 single 전용)
+RENDER_MODES = ("single", "parallel", "event")
+
 
 def _parse_resolution(resolution: str, fallback: tuple[int, int]) -> tuple[int, int]:
     """`123x456` 형태의 문자열을 (width, height) 튜플로 변환합니다."""
@@ -18,6 +23,11 @@ def _parse_resolution(resolution: str, fallback: tuple[int, int]) -> tuple[int,
     return fallback
 
 
+def resolve_render_size(video_ratio: Optional[str] = None) -> tuple[int, int]:
+    """렌더링 해상도 (width, height)를 결정합니다 (기본값: 1536x1024)."""
+    return _parse_resolution(video_ratio or "1536x1024", fallback=(WIDTH, HEIGHT))
+
+
 def ren_pipe(
     output_dir: str,
     subtitle_json_path: str,
@@ -25,6 +35,14 @@ def ren_pipe(
     chapters_json_path: str,
     font_path: Optional[str] = None,
     video_ratio: Optional[str] = None,
+    bgm_path: Optional[str] = None,
+    bgm_db: float = 0.0,
+    slideshow_mode: str = "concat",
+    video_encoder: str = "auto",
+    render_mode: str = "single",
+    render_workers: Optional[int] = None,
+    image_paths: Optional[List[str]] = None,
+    subtitle_mode: str = "burn",
 ) -> str:
     """
     최종 비디오 렌더링 파이프라인
@@ -39,6 +57,16 @@ def ren_pipe(
         chapters_json_path: 챕터 JSON 파일 경로
         font_path: 폰트 파일 경로 (None이면 시스템 기본값 사용)
         video_ratio: 비디오 해상도 (예: "1536x1024", None이면 기본값 사용)
+        bgm_path: BGM 파일 경로 (지정 시 final_audio_path를 TTS 원본으로 보고 렌더링 중 믹싱)
+        bgm_db: BGM 볼륨 (dB, bgm_path 지정 시 사용)
+        slideshow_mode: 슬라이드쇼 방식 ("concat": 챕터별 세그먼트 연결, "overlay": 기존 overlay 체인)
+        video_encoder: 비디오 인코더 ("auto", "h264_nvenc", "libx264", "libx265")
+        render_mode: 렌더링 방식 ("single": 단일 ffmpeg, "parallel": 세그먼트 병렬 인코딩,
+            "event": 챕터/자막 변경 시점에만 프레임을 내보내는 VFR 인코딩)
+        render_workers: parallel 모드 동시 인코딩 수 (None이면 CPU 코어 수)
+        image_paths: 렌더링 해상도로 전처리된 챕터 이미지 경로 (None이면 원본을 렌더링 중 scale)
+        subtitle_mode: 자막 방식 ("burn": 영상에 입힘, "soft": mov_text 트랙 + WebVTT 사이드카,
+            "sprite": 사전 래스터화 스프라이트 overlay, single 모드 전용)
         
     Returns:
         생성된 비디오 파일 경로
@@ -60,10 +88,48 @@ def ren_pipe(
         )
     
     # 해상도 파싱
-    render_width, render_height = _parse_resolution(
-        video_ratio or "1536x1024",
-        fallback=(WIDTH, HEIGHT),
-    )
+    render_width, render_height = resolve_render_size(video_ratio)
+    
+    # 세그먼트 병렬 렌더링
+    if render_mode == "parallel":
+        run_parallel_merge(
+            output_dir=output_dir,
+            output_video=output_video,
+            subtitle_json_path=subtitle_json_path,
+            final_audio_path=final_audio_path,
+            generated_images_dir=output_dir,
+            chapters_json_path=chapters_json_path,
+            width=render_width,
+            height=render_height,
+            bgm_path=bgm_path,
+            bgm_db=bgm_db,
+            video_encoder=video_encoder,
+            max_workers=render_workers,
+            image_paths=image_paths,
+            subtitle_mode=subtitle_mode,
+        )
+        return output_video
+
+    # 이벤트 기반 VFR 렌더링
+    if render_mode == "event":
+        run_event_merge(
+            output_dir=output_dir,
+            output_video=output_video,
+            subtitle_json_path=subtitle_json_path,
+            final_audio_path=final_audio_path,
+            generated_images_dir=output_dir,
+            chapters_json_path=chapters_json_path,
+            width=render_width,
+            height=render_height,
+            bgm_path=bgm_path,
+            bgm_db=bgm_db,
+            video_encoder=video_encoder,
+            image_paths=image_paths,
+            subtitle_mode=subtitle_mode,
+        )
+        return output_video
+    if render_mode not in RENDER_MODES:
+        raise ValueError(f"지원하지 않는 render_mode 입니다: {render_mode}")
     
     # 최종 비디오 렌더링
     run_final_merge(
@@ -78,6 +144,12 @@ def ren_pipe(
         font_path=font_path,
         width=render_width,
         height=render_height,
+        bgm_path=bgm_path,
+        bgm_db=bgm_db,
+        slideshow_mode=slideshow_mode,
+        video_encoder=video_encoder,
+        image_paths=image_paths,
+        subtitle_mode=subtitle_mode,
     )
     
     return output_video
@@ -1,10 +1,32 @@
 """BGM 동기화 및 믹싱 파이프라인 - TTS 오디오에 BGM을 믹싱합니다."""
 
 import os
-import subprocess
-from typing import Optional
+from typing import Optional, Tuple
 
 from utils.bgm_utils import get_bgm_path, volume_percent_to_db
+from utils.tracing import run_ffmpeg
+
+
+def resolve_bgm(
+    bgm_genre: Optional[str] = None,
+    bgm_type: Optional[str] = None,
+    bgm_volume: int = 0,
+) -> Optional[Tuple[str, float]]:
+    """
+    BGM 파일 경로와 믹싱 볼륨(dB)을 결정합니다.
+    
+    Args:
+        bgm_genre: BGM 장르 (None이면 BGM 미사용)
+        bgm_type: BGM 타입 (None이면 BGM 미사용)
+        bgm_volume: BGM 볼륨 (0-100, 0이면 BGM 미사용)
+        
+    Returns:
+        (bgm_path, bgm_db) 튜플. BGM을 사용하지 않으면 None.
+    """
+    bgm_path = get_bgm_path(bgm_genre, bgm_type)
+    if not bgm_path or bgm_volume <= 0:
+        return None
+    return bgm_path, volume_percent_to_db(bgm_volume)
 
 
 def sync_pipe(
@@ -32,9 +54,10 @@ def sync_pipe(
         최종 오디오 파일 경로 (BGM이 있으면 믹싱된 파일, 없으면 TTS 파일)
     """
     # BGM이 없거나 볼륨이 0이면 원본 TTS 반환
-    bgm_path = get_bgm_path(bgm_genre, bgm_type)
-    if not bgm_path or bgm_volume <= 0:
+    bgm = resolve_bgm(bgm_genre, bgm_type, bgm_volume)
+    if bgm is None:
         return tts_audio_path
+    bgm_path, bgm_db = bgm
     
     # 출력 디렉터리 준비
     output_dir = os.path.abspath(output_dir)
@@ -45,9 +68,6 @@ def sync_pipe(
     os.makedirs(tts_audio_dir, exist_ok=True)
     mixed_audio_path = os.path.join(tts_audio_dir, "final_audio_with_bgm.m4a")
     
-    # BGM 볼륨을 dB로 변환
-    bgm_db = volume_percent_to_db(bgm_volume)
-    
     # TTS + BGM 믹싱
     # BGM은 무한루프(-stream_loop -1)
     # duration=first → TTS 길이에 맞춰 자동 컷
@@ -64,7 +84,7 @@ def sync_pipe(
         "-b:a", "192k",
         mixed_audio_path,
     ]
-    subprocess.run(cmd, check=True)
+    run_ffmpeg(cmd, "bgm_mix", inputs=[tts_audio_path, bgm_path], output=mixed_audio_path)
     
     print("🎧 BGM 믹싱 완료")
     return mixed_audio_path
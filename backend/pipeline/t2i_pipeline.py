@@ -1,77 +1,262 @@
 """Text-to-Image 파이프라인 - 텍스트를 챕터로 분할하고 각 챕터에 대한 이미지를 생성합니다."""
 
+import contextlib
 import json
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from utils.auth import get_openai_client
+from utils.cache_utils import (
+    DiskCache,
+    get_image_cache,
+    get_named_cache,
+    make_cache_key,
+)
+from utils.json_stream import StreamingArrayParser
 from utils.img_gen_prompt import (
     collect_meta_from_chapter,
     build_prompt_from_meta,
     generate_and_save_image,
+    get_chapter_image_filename,
     get_default_img_prompt,
 )
+from utils.rate_limiter import estimate_tokens, rate_limited_call
+from utils.run_manifest import RunManifest
+from utils.text_normalizer import normalize_text
 from utils.time_utils import log_time_status
+from utils.tracing import current_span, propagate, span
 
+# 동시에 진행할 이미지 생성 요청 수 기본값
+DEFAULT_IMG_MAX_WORKERS = 4
 
-def t2i_pipe(
-    input_text: str,
+# 챕터 분할 모델
+SEGMENT_MODEL = "gpt-4o-mini"
+
+
+def get_segment_cache() -> DiskCache:
+    """챕터 분할 결과 캐시를 반환합니다.
+
+    키에 프롬프트 템플릿 전체가 포함되므로
+    `get_default_img_prompt`가 바뀌면 기존 항목은 자동으로 무효화됩니다.
+
+    - `SEGMENT_CACHE_DIR`: 캐시 디렉터리
+    - `SEGMENT_CACHE_MAX_BYTES`: 용량 제한 (기본값: 100MB)
+    """
+    return get_named_cache(
+        "segments",
+        env_dir="SEGMENT_CACHE_DIR",
+        env_max_bytes="SEGMENT_CACHE_MAX_BYTES",
+        default_max_bytes=100 * 1024 ** 2,
+        suffix=".json",
+    )
+
+
+def _generate_chapter_image(
+    client,
+    chapter: Dict[str, Any],
     output_dir: str,
-    img_prompt_json: Optional[str] = None,
-    img_size: str = "1536x1024",
-    img_quality: str = "low",
-    total_start: Optional[float] = None,
-) -> tuple[List[Dict[str, Any]], str]:
+    img_size: str,
+    img_quality: str,
+    total_start: float,
+    cache: Optional[DiskCache] = None,
+    manifest: Optional[RunManifest] = None,
+) -> str:
+    """단일 챕터의 이미지를 생성하고 저장 경로를 반환합니다.
+
+    `manifest`가 resume 모드이고 같은 프롬프트로 이미 저장된 이미지가 있으면 건너뜁니다.
     """
-    Text-to-Image 파이프라인
-    
-    입력 텍스트를 챕터로 분할하고, 각 챕터에 대한 이미지를 생성합니다.
-    모든 경로 설정과 클라이언트 초기화는 내부에서 처리됩니다.
-    
+    with span("image.chapter", kind="image", chapter=chapter.get("chapter_number")) as sp:
+        meta = collect_meta_from_chapter(chapter)
+        prompt = build_prompt_from_meta(meta)
+        filename = get_chapter_image_filename(chapter)
+        item_key = make_cache_key(prompt, img_size, img_quality)
+        save_path = os.path.join(output_dir, filename)
+
+        if manifest is not None and manifest.get_item("t2i", filename, item_key, save_path):
+            log_time_status(total_start, f"이미지 재사용 (resume): {filename}")
+            sp.set(resumed=True, bytes_out=os.path.getsize(save_path))
+            return save_path
+
+        log_time_status(total_start, f"이미지 이름: {filename}")
+
+        saved_path = generate_and_save_image(
+            client,
+            prompt,
+            save_dir=output_dir,
+            filename=filename,
+            size=img_size,
+            quality=img_quality,
+            cache=cache,
+        )
+        if manifest is not None:
+            manifest.mark_item("t2i", filename, item_key)
+
+        log_time_status(total_start, f"저장 완료: {saved_path}")
+        return saved_path
+
+
+def generate_chapter_images(
+    client,
+    chapters: List[Dict[str, Any]],
+    output_dir: str,
+    img_size: str,
+    img_quality: str,
+    max_workers: int = DEFAULT_IMG_MAX_WORKERS,
+    total_start: Optional[float] = None,
+    cache: Optional[DiskCache] = None,
+    manifest: Optional[RunManifest] = None,
+) -> List[str]:
+    """챕터 이미지들을 최대 `max_workers`개씩 동시에 생성합니다.
+
     Args:
-        input_text: 입력 텍스트
-        output_dir: 출력 디렉터리 (절대 경로 권장)
-        img_prompt_json: 이미지 프롬프트 JSON (None이면 기본값 사용)
-        img_size: 이미지 크기 (기본값: "1536x1024")
-        img_quality: 이미지 품질 (기본값: "low")
+        client: OpenAI 클라이언트
+        chapters: 챕터 리스트
+        output_dir: 이미지 저장 디렉터리
+        img_size: 이미지 크기
+        img_quality: 이미지 품질
+        max_workers: 동시에 진행할 최대 요청 수 (1이면 순차 실행)
         total_start: 전체 시작 시간 (선택사항, 로깅용)
-        
+        cache: 이미지 캐시 (None이면 캐시 미사용)
+        manifest: 실행 매니페스트 (resume 모드면 완료된 챕터 이미지를 건너뜀)
+
     Returns:
-        (chapters, chapters_json_path) 튜플
-        - chapters: 챕터 리스트
-        - chapters_json_path: 챕터 JSON 파일 경로
+        챕터 순서대로 정렬된 이미지 경로 리스트
     """
     if total_start is None:
         total_start = time.time()
-    
-    # 출력 디렉터리 준비
-    output_dir = os.path.abspath(output_dir)
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # 이미지 프롬프트 설정
-    if img_prompt_json is None:
-        img_prompt_json = get_default_img_prompt()
-    
-    # OpenAI 클라이언트 초기화
-    client = get_openai_client()
-    
-    # 챕터 JSON 경로 설정
-    chapters_json_path = os.path.join(output_dir, "chapters_output.json")
-    
+
+    max_workers = max(1, min(max_workers, len(chapters)))
+    if max_workers == 1:
+        return [
+            _generate_chapter_image(
+                client, ch, output_dir, img_size, img_quality, total_start, cache, manifest
+            )
+            for ch in chapters
+        ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                propagate(_generate_chapter_image),
+                client, ch, output_dir, img_size, img_quality, total_start, cache, manifest,
+            )
+            for ch in chapters
+        ]
+        return [future.result() for future in futures]
+
+
+class _StreamingImageDispatcher:
+    """챕터 분할 스트리밍 중 완성된 챕터부터 이미지 생성을 시작합니다.
+
+    같은 번호의 챕터가 다시 들어오면(스트림 재시도 등) 내용이 같을 때는 무시하고,
+    달라졌을 때는 세대 번호를 올려 이전 생성을 대체합니다.
+    스트림을 읽는 스레드는 기다리지 않습니다: 이전 작업이 시작 전이면 취소하고,
+    실행 중이면 끝난 뒤(같은 파일에 쓰므로) 완료 콜백에서 새 내용으로 생성합니다.
+    대체된 세대의 결과는 버려지고, `collect`는 챕터별 마지막 세대의 결과만 기다립니다.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        generate: Callable[..., str],
+        client,
+        *args: Any,
+    ):
+        self._executor = executor
+        self._generate = generate
+        self._client = client
+        self._args = args
+        self._lock = threading.Lock()
+        # 챕터 번호 → (마지막으로 들어온 챕터, 그 세대의 결과 Future)
+        self._submitted: Dict[int, Tuple[Dict[str, Any], Future]] = {}
+        # 챕터 번호 → 마지막 세대 번호 / 가장 최근에 시작한 생성 작업
+        self._generations: Dict[int, int] = {}
+        self._tasks: Dict[int, Future] = {}
+
+    def submit(self, index: int, chapter: Dict[str, Any]) -> None:
+        with self._lock:
+            previous = self._submitted.get(index)
+            if previous is not None and previous[0] == chapter:
+                return
+            generation = self._generations.get(index, 0) + 1
+            self._generations[index] = generation
+            result: Future = Future()
+            self._submitted[index] = (chapter, result)
+            running = self._tasks.get(index)
+
+        if running is None:
+            self._start(index, chapter, generation, result)
+            return
+        running.cancel()
+        running.add_done_callback(
+            lambda _: self._start(index, chapter, generation, result)
+        )
+
+    def _start(
+        self, index: int, chapter: Dict[str, Any], generation: int, result: Future
+    ) -> None:
+        """해당 세대가 아직 최신이면 생성 작업을 시작합니다 (대체되었으면 무시)."""
+        with self._lock:
+            if self._generations[index] != generation:
+                return
+            task = self._executor.submit(self._generate, self._client, chapter, *self._args)
+            self._tasks[index] = task
+        task.add_done_callback(lambda done: self._relay(done, result))
+
+    @staticmethod
+    def _relay(task: Future, result: Future) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            result.set_exception(error)
+        else:
+            result.set_result(task.result())
+
+    def collect(self, chapters: List[Dict[str, Any]]) -> List[str]:
+        """최종 챕터 리스트 기준으로 빠진 챕터를 마저 생성하고 경로를 순서대로 반환합니다.
+
+        마지막 세대는 대체된 이전 작업이 끝난 뒤에만 시작하므로,
+        반환 시점에는 같은 챕터 파일에 쓰는 작업이 남아 있지 않습니다.
+        """
+        for index, chapter in enumerate(chapters):
+            self.submit(index, chapter)
+        return [self._submitted[index][1].result() for index in range(len(chapters))]
+
+
+def _segment_chapters(
+    client,
+    img_prompt_json: str,
+    input_text: str,
+    output_dir: str,
+    total_start: float,
+) -> List[Dict[str, Any]]:
+    """모델을 호출해 입력 텍스트를 챕터 리스트로 분할합니다."""
     # 1) 모델 호출
     log_time_status(total_start, "모델 호출 시작")
     inference_input = img_prompt_json + "\n\n" + input_text
     
     try:
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=inference_input,
-            timeout=300
+        response = rate_limited_call(
+            "openai_responses",
+            lambda: client.responses.create(
+                model=SEGMENT_MODEL,
+                input=inference_input,
+                timeout=300
+            ),
+            tokens=estimate_tokens(inference_input),
         )
     except Exception:
         raise RuntimeError("Inference TIME_OUT")
     
+    current_span().set(
+        bytes_in=len(inference_input.encode("utf-8")),
+        bytes_out=len(response.output_text.encode("utf-8")),
+    )
+
     # 모델 응답 텍스트 추출 및 저장
     model_response_text = response.output_text[8:-3:]
     output_txt_path = os.path.join(output_dir, "model_response_output.txt")
@@ -82,7 +267,6 @@ def t2i_pipe(
     
     # 2) JSON 파싱
     log_time_status(total_start, "JSON으로 변환 시작")
-    import re
     
     # Responses API 구조에서 모든 text 수집
     text_chunks = []
@@ -96,7 +280,81 @@ def t2i_pipe(
     if not text_chunks:
         raise ValueError("모델 응답에 텍스트가 없습니다.")
     
-    raw_text = "\n".join(text_chunks).strip()
+    return _parse_chapters_text("\n".join(text_chunks), total_start)
+
+
+def _stream_segment_chapters(
+    client,
+    img_prompt_json: str,
+    input_text: str,
+    output_dir: str,
+    total_start: float,
+    on_chapter: Callable[[int, Dict[str, Any]], None],
+) -> List[Dict[str, Any]]:
+    """모델 응답을 스트리밍으로 받아 챕터 객체가 완성될 때마다 `on_chapter(번호, 챕터)`를 호출합니다.
+
+    재시도 시에는 처음부터 다시 파싱하며, 이미 전달한 챕터의 중복 처리는 `on_chapter` 쪽에서 합니다.
+    스트리밍 파싱이 끝까지 성공하지 못하면 전체 응답 텍스트로 기존 방식의 파싱을 수행합니다.
+    """
+    log_time_status(total_start, "모델 스트리밍 호출 시작")
+    inference_input = img_prompt_json + "\n\n" + input_text
+    sp = current_span()
+    call_start = time.time()
+
+    def consume() -> StreamingArrayParser:
+        parser = StreamingArrayParser("chapters")
+        stream = client.responses.create(
+            model=SEGMENT_MODEL,
+            input=inference_input,
+            timeout=300,
+            stream=True,
+        )
+        for event in stream:
+            if getattr(event, "type", None) != "response.output_text.delta":
+                continue
+            for index, chapter in parser.feed(event.delta):
+                if index == 0:
+                    sp.set(first_chapter_seconds=round(time.time() - call_start, 3))
+                    log_time_status(total_start, "첫 챕터 수신 → 이미지 생성 시작")
+                on_chapter(index, chapter)
+        return parser
+
+    try:
+        parser = rate_limited_call(
+            "openai_responses",
+            consume,
+            tokens=estimate_tokens(inference_input),
+        )
+    except Exception:
+        raise RuntimeError("Inference TIME_OUT")
+
+    raw_text = parser.text
+    sp.set(
+        bytes_in=len(inference_input.encode("utf-8")),
+        bytes_out=len(raw_text.encode("utf-8")),
+        streamed=True,
+    )
+
+    # 모델 응답 텍스트 저장
+    output_txt_path = os.path.join(output_dir, "model_response_output.txt")
+    with open(output_txt_path, "w", encoding="utf-8") as f:
+        f.write(raw_text[8:-3:])
+    print(f"✅ 모델 응답 텍스트 저장 완료: {output_txt_path}")
+    log_time_status(total_start, "모델 호출 완료")
+
+    if parser.done and parser.items and not parser.failed:
+        log_time_status(total_start, "JSON 스트리밍 파싱 완료")
+        return parser.items
+
+    log_time_status(total_start, "JSON으로 변환 시작 (스트리밍 파싱 실패)")
+    return _parse_chapters_text(raw_text, total_start)
+
+
+def _parse_chapters_text(raw_text: str, total_start: float) -> List[Dict[str, Any]]:
+    """모델 응답 텍스트에서 코드블록을 제거하고 챕터 리스트를 파싱합니다."""
+    import re
+    
+    raw_text = raw_text.strip()
     
     # ```json 코드블록 제거
     raw_text = re.sub(r"```json\s*", "", raw_text, flags=re.IGNORECASE)
@@ -123,38 +381,142 @@ def t2i_pipe(
     
     log_time_status(total_start, "JSON으로 변환 완료")
     
-    # 3) 챕터 처리
-    log_time_status(total_start, "챕터 구분 시작")
     chapters = story_json.get("chapters", [])
     if not chapters:
         raise ValueError("챕터 데이터가 없습니다.")
+    return chapters
+
+
+def t2i_pipe(
+    input_text: str,
+    output_dir: str,
+    img_prompt_json: Optional[str] = None,
+    img_size: str = "1536x1024",
+    img_quality: str = "low",
+    total_start: Optional[float] = None,
+    img_max_workers: int = DEFAULT_IMG_MAX_WORKERS,
+    use_cache: bool = True,
+    manifest: Optional[RunManifest] = None,
+    stream_segments: bool = False,
+) -> tuple[List[Dict[str, Any]], str]:
+    """
+    Text-to-Image 파이프라인
     
-    print(f"챕터 수: {len(chapters)}")
-    os.makedirs(os.path.dirname(chapters_json_path), exist_ok=True)
-    with open(chapters_json_path, "w", encoding="utf-8") as f:
-        json.dump(chapters, f, ensure_ascii=False, indent=2)
-    log_time_status(total_start, "챕터 구분 완료")
+    입력 텍스트를 챕터로 분할하고, 각 챕터에 대한 이미지를 생성합니다.
+    모든 경로 설정과 클라이언트 초기화는 내부에서 처리됩니다.
     
-    # 4) 이미지 생성
-    log_time_status(total_start, "이미지 생성 시작")
-    for ch in chapters:
-        meta = collect_meta_from_chapter(ch)
-        prompt = build_prompt_from_meta(meta)
-        filename = f"{ch['chapter_number']}_{ch.get('chapter_title', 'chapter')}.png"
+    Args:
+        input_text: 입력 텍스트
+        output_dir: 출력 디렉터리 (절대 경로 권장)
+        img_prompt_json: 이미지 프롬프트 JSON (None이면 기본값 사용)
+        img_size: 이미지 크기 (기본값: "1536x1024")
+        img_quality: 이미지 품질 (기본값: "low")
+        total_start: 전체 시작 시간 (선택사항, 로깅용)
+        img_max_workers: 동시에 진행할 최대 이미지 생성 요청 수 (기본값: 4)
+        use_cache: 챕터 분할/이미지 캐시 사용 여부 (기본값: True)
+        manifest: 실행 매니페스트 (resume 모드면 완료된 챕터 분할/이미지를 재사용)
+        stream_segments: 챕터 분할 응답을 스트리밍으로 받아, 챕터 객체가 완성되는 즉시
+            이미지 생성을 시작할지 여부 (기본값: False)
         
-        log_time_status(total_start, f"이미지 이름: {filename}")
+    Returns:
+        (chapters, chapters_json_path) 튜플
+        - chapters: 챕터 리스트
+        - chapters_json_path: 챕터 JSON 파일 경로
+    """
+    if total_start is None:
+        total_start = time.time()
+    
+    # 출력 디렉터리 준비
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # 이미지 프롬프트 설정
+    if img_prompt_json is None:
+        img_prompt_json = get_default_img_prompt()
+    
+    # OpenAI 클라이언트 초기화
+    client = get_openai_client()
+    
+    # 챕터 JSON 경로 설정
+    chapters_json_path = os.path.join(output_dir, "chapters_output.json")
+    
+    # 1) 모델 호출 + 2) JSON 파싱 (캐시 적중 시 생략)
+    segment_cache = get_segment_cache() if use_cache else None
+    segment_key = make_cache_key(
+        SEGMENT_MODEL, img_prompt_json, normalize_text(input_text)
+    )
+    image_cache = get_image_cache() if use_cache else None
+    image_args = (output_dir, img_size, img_quality, total_start, image_cache, manifest)
+
+    with contextlib.ExitStack() as stack:
+        # 스트리밍 모드: 챕터 분할이 끝나기 전에 이미지 생성을 시작
+        dispatcher = None
+        if stream_segments:
+            executor = stack.enter_context(
+                ThreadPoolExecutor(max_workers=max(1, img_max_workers))
+            )
+            # 이미지 스팬이 llm.segment가 아니라 스테이지 스팬의 자식이 되도록 미리 감쌈
+            dispatcher = _StreamingImageDispatcher(
+                executor, propagate(_generate_chapter_image), client, *image_args
+            )
+
+        with span("llm.segment", kind="llm", model=SEGMENT_MODEL) as sp:
+            chapters = None
+            if manifest is not None and manifest.get_item(
+                "t2i", "segments", segment_key, chapters_json_path
+            ):
+                with open(chapters_json_path, "r", encoding="utf-8") as f:
+                    chapters = json.load(f)
+                print("♻️ 챕터 분할 재사용 (resume): 모델 호출 생략")
+                sp.set(resumed=True)
+            elif segment_cache is not None:
+                chapters = segment_cache.get_json(segment_key)
+                if chapters:
+                    print("♻️ 챕터 분할 캐시 적중: 모델 호출 생략")
+                sp.set(cache_hit=bool(chapters))
+            if not chapters:
+                if dispatcher is not None:
+                    chapters = _stream_segment_chapters(
+                        client, img_prompt_json, input_text, output_dir, total_start,
+                        on_chapter=dispatcher.submit,
+                    )
+                else:
+                    chapters = _segment_chapters(
+                        client, img_prompt_json, input_text, output_dir, total_start
+                    )
+                if segment_cache is not None:
+                    segment_cache.put_json(segment_key, chapters)
+            sp.set(chapters=len(chapters))
         
-        saved_path = generate_and_save_image(
-            client,
-            prompt,
-            save_dir=output_dir,
-            filename=filename,
-            size=img_size,
-            quality=img_quality
-        )
+        # 3) 챕터 처리
+        log_time_status(total_start, "챕터 구분 시작")
+        print(f"챕터 수: {len(chapters)}")
+        os.makedirs(os.path.dirname(chapters_json_path), exist_ok=True)
+        with open(chapters_json_path, "w", encoding="utf-8") as f:
+            json.dump(chapters, f, ensure_ascii=False, indent=2)
+        if manifest is not None:
+            manifest.mark_item("t2i", "segments", segment_key)
+        log_time_status(total_start, "챕터 구분 완료")
         
-        log_time_status(total_start, f"저장 완료: {saved_path}")
+        # 4) 이미지 생성 (스트리밍 모드면 이미 시작된 챕터는 완료만 기다림)
+        log_time_status(total_start, "이미지 생성 시작")
+        if dispatcher is not None:
+            dispatcher.collect(chapters)
+        else:
+            generate_chapter_images(
+                client,
+                chapters,
+                output_dir=output_dir,
+                img_size=img_size,
+                img_quality=img_quality,
+                max_workers=img_max_workers,
+                total_start=total_start,
+                cache=image_cache,
+                manifest=manifest,
+            )
     
+    if image_cache is not None:
+        print(f"♻️ 이미지 캐시 통계: {image_cache.stats()}")
     log_time_status(total_start, "이미지 생성 완료")
     print("🖼 이미지 생성 완료")
     
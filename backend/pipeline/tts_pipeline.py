@@ -4,7 +4,8 @@ import os
 from typing import Optional
 
 from utils.auth import setup_gcp_credentials
-from utils.tts_utils import generate_tts_and_subtitle
+from utils.run_manifest import RunManifest
+from utils.tts_utils import generate_tts_and_subtitle, get_tts_cache
 
 
 def tts_pipe(
@@ -13,6 +14,9 @@ def tts_pipe(
     google_key_file: Optional[str] = None,
     voice_name: Optional[str] = None,
     speaking_rate: float = 1.0,
+    max_workers: int = 8,
+    use_cache: bool = True,
+    manifest: Optional[RunManifest] = None,
 ) -> tuple[str, str]:
     """
     TTS 및 자막 생성 파이프라인
@@ -26,6 +30,9 @@ def tts_pipe(
         google_key_file: GCP 키 파일 경로 (None이면 환경변수에서 읽음)
         voice_name: TTS 음성 이름 (None이면 기본값 사용)
         speaking_rate: 말하기 속도 (기본값: 1.0)
+        max_workers: 동시에 합성할 최대 청크 수 (기본값: 8)
+        use_cache: TTS 청크 캐시 사용 여부 (기본값: True)
+        manifest: 실행 매니페스트 (resume 모드면 완료된 청크를 재사용)
         
     Returns:
         (tts_audio_path, subtitle_json_path) 튜플
@@ -53,6 +60,9 @@ def tts_pipe(
         google_key_file=None,  # 호환성을 위해 전달하지만 사용되지 않음
         voice_name=voice_name,
         speaking_rate=speaking_rate,
+        max_workers=max_workers,
+        cache=get_tts_cache() if use_cache else None,
+        manifest=manifest,
     )
     
     return tts_output_path, subtitle_json_path
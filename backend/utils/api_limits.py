@@ -0,0 +1,57 @@
+"""외부 API 동시 호출 제한 - 프로세스 전역에서 공급자별 동시 요청 수를 제한합니다."""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# 공급자별 기본 동시 요청 수
+DEFAULT_API_CONCURRENCY = {
+    "openai_images": 8,
+    "openai_responses": 4,
+    "google_tts": 16,
+}
+
+_limits: Dict[str, int] = dict(DEFAULT_API_CONCURRENCY)
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+
+def configure_api_concurrency(**limits: int) -> None:
+    """공급자별 동시 요청 수를 설정합니다.
+
+    이미 진행 중인 요청에는 영향을 주지 않고, 이후 요청부터 새 제한이 적용됩니다.
+
+    Example:
+        configure_api_concurrency(openai_images=4, google_tts=32)
+    """
+    with _lock:
+        for provider, limit in limits.items():
+            _limits[provider] = max(1, int(limit))
+            _semaphores.pop(provider, None)
+
+
+def _get_semaphore(provider: str) -> threading.BoundedSemaphore:
+    with _lock:
+        semaphore = _semaphores.get(provider)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(_limits.get(provider, 4))
+            _semaphores[provider] = semaphore
+        return semaphore
+
+
+@contextmanager
+def api_slot(provider: str) -> Iterator[None]:
+    """공급자의 동시 요청 슬롯을 하나 점유한 채로 블록을 실행합니다.
+
+    여러 파이프라인(배치 항목)이 같은 프로세스에서 동시에 실행되어도
+    공급자별 전체 동시 요청 수는 설정값을 넘지 않습니다.
+
+    Args:
+        provider: "openai_images", "openai_responses", "google_tts" 등
+    """
+    semaphore = _get_semaphore(provider)
+    semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
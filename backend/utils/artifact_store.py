@@ -0,0 +1,156 @@
+"""아티팩트 저장소 - 생성된 결과물을 저장하고 참조(키/URL)로 전달합니다."""
+
+import os
+import re
+import shutil
+import uuid
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+# 기본 청크 크기 (스트리밍 다운로드용)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactStore:
+    """아티팩트 저장소 인터페이스.
+
+    구현체는 파일을 키로 저장하고, 크기 조회와 바이트 범위 읽기를 제공합니다.
+    응답에는 파일 내용 대신 `put_file`이 반환하는 참조 딕셔너리를 담습니다.
+    """
+
+    def put_file(self, local_path: str, key: str) -> Dict[str, object]:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+class LocalArtifactStore(ArtifactStore):
+    """로컬 파일시스템(또는 마운트된 Volume) 기반 아티팩트 저장소.
+
+    Args:
+        root_dir: 저장소 루트 디렉터리.
+        base_url: 다운로드 엔드포인트 URL (지정 시 참조에 `url` 포함).
+    """
+
+    def __init__(self, root_dir: str, base_url: Optional[str] = None):
+        self.root_dir = os.path.abspath(root_dir)
+        self.base_url = base_url
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """키를 저장소 내부 경로로 변환합니다 (루트 밖으로 벗어나는 키는 거부)."""
+        path = os.path.abspath(os.path.join(self.root_dir, key))
+        if os.path.commonpath([path, self.root_dir]) != self.root_dir:
+            raise ValueError(f"잘못된 아티팩트 키입니다: {key}")
+        return path
+
+    def url_for(self, key: str) -> Optional[str]:
+        if not self.base_url:
+            return None
+        return f"{self.base_url}?key={quote(key)}"
+
+    def put_file(self, local_path: str, key: str) -> Dict[str, object]:
+        """파일을 저장소에 복사하고 참조 딕셔너리를 반환합니다."""
+        dest = self._path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = dest + ".tmp"
+        shutil.copyfile(local_path, tmp)
+        os.replace(tmp, dest)
+        return {
+            "key": key,
+            "size": os.path.getsize(dest),
+            "url": self.url_for(key),
+        }
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def size(self, key: str) -> int:
+        path = self._path(key)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"아티팩트가 없습니다: {key}")
+        return os.path.getsize(path)
+
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """[start, end] (end 포함) 바이트 범위를 청크 단위로 읽습니다."""
+        path = self._path(key)
+        if end is None:
+            end = os.path.getsize(path) - 1
+        remaining = end - start + 1
+        with open(path, "rb") as f:
+            f.seek(start)
+            while remaining > 0:
+                data = f.read(min(chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+
+def new_artifact_prefix() -> str:
+    """작업별 아티팩트 키 접두사를 생성합니다."""
+    return uuid.uuid4().hex
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """HTTP Range 헤더(`bytes=start-end`)를 (start, end) 범위로 변환합니다.
+
+    Args:
+        header: Range 헤더 값 (없으면 None).
+        size: 전체 파일 크기.
+
+    Returns:
+        (start, end) 튜플 (end 포함). 헤더가 없으면 None.
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 만족할 수 없는 범위인 경우
+    """
+    if not header:
+        return None
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header)
+    if not match or (not match.group(1) and not match.group(2)):
+        raise ValueError(f"지원하지 않는 Range 헤더입니다: {header}")
+
+    start_str, end_str = match.groups()
+    if not start_str:
+        # 접미사 범위: 마지막 N 바이트
+        length = int(end_str)
+        start, end = max(0, size - length), size - 1
+    else:
+        start = int(start_str)
+        end = min(int(end_str), size - 1) if end_str else size - 1
+
+    if start >= size or start > end:
+        raise ValueError(f"만족할 수 없는 범위입니다: {header}")
+    return start, end
+
+
+def get_artifact_store() -> LocalArtifactStore:
+    """환경변수 설정에 따른 아티팩트 저장소를 반환합니다.
+
+    - `ARTIFACT_STORE_DIR`: 저장소 루트 (기본값: ./artifacts)
+    - `ARTIFACT_DOWNLOAD_URL`: 다운로드 엔드포인트 URL (선택사항)
+    """
+    return LocalArtifactStore(
+        os.environ.get("ARTIFACT_STORE_DIR", os.path.join(os.getcwd(), "artifacts")),
+        base_url=os.environ.get("ARTIFACT_DOWNLOAD_URL"),
+    )
@@ -0,0 +1,305 @@
+"""오디오 파일 유틸리티 - MP3 프레임 파싱 및 디코딩 없는 오디오 병합"""
+
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from utils.tracing import run_ffmpeg
+
+FFMPEG = "ffmpeg"
+
+# MPEG Layer III 비트레이트 테이블 (kbps), 인덱스 0은 free, 15는 invalid
+_BITRATES_V1_L3 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0]
+_BITRATES_V2_L3 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]
+
+# 버전 비트 → 샘플레이트 테이블
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+
+def parse_mp3_frame_header(data: bytes, pos: int = 0) -> Optional[Dict[str, Any]]:
+    """`pos` 위치의 MPEG Layer III 프레임 헤더를 파싱합니다.
+
+    Args:
+        data: MP3 바이트.
+        pos: 프레임 헤더 시작 위치.
+
+    Returns:
+        version, sample_rate, channels, bitrate, frame_length, samples 키를 가진
+        딕셔너리. 유효한 Layer III 헤더가 아니면 None.
+    """
+    if pos + 4 > len(data):
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    if version == 1 or layer != 1:  # reserved 버전 또는 Layer III 아님
+        return None
+
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    padding = (b2 >> 1) & 0x01
+    channel_mode = (b3 >> 6) & 0x03
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+
+    if version == 3:
+        bitrate = _BITRATES_V1_L3[bitrate_index] * 1000
+        samples = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        bitrate = _BITRATES_V2_L3[bitrate_index] * 1000
+        samples = 576
+        frame_length = 72 * bitrate // sample_rate + padding
+
+    return {
+        "version": version,
+        "sample_rate": sample_rate,
+        "channels": 1 if channel_mode == 3 else 2,
+        "bitrate": bitrate,
+        "frame_length": frame_length,
+        "samples": samples,
+    }
+
+
+def _id3v2_size(data: bytes) -> int:
+    """파일 앞 ID3v2 태그의 전체 길이를 반환합니다 (없으면 0)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_vbr_info_frame(data: bytes, pos: int, header: Dict[str, Any]) -> bool:
+    """프레임이 Xing/Info/VBRI 메타데이터 프레임(오디오 아님)인지 확인합니다."""
+    if header["version"] == 3:
+        side_info = 17 if header["channels"] == 1 else 32
+    else:
+        side_info = 9 if header["channels"] == 1 else 17
+    tag_pos = pos + 4 + side_info
+    if data[tag_pos:tag_pos + 4] in (b"Xing", b"Info"):
+        return True
+    return data[pos + 36:pos + 40] == b"VBRI"
+
+
+def strip_mp3_metadata(data: bytes) -> bytes:
+    """MP3 바이트에서 ID3v2/ID3v1 태그와 Xing/Info 프레임을 제거합니다.
+
+    남는 것은 순수 오디오 프레임뿐이므로, 같은 인코딩의 결과물끼리는
+    바이트를 이어 붙이기만 해도 올바른 MP3 스트림이 됩니다.
+    첫 프레임의 Xing 헤더를 남겨두면 디코더가 첫 청크 길이를
+    전체 길이로 오인하므로 반드시 제거해야 합니다.
+    """
+    start = _id3v2_size(data)
+    end = len(data)
+    if end - start >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+
+    # 첫 번째 유효 프레임까지 건너뛰기
+    while start < end and parse_mp3_frame_header(data, start) is None:
+        start += 1
+
+    header = parse_mp3_frame_header(data, start)
+    if header is not None and _is_vbr_info_frame(data, start, header):
+        start += header["frame_length"]
+
+    return data[start:end]
+
+
+def read_mp3_format(data: bytes) -> Optional[Dict[str, int]]:
+    """첫 오디오 프레임의 인코딩 정보(version, sample_rate, channels)를 반환합니다."""
+    start = _id3v2_size(data)
+    while start + 4 <= len(data):
+        header = parse_mp3_frame_header(data, start)
+        if header is not None:
+            return {
+                "version": header["version"],
+                "sample_rate": header["sample_rate"],
+                "channels": header["channels"],
+            }
+        start += 1
+    return None
+
+
+def mp3_duration(data: bytes) -> Optional[float]:
+    """MP3 프레임 헤더를 순회하며 오디오 길이(초)를 계산합니다.
+
+    디코더나 ffmpeg 프로세스 없이 프레임 수 × 프레임당 샘플 수로 계산하므로
+    CBR/VBR 모두 정확합니다. Xing/Info 프레임은 오디오가 아니므로 제외합니다.
+
+    Args:
+        data: MP3 바이트.
+
+    Returns:
+        길이(초). 유효한 프레임이 하나도 없으면 None.
+    """
+    pos = _id3v2_size(data)
+    end = len(data)
+    if end - pos >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+
+    total_samples = 0
+    sample_rate = None
+    first = True
+    while pos + 4 <= end:
+        header = parse_mp3_frame_header(data, pos)
+        if header is None or header["frame_length"] <= 0:
+            pos += 1  # 동기 재탐색
+            continue
+        if first:
+            first = False
+            if _is_vbr_info_frame(data, pos, header):
+                pos += header["frame_length"]
+                continue
+        if pos + header["frame_length"] > end:
+            break  # 잘린 마지막 프레임
+        total_samples += header["samples"]
+        sample_rate = header["sample_rate"]
+        pos += header["frame_length"]
+
+    if not sample_rate:
+        return None
+    return total_samples / sample_rate
+
+
+def get_audio_duration(path: str) -> float:
+    """오디오 파일 길이(초)를 반환합니다.
+
+    MP3는 프레임 헤더 파싱으로 계산하고(서브프로세스 없음),
+    그 외 형식이나 파싱에 실패한 경우에만 moviepy(ffmpeg)로 읽습니다.
+    """
+    if path.lower().endswith(".mp3"):
+        with open(path, "rb") as f:
+            duration = mp3_duration(f.read())
+        if duration is not None:
+            return duration
+
+    from moviepy.editor import AudioFileClip
+
+    clip = AudioFileClip(path)
+    try:
+        return clip.duration
+    finally:
+        clip.close()
+
+
+def concat_mp3_bytes(paths: List[str], output_path: str) -> None:
+    """같은 인코딩의 MP3 파일들을 디코딩 없이 프레임 단위로 이어 붙입니다.
+
+    Raises:
+        ValueError: 파일들의 샘플레이트/채널/MPEG 버전이 다른 경우
+    """
+    expected = None
+    tmp_path = output_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            for path in paths:
+                with open(path, "rb") as f:
+                    data = f.read()
+                fmt = read_mp3_format(data)
+                if fmt is None:
+                    raise ValueError(f"MP3 프레임을 찾을 수 없습니다: {path}")
+                if expected is None:
+                    expected = fmt
+                elif fmt != expected:
+                    raise ValueError(f"MP3 인코딩이 다릅니다: {path} ({fmt} != {expected})")
+                out.write(strip_mp3_metadata(data))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def concat_audio_ffmpeg(paths: List[str], output_path: str, copy: bool = True) -> None:
+    """ffmpeg concat demuxer로 오디오 파일들을 이어 붙입니다.
+
+    Args:
+        paths: 입력 오디오 파일 경로 리스트 (순서대로 병합).
+        output_path: 출력 파일 경로.
+        copy: True면 재인코딩 없이 스트림 복사, False면 MP3로 재인코딩.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", delete=False, encoding="utf-8"
+    ) as list_file:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+        list_path = list_file.name
+
+    cmd = [
+        FFMPEG, "-y",
+        "-hide_banner", "-loglevel", "error",
+        "-f", "concat", "-safe", "0",
+        "-i", list_path,
+    ]
+    cmd += ["-c", "copy"] if copy else ["-c:a", "libmp3lame", "-q:a", "2"]
+    cmd.append(output_path)
+
+    try:
+        run_ffmpeg(cmd, "audio_concat", inputs=paths, output=output_path)
+    finally:
+        os.remove(list_path)
+
+
+def concat_audio_moviepy(paths: List[str], output_path: str) -> None:
+    """moviepy로 디코딩 후 재인코딩하여 병합합니다 (기존 방식, 비교용)."""
+    from moviepy.audio.AudioClip import concatenate_audioclips
+    from moviepy.editor import AudioFileClip
+
+    clips = [AudioFileClip(path) for path in paths]
+    try:
+        concatenate_audioclips(clips).write_audiofile(output_path)
+    finally:
+        for clip in clips:
+            clip.close()
+
+
+def concat_audio_files(paths: List[str], output_path: str, method: str = "auto") -> str:
+    """오디오 파일들을 순서대로 하나의 파일로 병합합니다.
+
+    Args:
+        paths: 입력 오디오 파일 경로 리스트.
+        output_path: 출력 파일 경로.
+        method: 병합 방식
+            - "auto": 모든 청크가 같은 MP3 인코딩이면 바이트 병합,
+                      아니면 ffmpeg concat demuxer로 재인코딩
+            - "bytes": MP3 프레임 바이트 병합 (디코딩 없음)
+            - "ffmpeg": ffmpeg concat demuxer 스트림 복사 (디코딩 없음)
+            - "moviepy": 기존 moviepy 디코딩/재인코딩
+
+    Returns:
+        실제로 사용한 병합 방식.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    if method == "moviepy":
+        concat_audio_moviepy(paths, output_path)
+        return method
+    if method == "ffmpeg":
+        concat_audio_ffmpeg(paths, output_path, copy=True)
+        return method
+    if method == "bytes":
+        concat_mp3_bytes(paths, output_path)
+        return method
+    if method != "auto":
+        raise ValueError(f"지원하지 않는 병합 방식입니다: {method}")
+
+    try:
+        concat_mp3_bytes(paths, output_path)
+        return "bytes"
+    except ValueError as exc:
+        print(f"⚠️ 바이트 병합 불가, ffmpeg 재인코딩으로 대체: {exc}")
+        concat_audio_ffmpeg(paths, output_path, copy=False)
+        return "ffmpeg"
@@ -1,8 +1,13 @@
 """통합 인증 모듈 - OpenAI 및 GCP 인증을 중앙에서 관리합니다."""
 
+import asyncio
 import os
-from typing import Optional
-from openai import OpenAI
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
 from google.cloud import texttospeech_v1beta1 as texttospeech
 from dotenv import load_dotenv
 
@@ -11,12 +16,48 @@ load_dotenv()
 # GCP 인증 관련 상수
 GCP_KEY_PATH = "/root/.gcp/service_account.json"
 
+# OpenAI HTTP 연결 풀 설정 (keep-alive 재사용)
+OPENAI_HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=120.0,
+)
+
+# 프로세스 전역 클라이언트 풀
+# - 동기 클라이언트: API 키별 1개 (스레드 간 공유)
+# - 비동기 클라이언트: 이벤트 루프별 1개 (루프가 사라지면 항목도 함께 해제)
+_lock = threading.Lock()
+_openai_clients: Dict[str, OpenAI] = {}
+_async_openai_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # 루프 → {API 키: 클라이언트}
+_async_tts_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # 루프 → 클라이언트
+_tts_client: Optional[texttospeech.TextToSpeechClient] = None
+_gcp_key_paths: Dict[Optional[str], str] = {}
+
+# 대체 클라이언트 (오프라인 벤치마크 등에서 실제 API 대신 사용)
+_client_overrides: Dict[str, Any] = {}
+
+
+def set_client_overrides(openai_client: Any = None, tts_client: Any = None) -> None:
+    """`get_openai_client` / `get_tts_client`가 반환할 대체 클라이언트를 설정합니다.
+
+    같은 인터페이스(`responses.create`, `images.generate`, `synthesize_speech`)를
+    제공하는 객체라면 무엇이든 쓸 수 있습니다. None을 넘긴 항목은 실제 클라이언트로 돌아갑니다.
+    대체 OpenAI 클라이언트가 설정되어 있으면 API 키가 없어도 됩니다.
+    """
+    with _lock:
+        for name, client in (("openai", openai_client), ("tts", tts_client)):
+            if client is None:
+                _client_overrides.pop(name, None)
+            else:
+                _client_overrides[name] = client
+
 
 def setup_gcp_credentials(key_file: Optional[str] = None) -> str:
     """GCP 인증을 설정하고 키 파일 경로를 반환합니다.
     
     Modal 환경에서는 환경변수에서 읽어서 파일로 저장하고,
     로컬 환경에서는 직접 경로를 사용합니다.
+    결과는 프로세스 안에서 재사용하므로, 웜 컨테이너의 반복 호출은 파일을 다시 쓰지 않습니다.
     
     Args:
         key_file: GCP 키 파일 경로 (선택사항)
@@ -28,14 +69,28 @@ def setup_gcp_credentials(key_file: Optional[str] = None) -> str:
         RuntimeError: GCP 인증 정보가 설정되지 않은 경우
         FileNotFoundError: 키 파일이 존재하지 않는 경우
     """
+    with _lock:
+        cached = _gcp_key_paths.get(key_file)
+        if cached and os.path.exists(cached):
+            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = cached
+            return cached
+        key_path = _setup_gcp_credentials(key_file)
+        _gcp_key_paths[key_file] = key_path
+        return key_path
+
+
+def _setup_gcp_credentials(key_file: Optional[str]) -> str:
+    """`setup_gcp_credentials`의 실제 설정 로직 (캐시 없음)."""
     # Modal 환경: 환경변수에서 JSON 문자열 읽기
     gcp_json = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
     if gcp_json and not os.path.exists(gcp_json):
         # 환경변수가 JSON 문자열인 경우 (Modal Secret)
         os.makedirs("/root/.gcp", exist_ok=True)
         if not os.path.exists(GCP_KEY_PATH):
-            with open(GCP_KEY_PATH, "w") as f:
+            tmp_path = GCP_KEY_PATH + ".tmp"
+            with open(tmp_path, "w") as f:
                 f.write(gcp_json)
+            os.replace(tmp_path, GCP_KEY_PATH)
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = GCP_KEY_PATH
         return GCP_KEY_PATH
     
@@ -54,10 +109,21 @@ def setup_gcp_credentials(key_file: Optional[str] = None) -> str:
     raise RuntimeError("GCP Secret(GOOGLE_APPLICATION_CREDENTIALS)가 설정되지 않았습니다.")
 
 
+def _get_openai_api_key() -> str:
+    """환경 변수 `T2I_APP_API_KEY`에서 OpenAI API 키를 읽습니다 (없으면 ValueError)."""
+    api_key = os.getenv("T2I_APP_API_KEY")
+    if not api_key:
+        raise ValueError("환경변수 T2I_APP_API_KEY가 설정되어 있지 않습니다.")
+    return api_key
+
+
 def get_openai_client() -> OpenAI:
     """OpenAI 클라이언트 인스턴스를 반환합니다.
     
     환경 변수 `T2I_APP_API_KEY`에서 API 키를 읽어 사용합니다.
+    클라이언트는 API 키별로 프로세스 전역에서 재사용되며(스레드 안전),
+    keep-alive HTTP 연결 풀을 공유하므로 반복 호출 시 TLS 핸드셰이크를 생략합니다.
+    재시도는 `rate_limited_call`이 담당하므로 SDK 자체 재시도는 끕니다.
     
     Returns:
         OpenAI: 인증된 OpenAI 클라이언트
@@ -65,18 +131,92 @@ def get_openai_client() -> OpenAI:
     Raises:
         ValueError: API 키가 설정되지 않은 경우
     """
-    api_key = os.getenv("T2I_APP_API_KEY")
-    if not api_key:
-        raise ValueError("환경변수 T2I_APP_API_KEY가 설정되어 있지 않습니다.")
-    
-    return OpenAI(api_key=api_key)
+    override = _client_overrides.get("openai")
+    if override is not None:
+        return override
+
+    api_key = _get_openai_api_key()
+    with _lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            client = OpenAI(
+                api_key=api_key,
+                max_retries=0,
+                http_client=httpx.Client(limits=OPENAI_HTTP_LIMITS),
+            )
+            _openai_clients[api_key] = client
+        return client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """현재 이벤트 루프에서 재사용할 AsyncOpenAI 클라이언트를 반환합니다.
+
+    httpx 비동기 연결은 이벤트 루프에 묶이므로 루프별로 하나씩 유지합니다.
+    루프 객체를 약한 참조 키로 쓰므로, 닫힌 루프의 id가 재사용되어 다른 루프에
+    잘못된 클라이언트가 돌아가는 일이 없고 루프가 해제되면 항목도 사라집니다.
+    실행 중인 이벤트 루프 안에서 호출해야 합니다.
+    """
+    override = _client_overrides.get("openai")
+    if override is not None:
+        return override
+
+    api_key = _get_openai_api_key()
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_openai_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                max_retries=0,
+                http_client=httpx.AsyncClient(limits=OPENAI_HTTP_LIMITS),
+            )
+            clients[api_key] = client
+        return client
 
 
 def get_tts_client() -> texttospeech.TextToSpeechClient:
     """Google Cloud Text-to-Speech 클라이언트 인스턴스를 반환합니다.
     
+    gRPC 채널은 스레드 안전하므로 프로세스 전역에서 하나의 클라이언트(채널)를 공유합니다.
+    
     Returns:
         texttospeech.TextToSpeechClient: TTS 클라이언트
     """
-    return texttospeech.TextToSpeechClient()
+    global _tts_client
+    override = _client_overrides.get("tts")
+    if override is not None:
+        return override
+
+    with _lock:
+        if _tts_client is None:
+            _tts_client = texttospeech.TextToSpeechClient()
+        return _tts_client
+
+
+def get_tts_async_client() -> texttospeech.TextToSpeechAsyncClient:
+    """현재 이벤트 루프에서 재사용할 비동기 TTS 클라이언트를 반환합니다.
+
+    grpc.aio 채널은 이벤트 루프에 묶이므로 루프별로 하나씩 유지합니다 (약한 참조 키).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_tts_clients.get(loop)
+        if client is None:
+            client = texttospeech.TextToSpeechAsyncClient()
+            _async_tts_clients[loop] = client
+        return client
+
 
+def reset_clients() -> None:
+    """풀에 보관된 클라이언트와 대체 클라이언트를 모두 버립니다 (자격 증명 변경/테스트용)."""
+    global _tts_client
+    with _lock:
+        for client in _openai_clients.values():
+            client.close()
+        _openai_clients.clear()
+        _async_openai_clients.clear()
+        _async_tts_clients.clear()
+        _tts_client = None
+        _gcp_key_paths.clear()
+        _client_overrides.clear()
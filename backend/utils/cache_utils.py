@@ -0,0 +1,262 @@
+"""디스크 캐시 유틸리티 - 콘텐츠 해시 기반 아티팩트 캐시"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 캐시 루트 디렉터리 (환경변수 VIDEO_CACHE_DIR 로 오버라이드 가능)
+DEFAULT_CACHE_ROOT = os.path.join(Path.home(), ".cache", "ai-story-video")
+# 이 횟수만큼 저장할 때마다 디렉터리를 다시 스캔해 다른 프로세스가 쓴 용량을 반영
+EVICT_RESCAN_EVERY = 64
+# 정리할 때 한도의 이 비율까지 비워, 가득 찬 캐시에서 저장할 때마다 스캔하지 않도록 함
+EVICT_TARGET_RATIO = 0.9
+
+
+def get_cache_root() -> str:
+    """캐시 루트 디렉터리를 반환합니다.
+
+    여러 Modal 컨테이너가 캐시를 공유하려면
+    마운트된 Volume 경로를 `VIDEO_CACHE_DIR`로 지정합니다.
+    """
+    return os.environ.get("VIDEO_CACHE_DIR", DEFAULT_CACHE_ROOT)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """캐시 키 구성 요소들로부터 SHA-256 해시 키를 만듭니다.
+
+    Args:
+        *parts: JSON 직렬화 가능한 키 구성 요소들.
+
+    Returns:
+        16진수 해시 문자열.
+    """
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """크기 제한과 LRU 정리를 지원하는 파일 기반 캐시.
+
+    - 키마다 하나의 파일(`{key[:2]}/{key}{suffix}`)로 저장합니다.
+    - 쓰기는 임시 파일 + `os.replace`로 원자적으로 수행하므로
+      여러 프로세스/컨테이너가 같은 디렉터리를 공유해도 안전합니다.
+    - 조회 시 파일 mtime을 갱신하고, 용량 초과 시 mtime이 오래된 순으로 삭제합니다.
+      사용량은 저장할 때마다 누적하고, 한도를 넘었거나 `EVICT_RESCAN_EVERY`번 저장했을 때만
+      디렉터리 전체를 스캔합니다.
+    - 적중/미스 카운터는 프로세스 단위로 집계됩니다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: Optional[int] = None,
+        suffix: str = "",
+    ):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # 마지막 스캔 이후 누적 사용량 (None: 미스캔)
+        self._puts_since_scan = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        """키에 해당하는 캐시 파일 경로를 반환합니다 (존재 여부와 무관)."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self.suffix}")
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_path(self, key: str) -> Optional[str]:
+        """캐시 파일 경로를 반환합니다. 없으면 None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path, None)
+        except OSError:
+            self._record(False)
+            return None
+        self._record(True)
+        return path
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """캐시된 바이트를 반환합니다. 없으면 None."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get_json(self, key: str) -> Optional[Any]:
+        """캐시된 JSON 값을 반환합니다. 없거나 손상되었으면 None."""
+        data = self.get_bytes(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        """바이트를 캐시에 저장하고 캐시 파일 경로를 반환합니다."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced_size = os.path.getsize(path)
+        except OSError:
+            replaced_size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - replaced_size
+            self._puts_since_scan += 1
+        self.evict()
+        return path
+
+    def put_json(self, key: str, value: Any) -> str:
+        """JSON 값을 캐시에 저장합니다."""
+        return self.put_bytes(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def put_file(self, key: str, src_path: str) -> str:
+        """파일을 캐시에 복사하고 캐시 파일 경로를 반환합니다."""
+        with open(src_path, "rb") as f:
+            return self.put_bytes(key, f.read())
+
+    def copy_to(self, key: str, dest_path: str) -> bool:
+        """캐시된 파일을 `dest_path`로 복사합니다. 적중하면 True."""
+        path = self.get_path(key)
+        if path is None:
+            return False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+            shutil.copyfile(path, dest_path)
+        except OSError:
+            return False
+        return True
+
+    def evict(self) -> None:
+        """용량 제한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+
+        누적 사용량이 한도 이내이고 재스캔 주기가 아니면 디렉터리를 스캔하지 않습니다.
+        """
+        if not self.max_bytes:
+            return
+        with self._lock:
+            if (
+                self._total_bytes is not None
+                and self._total_bytes <= self.max_bytes
+                and self._puts_since_scan < EVICT_RESCAN_EVERY
+            ):
+                return
+            self._puts_since_scan = 0
+
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total > self.max_bytes:
+            target = int(self.max_bytes * EVICT_TARGET_RATIO)
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                with self._lock:
+                    self.evictions += 1
+
+        with self._lock:
+            self._total_bytes = total
+
+    def stats(self) -> Dict[str, int]:
+        """적중/미스/정리 카운터를 반환합니다."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_caches: Dict[str, DiskCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_named_cache(
+    name: str,
+    env_dir: str,
+    env_max_bytes: str,
+    default_max_bytes: Optional[int],
+    suffix: str = "",
+) -> DiskCache:
+    """프로세스 전역에서 공유하는 이름 있는 캐시를 반환합니다.
+
+    Args:
+        name: 캐시 이름 (캐시 루트 아래 하위 디렉터리 이름).
+        env_dir: 캐시 디렉터리를 오버라이드하는 환경변수 이름.
+        env_max_bytes: 용량 제한(바이트)을 오버라이드하는 환경변수 이름.
+        default_max_bytes: 기본 용량 제한 (None이면 무제한).
+        suffix: 캐시 파일 확장자.
+
+    Returns:
+        DiskCache 인스턴스.
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache_dir = os.environ.get(env_dir) or os.path.join(get_cache_root(), name)
+            max_bytes_env = os.environ.get(env_max_bytes)
+            max_bytes = int(max_bytes_env) if max_bytes_env else default_max_bytes
+            cache = DiskCache(cache_dir, max_bytes=max_bytes, suffix=suffix)
+            _caches[name] = cache
+        return cache
+
+
+def get_image_cache() -> DiskCache:
+    """챕터 이미지 캐시를 반환합니다.
+
+    - `IMAGE_CACHE_DIR`: 캐시 디렉터리 (공유 Volume 경로 지정 가능)
+    - `IMAGE_CACHE_MAX_BYTES`: 용량 제한 (기본값: 2GB)
+    """
+    return get_named_cache(
+        "images",
+        env_dir="IMAGE_CACHE_DIR",
+        env_max_bytes="IMAGE_CACHE_MAX_BYTES",
+        default_max_bytes=2 * 1024 ** 3,
+        suffix=".png",
+    )
@@ -0,0 +1,131 @@
+"""비디오 인코더 선택 유틸리티 - 사용 가능한 인코더를 감지하고 인코딩 옵션을 구성합니다."""
+
+import subprocess
+from functools import lru_cache
+from typing import FrozenSet, List
+
+FFMPEG = "ffmpeg"
+
+# 하드웨어 인코더 (우선순위 순)
+HW_ENCODERS = ["h264_nvenc"]
+# CPU 인코더 (우선순위 순)
+CPU_ENCODERS = ["libx264", "libx265"]
+SUPPORTED_ENCODERS = HW_ENCODERS + CPU_ENCODERS
+
+# 정지 이미지 콘텐츠용 키프레임 간격 (초)
+STILL_KEYINT_SECONDS = 10
+
+
+@lru_cache(maxsize=1)
+def list_ffmpeg_encoders() -> FrozenSet[str]:
+    """`ffmpeg -encoders` 출력에서 비디오 인코더 이름 목록을 읽습니다 (프로세스당 1회)."""
+    try:
+        proc = subprocess.run(
+            [FFMPEG, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+
+    names = set()
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        # 예: " V....D libx264   libx264 H.264 / AVC ..."
+        if len(parts) >= 2 and parts[0].startswith("V") and len(parts[0]) == 6:
+            names.add(parts[1])
+    return frozenset(names)
+
+
+@lru_cache(maxsize=None)
+def is_encoder_usable(encoder: str) -> bool:
+    """인코더가 실제로 동작하는지 확인합니다 (인코더별 프로세스당 1회).
+
+    h264_nvenc 는 ffmpeg 빌드에 포함되어 있어도 GPU/드라이버가 없으면 실패하므로,
+    작은 테스트 인코딩으로 확인합니다.
+    """
+    if encoder not in list_ffmpeg_encoders():
+        return False
+    if encoder not in HW_ENCODERS:
+        return True
+
+    try:
+        subprocess.run(
+            [
+                FFMPEG, "-hide_banner", "-loglevel", "error",
+                "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+                "-c:v", encoder, "-f", "null", "-",
+            ],
+            capture_output=True,
+            check=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return False
+    return True
+
+
+def select_video_encoder(preferred: str = "auto") -> str:
+    """사용할 비디오 인코더를 결정합니다.
+
+    Args:
+        preferred: "auto" 또는 인코더 이름 ("h264_nvenc", "libx264", "libx265").
+            "auto"면 사용 가능한 하드웨어 인코더를 우선하고 없으면 CPU 인코더를 씁니다.
+            지정한 인코더를 쓸 수 없으면 경고 후 자동 선택으로 대체합니다.
+
+    Returns:
+        인코더 이름.
+    """
+    if preferred != "auto":
+        if preferred not in SUPPORTED_ENCODERS:
+            raise ValueError(f"지원하지 않는 video_encoder 입니다: {preferred}")
+        if is_encoder_usable(preferred):
+            return preferred
+        print(f"⚠️ {preferred} 인코더를 사용할 수 없어 자동 선택으로 대체합니다.")
+
+    for encoder in SUPPORTED_ENCODERS:
+        if is_encoder_usable(encoder):
+            return encoder
+
+    # 감지 실패 시 (ffmpeg 목록 조회 불가 등) 가장 보편적인 CPU 인코더 사용
+    return "libx264"
+
+
+def video_encoder_args(encoder: str, fps: int) -> List[str]:
+    """인코더별 ffmpeg 출력 옵션을 반환합니다.
+
+    CPU 인코더는 정지 이미지 콘텐츠에 맞춰 튜닝합니다.
+    - libx264: `-tune stillimage`, 긴 키프레임 간격
+    - libx265: 긴 키프레임 간격, Apple 호환 `hvc1` 태그
+
+    Args:
+        encoder: 인코더 이름.
+        fps: 출력 프레임레이트 (키프레임 간격 계산용).
+
+    Returns:
+        ffmpeg 인자 리스트.
+    """
+    keyint = str(max(1, int(fps * STILL_KEYINT_SECONDS)))
+
+    if encoder == "h264_nvenc":
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18"]
+    if encoder == "libx264":
+        return [
+            "-c:v", "libx264",
+            "-preset", "veryfast",
+            "-tune", "stillimage",
+            "-crf", "20",
+            "-g", keyint,
+            "-pix_fmt", "yuv420p",
+        ]
+    if encoder == "libx265":
+        return [
+            "-c:v", "libx265",
+            "-preset", "fast",
+            "-crf", "24",
+            "-x265-params", f"keyint={keyint}:log-level=error",
+            "-pix_fmt", "yuv420p",
+            "-tag:v", "hvc1",
+        ]
+    raise ValueError(f"지원하지 않는 video_encoder 입니다: {encoder}")
@@ -0,0 +1,208 @@
+"""이벤트 기반(VFR) 렌더링 - 화면이 바뀌는 시점에만 프레임을 인코딩합니다.
+
+정지 이미지 슬라이드쇼는 챕터 전환과 자막 시작/끝에서만 화면이 바뀝니다.
+이 시점들로 타임라인을 나누고 구간마다 프레임 하나를 길이(duration)와 함께 내보내므로,
+인코더 작업량은 영상 길이가 아니라 이벤트 수에 비례합니다.
+(2시간 오디오북: CFR 25fps 약 18만 프레임 → 이벤트 수천 개)
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.audio_utils import get_audio_duration
+from utils.encoder_utils import select_video_encoder, video_encoder_args
+from utils.render import (
+    FFMPEG,
+    audio_mix_args,
+    chapter_image_paths,
+    resolve_chapter_timeline,
+    still_image_filter,
+    subtitle_json_to_ass,
+)
+from utils.subtitle_modes import soft_subtitle_args, subtitle_json_to_vtt, validate_subtitle_mode
+from utils.tracing import run_ffmpeg
+
+# 이벤트 시각 정밀도 (ASS 자막 시각이 1/100초 단위이므로 같은 격자에 맞춤)
+EVENT_DECIMALS = 2
+
+# VFR 출력의 키프레임 간격 계산용 "프레임레이트" (이벤트 10개마다 키프레임)
+EVENT_KEYINT_FPS = 1
+
+
+def _round_time(t: float) -> float:
+    return round(float(t), EVENT_DECIMALS)
+
+
+def round_subtitles(subs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """자막 시각을 이벤트 격자(1/100초)에 맞춥니다.
+
+    ASS 파일과 이벤트 타임라인이 같은 시각을 쓰도록 해야,
+    구간 시작 프레임이 자막 시작보다 아주 조금 앞서 자막이 빠지는 일이 없습니다.
+    """
+    rounded = []
+    for sub in subs:
+        start, end = _round_time(sub["start"]), _round_time(sub["end"])
+        if end > start:
+            rounded.append({**sub, "start": start, "end": end})
+    return rounded
+
+
+def build_event_timeline(
+    timeline: List[Tuple[float, float]],
+    subs: List[Dict[str, Any]],
+    total_duration: float,
+) -> List[Tuple[float, float, int]]:
+    """챕터 전환과 자막 시작/끝 시각으로 화면 상태가 일정한 구간들을 만듭니다.
+
+    Args:
+        timeline: 챕터별 (start, end) 구간 리스트
+        subs: 자막 리스트 (`round_subtitles`를 거친 값)
+        total_duration: 전체 길이(초)
+
+    Returns:
+        (start, duration, chapter_index) 리스트. 구간 안에서는 이미지와 자막이 바뀌지 않습니다.
+    """
+    end_time = _round_time(total_duration)
+    chapter_starts = [_round_time(start) for start, _ in timeline]
+
+    points = {0.0, end_time}
+    points.update(chapter_starts)
+    for sub in subs:
+        points.add(sub["start"])
+        points.add(sub["end"])
+    points = sorted(t for t in points if 0.0 <= t <= end_time)
+
+    events: List[Tuple[float, float, int]] = []
+    chapter = 0
+    for start, end in zip(points[:-1], points[1:]):
+        while chapter + 1 < len(chapter_starts) and chapter_starts[chapter + 1] <= start:
+            chapter += 1
+        events.append((start, _round_time(end - start), chapter))
+    return events
+
+
+def _write_concat_list(
+    events: List[Tuple[float, float, int]],
+    image_paths: List[str],
+    list_path: str,
+) -> None:
+    """이벤트마다 `file` + `duration` 항목을 쓰는 concat demuxer 목록을 만듭니다.
+
+    concat demuxer는 마지막 항목의 duration을 무시하므로 마지막 파일을 한 번 더 적습니다.
+    """
+    def entry(path: str) -> str:
+        escaped = os.path.abspath(path).replace("'", "'\\''")
+        return f"file '{escaped}'\n"
+
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("ffconcat version 1.0\n")
+        for _, duration, chapter in events:
+            f.write(entry(image_paths[chapter]))
+            f.write(f"duration {duration:.{EVENT_DECIMALS}f}\n")
+        if events:
+            f.write(entry(image_paths[events[-1][2]]))
+
+
+def run_event_merge(
+    output_dir,
+    output_video,
+    subtitle_json_path,
+    final_audio_path,
+    generated_images_dir,
+    chapters_json_path,
+    width,
+    height,
+    bgm_path=None,
+    bgm_db=0.0,
+    video_encoder="auto",
+    image_paths: Optional[List[str]] = None,
+    subtitle_mode: str = "burn",
+):
+    """이벤트 기반 VFR 렌더링을 수행합니다.
+
+    1. 챕터 경계와 자막 시작/끝으로 이벤트 구간을 만듭니다.
+    2. concat demuxer 목록에 구간마다 챕터 이미지와 구간 길이를 적습니다.
+       각 항목은 구간 시작 시각(pts)을 가진 프레임 하나가 됩니다.
+    3. 프레임마다 scale + 자막을 한 번 적용하고 `-vsync vfr`로 프레임 길이를 유지해 인코딩합니다.
+       (`image_paths`로 전처리된 이미지가 주어지면 scale은 생략)
+
+    `subtitle_mode`는 "burn"과 "soft"를 지원합니다. "soft"면 자막 시각이 이벤트에서 빠지므로
+    챕터 수만큼의 프레임만 인코딩하고, 자막은 mov_text 트랙과 `subtitle.vtt` 사이드카로 내보냅니다.
+
+    Returns:
+        인코딩한 이벤트(프레임) 수
+    """
+    validate_subtitle_mode(subtitle_mode, supported=("burn", "soft"))
+    os.makedirs(output_dir, exist_ok=True)
+
+    with open(subtitle_json_path, "r", encoding="utf-8") as f:
+        subs = round_subtitles(json.load(f))
+    with open(chapters_json_path, "r", encoding="utf-8") as f:
+        chapters = json.load(f)
+
+    total_duration = get_audio_duration(final_audio_path)
+    prescaled = image_paths is not None
+    if not prescaled:
+        image_paths = chapter_image_paths(generated_images_dir, chapters)
+    timeline = resolve_chapter_timeline(subtitle_json_path, chapters, total_duration)
+    burn = subtitle_mode == "burn"
+    events = build_event_timeline(timeline, subs if burn else [], total_duration)
+
+    ass_path = os.path.join(output_dir, "subtitle.ass")
+    subtitle_json_to_ass(subs, ass_path)
+    if not burn:
+        subtitle_json_to_vtt(subs, os.path.join(output_dir, "subtitle.vtt"))
+    list_path = os.path.join(output_dir, "events.ffconcat")
+    _write_concat_list(events, image_paths, list_path)
+
+    encoder = select_video_encoder(video_encoder)
+    print(f"🎞 이벤트 렌더링: 프레임 {len(events)}개 (VFR), 인코더 {encoder}")
+
+    cmd = [FFMPEG, "-y", "-f", "concat", "-safe", "0", "-i", list_path]
+    audio_inputs, audio_filter, audio_map = audio_mix_args(
+        1, final_audio_path, bgm_path, bgm_db
+    )
+    cmd += audio_inputs
+    subtitle_output_args = []
+    video_filter = still_image_filter(width, height, prescaled)
+    if burn:
+        video_filter += f",subtitles={ass_path}"
+    else:
+        subtitle_inputs, subtitle_output_args = soft_subtitle_args(
+            ass_path, 3 if bgm_path else 2
+        )
+        cmd += subtitle_inputs
+
+    filter_complex = f"[0:v]{video_filter}[v]"
+    if audio_filter:
+        filter_complex += ";" + audio_filter
+
+    cmd += [
+        "-filter_complex", filter_complex,
+        "-map", "[v]",
+        "-map", audio_map,
+    ]
+    cmd += subtitle_output_args
+    cmd += [
+        # 프레임 복제/삭제 없이 입력 타임스탬프 유지 (ffmpeg 4.x 호환 옵션)
+        "-vsync", "vfr",
+    ]
+    cmd += video_encoder_args(encoder, EVENT_KEYINT_FPS)
+    cmd += [
+        "-c:a", "aac",
+        "-b:a", "192k",
+        "-shortest",
+        output_video,
+    ]
+
+    try:
+        run_ffmpeg(
+            cmd,
+            "render_events",
+            inputs=image_paths + [final_audio_path] + ([bgm_path] if bgm_path else []),
+            output=output_video,
+        )
+    finally:
+        os.remove(list_path)
+    return len(events)
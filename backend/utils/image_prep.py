@@ -0,0 +1,81 @@
+"""챕터 이미지 전처리 - 렌더링 해상도에 맞춰 한 번만 리사이즈/크롭합니다."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from utils.render import FFMPEG
+from utils.tracing import propagate, run_ffmpeg, span
+
+
+def prepared_image_path(image_path: str, width: int, height: int) -> str:
+    """전처리된 이미지 경로 (원본 옆에 `{이름}.{W}x{H}.png`로 저장)."""
+    stem, _ = os.path.splitext(image_path)
+    return f"{stem}.{width}x{height}.png"
+
+
+def _is_fresh(prepared_path: str, image_path: str) -> bool:
+    """전처리 결과가 있고 원본보다 새로우면 True."""
+    return (
+        os.path.exists(prepared_path)
+        and os.path.getsize(prepared_path) > 0
+        and os.path.getmtime(prepared_path) >= os.path.getmtime(image_path)
+    )
+
+
+def prepare_image(image_path: str, width: int, height: int) -> str:
+    """이미지를 목표 해상도로 채우도록 확대/축소한 뒤 가운데를 잘라 저장합니다.
+
+    비율이 다른 경우(예: 1536x1024 → 1080x1920) 여백 없이 화면을 채우고,
+    SAR을 1로 고정해 렌더링 그래프에서 추가 변환이 필요 없도록 합니다.
+    이미 최신 결과가 있으면 다시 만들지 않습니다.
+    """
+    prepared_path = prepared_image_path(image_path, width, height)
+    with span("image.prepare", kind="image", width=width, height=height) as sp:
+        if _is_fresh(prepared_path, image_path):
+            sp.set(cache_hit=True)
+            return prepared_path
+
+        tmp_path = prepared_path[:-len(".png")] + ".tmp.png"
+        cmd = [
+            FFMPEG, "-y", "-hide_banner", "-loglevel", "error",
+            "-i", image_path,
+            "-vf",
+            f"scale={width}:{height}:force_original_aspect_ratio=increase:flags=lanczos,"
+            f"crop={width}:{height},setsar=1",
+            "-frames:v", "1",
+            tmp_path,
+        ]
+        run_ffmpeg(cmd, "image_prepare", inputs=[image_path], output=tmp_path)
+        os.replace(tmp_path, prepared_path)
+        sp.set(cache_hit=False)
+        return prepared_path
+
+
+def prepare_chapter_images(
+    image_paths: List[str],
+    width: int,
+    height: int,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """챕터 이미지들을 CPU 코어 수만큼 동시에 전처리합니다.
+
+    Args:
+        image_paths: 원본 이미지 경로 리스트
+        width: 렌더링 가로 해상도
+        height: 렌더링 세로 해상도
+        max_workers: 동시 처리 수 (None이면 CPU 코어 수)
+
+    Returns:
+        입력 순서대로 정렬된 전처리 이미지 경로 리스트
+    """
+    if not image_paths:
+        return []
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(image_paths)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(propagate(prepare_image), path, width, height)
+            for path in image_paths
+        ]
+        return [future.result() for future in futures]
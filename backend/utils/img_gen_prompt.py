@@ -3,7 +3,14 @@
 import base64
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from utils.cache_utils import DiskCache, make_cache_key
+from utils.rate_limiter import rate_limited_call
+from utils.tracing import current_span
+
+# 이미지 생성 모델
+IMAGE_MODEL = "gpt-image-1-mini"
 
 
 def get_default_img_prompt() -> str:
@@ -98,6 +105,18 @@ def build_prompt_from_meta(meta: Dict[str, str]) -> str:
     )
 
 
+def get_chapter_image_filename(chapter: Dict[str, Any]) -> str:
+    """챕터 이미지 파일 이름(`{n}_{title}.png`)을 반환합니다.
+
+    Args:
+        chapter: 모델 응답의 단일 챕터 딕셔너리.
+
+    Returns:
+        이미지 파일 이름.
+    """
+    return f"{chapter['chapter_number']}_{chapter.get('chapter_title', 'chapter')}.png"
+
+
 def generate_and_save_image(
     client: Any,
     prompt: str,
@@ -105,9 +124,14 @@ def generate_and_save_image(
     filename: str,
     size: str,
     quality: str,
+    cache: Optional[DiskCache] = None,
 ) -> str:
     """OpenAI 이미지 API를 호출하여 이미지를 생성하고 디스크에 저장합니다.
 
+    공급자 레이트 리밋을 지키며, 429/5xx 등 일시적 오류는 지수 백오프로 재시도합니다.
+    `cache`가 주어지면 (모델, 프롬프트, 크기, 퀄리티) 해시로 캐시를 먼저 조회하고,
+    적중하면 API를 호출하지 않고 캐시된 이미지를 복사합니다.
+
     Args:
         client: OpenAI 이미지 생성을 위한 클라이언트 인스턴스.
         prompt: 이미지 생성에 사용할 텍스트 프롬프트.
@@ -115,6 +139,7 @@ def generate_and_save_image(
         filename: 저장할 파일 이름.
         size: 생성 이미지 해상도 옵션 (예: `"1280x720"`).
         quality: 이미지 퀄리티 옵션 (예: `"low"`).
+        cache: 이미지 캐시 (None이면 캐시 미사용).
 
     Returns:
         생성된 이미지의 전체 파일 경로.
@@ -122,14 +147,27 @@ def generate_and_save_image(
     os.makedirs(save_dir, exist_ok=True)
     save_path = os.path.join(save_dir, filename)
 
+    sp = current_span()
+    sp.set(bytes_in=len(prompt.encode("utf-8")))
+
+    cache_key = make_cache_key(IMAGE_MODEL, prompt, size, quality)
+    if cache is not None and cache.copy_to(cache_key, save_path):
+        print(f"♻️ 이미지 캐시 적중: {filename}")
+        sp.set(cache_hit=True, bytes_out=os.path.getsize(save_path))
+        return save_path
+
     print("size", size)
 
-    result = client.images.generate(
-        model="gpt-image-1-mini",
-        prompt=prompt,
-        size=size,
-        quality=quality,
-        n=1,
+    result = rate_limited_call(
+        "openai_images",
+        lambda: client.images.generate(
+            model=IMAGE_MODEL,
+            prompt=prompt,
+            size=size,
+            quality=quality,
+            n=1,
+        ),
+        label=filename,
     )
 
     image_b64 = result.data[0].b64_json
@@ -137,6 +175,10 @@ def generate_and_save_image(
 
     with open(save_path, "wb") as f:
         f.write(image_bytes)
+    sp.set(cache_hit=False, bytes_out=len(image_bytes))
+
+    if cache is not None:
+        cache.put_bytes(cache_key, image_bytes)
 
     return save_path
 
@@ -0,0 +1,94 @@
+"""스트리밍 JSON 파서 - 모델 응답이 도착하는 대로 배열 안의 완성된 객체를 꺼냅니다."""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+
+class StreamingArrayParser:
+    """텍스트 조각을 받아 `{"<key>": [ {...}, {...} ]}` 배열 원소를 하나씩 반환합니다.
+
+    - 배열 키 앞의 모든 텍스트(```json 코드블록 표시 등)는 무시합니다.
+    - 문자열 안의 괄호와 이스케이프를 구분하며 중괄호 깊이를 추적하므로,
+      객체의 닫는 중괄호가 도착하는 즉시 해당 원소를 파싱할 수 있습니다.
+    - 이미 스캔한 위치를 기억하므로 전체 처리량은 응답 길이에 비례합니다.
+    - 원소 하나라도 파싱에 실패하면 `failed`를 설정하고 이후 원소는 반환하지 않습니다
+      (원소 번호가 밀리지 않도록). 호출 측은 전체 텍스트(`text`)로 다시 파싱하면 됩니다.
+
+    사용 예:
+        parser = StreamingArrayParser("chapters")
+        for delta in deltas:
+            for index, chapter in parser.feed(delta):
+                ...
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.items: List[Dict[str, Any]] = []
+        self.done = False
+        self.failed = False
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = -1
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트."""
+        return self._buffer
+
+    def _find_array_start(self) -> bool:
+        """`"key"` 뒤의 `[` 위치를 찾아 배열 스캔을 시작합니다."""
+        key_pos = self._buffer.find(f'"{self.key}"')
+        if key_pos < 0:
+            return False
+        bracket = self._buffer.find("[", key_pos)
+        if bracket < 0:
+            return False
+        self._in_array = True
+        self._pos = bracket + 1
+        return True
+
+    def feed(self, chunk: str) -> List[Tuple[int, Dict[str, Any]]]:
+        """텍스트 조각을 추가하고, 이번에 완성된 (원소 번호, 객체) 리스트를 반환합니다."""
+        self._buffer += chunk
+        completed: List[Tuple[int, Dict[str, Any]]] = []
+        if self.done or self.failed or (not self._in_array and not self._find_array_start()):
+            return completed
+
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._item_start = pos
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        item = json.loads(buffer[self._item_start:pos + 1])
+                    except json.JSONDecodeError:
+                        self.failed = True
+                        break
+                    completed.append((len(self.items), item))
+                    self.items.append(item)
+            elif char == "]" and self._depth == 0:
+                self.done = True
+                pos += 1
+                break
+            pos += 1
+        self._pos = pos
+        return completed
@@ -0,0 +1,263 @@
+"""세그먼트 병렬 렌더링 유틸리티 - 타임라인을 나눠 여러 코어에서 동시에 인코딩합니다."""
+
+import json
+import math
+import os
+import shutil
+import tempfile
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from utils.audio_utils import get_audio_duration
+from utils.encoder_utils import select_video_encoder, video_encoder_args
+from utils.render import (
+    FFMPEG,
+    INPUT_FPS,
+    audio_mix_args,
+    chapter_image_paths,
+    load_sentence_index,
+    resolve_chapter_timeline,
+    still_image_filter,
+    subtitle_json_to_ass,
+)
+from utils.sentence_index import subtitle_bounds, subtitle_range
+from utils.subtitle_modes import soft_subtitle_args, subtitle_json_to_vtt, validate_subtitle_mode
+from utils.tracing import propagate, run_ffmpeg
+
+# 세그먼트 최대 길이 (초) - 챕터가 이보다 길면 더 잘게 나눠 코어를 채웁니다.
+DEFAULT_MAX_SEGMENT_SECONDS = 120
+
+
+def split_segments(
+    timeline: List[tuple],
+    total_duration: float,
+    fps: int = INPUT_FPS,
+    max_segment_seconds: float = DEFAULT_MAX_SEGMENT_SECONDS,
+    cut_points: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """챕터 경계에서 타임라인을 나누고, 긴 챕터는 최대 길이 단위로 다시 나눕니다.
+
+    모든 경계는 프레임 단위 정수로 계산하므로
+    세그먼트를 이어 붙인 결과의 프레임 수는 단일 인코딩과 같습니다.
+    `cut_points`(정렬된 문장 시작 시각)가 주어지면 긴 챕터는 최대 길이 이전의
+    마지막 문장 시작에서 자르므로, 자막이 세그먼트 경계에 걸쳐 나뉘는 일이 줄어듭니다.
+    (분할 지점은 bisect로 찾습니다.)
+
+    Returns:
+        {"chapter", "start_frame", "frames"} 딕셔너리 리스트 (시간 순)
+    """
+    total_frames = math.ceil(total_duration * fps)
+    max_frames = max(1, int(max_segment_seconds * fps))
+    cut_frames = sorted({round(t * fps) for t in cut_points}) if cut_points else []
+
+    segments = []
+    for chapter_index, (start, end) in enumerate(timeline):
+        start_frame = round(start * fps)
+        end_frame = total_frames if chapter_index == len(timeline) - 1 else round(end * fps)
+        frame = start_frame
+        while frame < end_frame:
+            frames = min(max_frames, end_frame - frame)
+            if end_frame - frame > max_frames and cut_frames:
+                # (frame, frame + max_frames] 안의 마지막 문장 시작
+                i = bisect_right(cut_frames, frame + max_frames) - 1
+                if i >= 0 and cut_frames[i] > frame:
+                    frames = cut_frames[i] - frame
+            segments.append(
+                {"chapter": chapter_index, "start_frame": frame, "frames": frames}
+            )
+            frame += frames
+    return segments
+
+
+def slice_subtitles(
+    subs: List[Dict[str, Any]],
+    start: float,
+    end: float,
+    bounds: Optional[tuple] = None,
+) -> List[Dict[str, Any]]:
+    """[start, end) 구간에 걸친 자막을 잘라 구간 시작 기준 시각으로 옮깁니다.
+
+    경계에 걸친 자막은 양쪽 세그먼트에 나뉘어 들어가므로 화면상으로는 끊김이 없습니다.
+    `bounds`(`subtitle_bounds(subs)`)가 주어지면 전체를 훑지 않고 bisect로 범위를 찾습니다.
+    """
+    lo, hi = subtitle_range(bounds, start, end) if bounds else (0, len(subs))
+    sliced = []
+    for sub in subs[lo:hi]:
+        if sub["end"] <= start or sub["start"] >= end:
+            continue
+        sliced.append(
+            {
+                "text": sub["text"],
+                "start": max(sub["start"], start) - start,
+                "end": min(sub["end"], end) - start,
+            }
+        )
+    return sliced
+
+
+def _encode_segment(
+    image_path: str,
+    ass_path: Optional[str],
+    frames: int,
+    segment_path: str,
+    width: int,
+    height: int,
+    encoder_args: List[str],
+    threads: int,
+    prescaled: bool = False,
+) -> str:
+    """정지 이미지 + 자막 조각으로 비디오 전용 세그먼트를 인코딩합니다.
+
+    `ass_path`가 None이면 자막 없이 인코딩합니다 (soft 자막 모드).
+    """
+    video_filter = still_image_filter(width, height, prescaled)
+    if ass_path is not None:
+        video_filter += f",subtitles={ass_path}"
+    cmd = [
+        FFMPEG, "-y", "-hide_banner", "-loglevel", "error",
+        "-loop", "1", "-framerate", str(INPUT_FPS), "-i", image_path,
+        "-vf", video_filter,
+        "-frames:v", str(frames),
+        "-an",
+        "-threads", str(threads),
+    ]
+    cmd += encoder_args
+    cmd.append(segment_path)
+    run_ffmpeg(cmd, "render_segment", inputs=[image_path], output=segment_path)
+    return segment_path
+
+
+def run_parallel_merge(
+    output_dir,
+    output_video,
+    subtitle_json_path,
+    final_audio_path,
+    generated_images_dir,
+    chapters_json_path,
+    width,
+    height,
+    bgm_path=None,
+    bgm_db=0.0,
+    video_encoder="auto",
+    max_workers: Optional[int] = None,
+    max_segment_seconds: float = DEFAULT_MAX_SEGMENT_SECONDS,
+    image_paths: Optional[List[str]] = None,
+    subtitle_mode: str = "burn",
+):
+    """세그먼트 병렬 렌더링을 수행합니다.
+
+    1. 챕터 경계(문장 인덱스로 찾은 실제 챕터 시작)와 최대 세그먼트 길이에서 타임라인을 나눕니다.
+    2. 세그먼트마다 자기 구간의 ASS 자막 조각으로 비디오만 인코딩합니다.
+       인코딩은 별도 ffmpeg 프로세스에서 동시에 실행됩니다.
+    3. concat demuxer로 비디오를 스트림 복사해 잇고,
+       오디오는 한 번에 인코딩해 붙이므로 세그먼트 경계에서 오디오가 끊기지 않습니다.
+
+    `image_paths`가 주어지면 렌더링 해상도로 전처리된 이미지로 보고 scale을 생략합니다.
+
+    `subtitle_mode`는 "burn"과 "soft"를 지원합니다. "soft"면 세그먼트에 자막을 그리지 않고
+    마지막 concat 단계에서 mov_text 트랙과 `subtitle.vtt` 사이드카를 추가합니다.
+    """
+    validate_subtitle_mode(subtitle_mode, supported=("burn", "soft"))
+    os.makedirs(output_dir, exist_ok=True)
+
+    with open(subtitle_json_path, "r", encoding="utf-8") as f:
+        subs = json.load(f)
+    with open(chapters_json_path, "r", encoding="utf-8") as f:
+        chapters = json.load(f)
+
+    total_duration = get_audio_duration(final_audio_path)
+    prescaled = image_paths is not None
+    if not prescaled:
+        image_paths = chapter_image_paths(generated_images_dir, chapters)
+    index = load_sentence_index(subtitle_json_path)
+    timeline = resolve_chapter_timeline(
+        subtitle_json_path, chapters, total_duration, index=index
+    )
+    segments = split_segments(
+        timeline, total_duration, INPUT_FPS, max_segment_seconds,
+        cut_points=index.starts if index is not None else None,
+    )
+    bounds = subtitle_bounds(subs)
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cpu_count, len(segments)))
+    threads = max(1, cpu_count // workers)
+
+    encoder = select_video_encoder(video_encoder)
+    encoder_args = video_encoder_args(encoder, INPUT_FPS)
+    print(f"🎞 병렬 렌더링: 세그먼트 {len(segments)}개, 동시 {workers}개, 인코더 {encoder}")
+
+    segment_dir = tempfile.mkdtemp(prefix="segments_", dir=output_dir)
+    try:
+        jobs = []
+        for seg_index, seg in enumerate(segments):
+            start = seg["start_frame"] / INPUT_FPS
+            end = (seg["start_frame"] + seg["frames"]) / INPUT_FPS
+            ass_path = None
+            if subtitle_mode == "burn":
+                ass_path = os.path.join(segment_dir, f"segment_{seg_index:04d}.ass")
+                subtitle_json_to_ass(slice_subtitles(subs, start, end, bounds), ass_path)
+            jobs.append(
+                (
+                    image_paths[seg["chapter"]],
+                    ass_path,
+                    seg["frames"],
+                    os.path.join(segment_dir, f"segment_{seg_index:04d}.mp4"),
+                )
+            )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    propagate(_encode_segment),
+                    image_path, ass_path, frames, segment_path,
+                    width, height, encoder_args, threads, prescaled,
+                )
+                for image_path, ass_path, frames, segment_path in jobs
+            ]
+            segment_paths = [future.result() for future in futures]
+
+        list_path = os.path.join(segment_dir, "segments.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for path in segment_paths:
+                escaped = path.replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        # 비디오 스트림 복사 + 오디오 단일 인코딩
+        cmd = [FFMPEG, "-y", "-f", "concat", "-safe", "0", "-i", list_path]
+        audio_inputs, audio_filter, audio_map = audio_mix_args(
+            1, final_audio_path, bgm_path, bgm_db
+        )
+        cmd += audio_inputs
+        subtitle_output_args = []
+        if subtitle_mode == "soft":
+            ass_path = os.path.join(output_dir, "subtitle.ass")
+            subtitle_json_to_ass(subs, ass_path)
+            subtitle_json_to_vtt(subs, os.path.join(output_dir, "subtitle.vtt"))
+            subtitle_inputs, subtitle_output_args = soft_subtitle_args(
+                ass_path, 3 if bgm_path else 2
+            )
+            cmd += subtitle_inputs
+        if audio_filter:
+            cmd += ["-filter_complex", audio_filter]
+        cmd += [
+            "-map", "0:v",
+            "-map", audio_map,
+        ]
+        cmd += subtitle_output_args
+        cmd += [
+            "-c:v", "copy",
+            "-c:a", "aac",
+            "-b:a", "192k",
+            "-shortest",
+            output_video,
+        ]
+        run_ffmpeg(
+            cmd,
+            "segment_concat",
+            inputs=segment_paths + [final_audio_path] + ([bgm_path] if bgm_path else []),
+            output=output_video,
+        )
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
@@ -0,0 +1,306 @@
+"""외부 API 레이트 리미터 - 공급자별 토큰 버킷, 재시도, 서킷 브레이커"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from utils.api_limits import api_slot
+from utils.cache_utils import get_cache_root
+from utils.retry_utils import call_with_retry, is_retryable_error
+from utils.tracing import span
+
+T = TypeVar("T")
+
+# 공급자별 기본 한도
+# - rpm: 분당 요청 수
+# - tpm: 분당 토큰 수 (OpenAI 응답: 추정 토큰, Google TTS: 문자 수), None이면 제한 없음
+DEFAULT_RATE_LIMITS: Dict[str, Dict[str, Optional[int]]] = {
+    "openai_images": {"rpm": 50, "tpm": None},
+    "openai_responses": {"rpm": 500, "tpm": 200_000},
+    "google_tts": {"rpm": 1000, "tpm": 500_000},
+}
+
+# 서킷 브레이커 기본값
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 60.0
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 호출을 즉시 거부한 경우 발생합니다."""
+
+
+class TokenBucket:
+    """프로세스 내 토큰 버킷 (스레드 안전).
+
+    Args:
+        capacity: 최대 토큰 수 (버스트 허용량).
+        per_minute: 분당 보충 토큰 수.
+    """
+
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self, amount: float) -> float:
+        """토큰을 가져오면 0, 부족하면 기다려야 할 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """토큰이 충분해질 때까지 기다린 뒤 가져옵니다. 총 대기 시간을 반환합니다."""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            wait = self._try_take(amount)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class SqliteTokenBucket(TokenBucket):
+    """SQLite 파일 기반 토큰 버킷 - 같은 파일을 쓰는 여러 프로세스가 한도를 공유합니다.
+
+    `BEGIN IMMEDIATE` 트랜잭션으로 읽기-수정-쓰기를 원자적으로 수행합니다.
+    """
+
+    def __init__(self, name: str, capacity: float, per_minute: float, db_path: str):
+        super().__init__(capacity, per_minute)
+        self.name = name
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _try_take(self, amount: float) -> float:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens = self.capacity if row is None else min(
+                self.capacity, row[0] + (now - row[1]) * self.rate
+            )
+            wait = 0.0
+            if tokens >= amount:
+                tokens -= amount
+            else:
+                wait = (amount - tokens) / self.rate
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+class CircuitBreaker:
+    """연속 실패가 임계값을 넘으면 일정 시간 호출을 차단하는 서킷 브레이커.
+
+    - closed: 정상 호출
+    - open: `reset_seconds` 동안 즉시 `CircuitOpenError`
+    - half-open: 차단 시간이 지나면 한 번 시도하여 성공 시 closed, 실패 시 다시 open
+      (시험 호출은 하나만 허용하고, 결과가 나올 때까지 다른 호출은 `CircuitOpenError`)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def before_call(self) -> None:
+        """호출 허용 여부를 확인합니다 (half-open이면 첫 호출만 시험 호출로 통과)."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                raise CircuitOpenError(f"{self.name} 서킷이 열려 있어 호출을 차단했습니다.")
+            if self._half_open_in_flight:
+                raise CircuitOpenError(f"{self.name} 서킷 시험 호출이 진행 중이라 호출을 차단했습니다.")
+            self._half_open_in_flight = True
+
+    def release_probe(self) -> None:
+        """성공/실패로 판정하지 않고 시험 호출 자리를 돌려놓습니다 (재시도 대상이 아닌 오류 등)."""
+        with self._lock:
+            self._half_open_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._half_open_in_flight = False
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class ProviderLimiter:
+    """공급자 하나의 RPM/TPM 버킷과 서킷 브레이커 묶음."""
+
+    def __init__(self, name: str, rpm: Optional[int], tpm: Optional[int], backend: str, db_path: str):
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self.buckets = []
+        for suffix, per_minute in (("rpm", rpm), ("tpm", tpm)):
+            if not per_minute:
+                continue
+            if backend == "sqlite":
+                bucket = SqliteTokenBucket(f"{name}:{suffix}", per_minute, per_minute, db_path)
+            else:
+                bucket = TokenBucket(per_minute, per_minute)
+            self.buckets.append((suffix, bucket))
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """모든 버킷에서 토큰을 가져오고, 레이트 리밋으로 기다린 총 시간을 반환합니다."""
+        return sum(
+            bucket.acquire(1.0 if suffix == "rpm" else tokens)
+            for suffix, bucket in self.buckets
+        )
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+_overrides: Dict[str, Dict[str, Optional[int]]] = {}
+
+
+def configure_rate_limits(**limits: Dict[str, Optional[int]]) -> None:
+    """공급자별 RPM/TPM 한도를 설정합니다.
+
+    Example:
+        configure_rate_limits(openai_images={"rpm": 20}, google_tts={"rpm": 300, "tpm": None})
+    """
+    with _limiters_lock:
+        for provider, values in limits.items():
+            merged = dict(DEFAULT_RATE_LIMITS.get(provider, {"rpm": None, "tpm": None}))
+            merged.update(_overrides.get(provider, {}))
+            merged.update(values)
+            _overrides[provider] = merged
+            _limiters.pop(provider, None)
+
+
+def get_provider_limiter(provider: str) -> ProviderLimiter:
+    """공급자 리미터를 반환합니다 (프로세스당 1개).
+
+    - `RATE_LIMIT_BACKEND`: "memory"(기본값) 또는 "sqlite"(프로세스 간 공유)
+    - `RATE_LIMIT_DB`: sqlite 파일 경로 (기본값: 캐시 루트/rate_limits.sqlite)
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            config = _overrides.get(provider) or DEFAULT_RATE_LIMITS.get(
+                provider, {"rpm": None, "tpm": None}
+            )
+            backend = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+            db_path = os.environ.get(
+                "RATE_LIMIT_DB", os.path.join(get_cache_root(), "rate_limits.sqlite")
+            )
+            limiter = ProviderLimiter(
+                provider, config.get("rpm"), config.get("tpm"), backend, db_path
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+
+def estimate_tokens(text: str) -> int:
+    """TPM 한도 계산용 대략적인 토큰 수 (한국어 기준 약 2자당 1토큰)."""
+    return max(1, len(text) // 2)
+
+
+def rate_limited_call(
+    provider: str,
+    func: Callable[[], T],
+    tokens: float = 1.0,
+    max_retries: int = 3,
+    label: Optional[str] = None,
+) -> T:
+    """레이트 리밋, 동시 요청 제한, 재시도, 서킷 브레이커를 적용해 외부 API를 호출합니다.
+
+    매 시도마다 서킷 상태 확인 → RPM/TPM 토큰 획득 → 동시 요청 슬롯 점유 → 호출 순서로
+    진행하며, 일시적 오류는 지터가 적용된 지수 백오프로 재시도합니다.
+    전체 호출은 `api.{provider}` 스팬으로 기록됩니다 (재시도 횟수, 레이트 리밋 대기 시간 포함).
+
+    Args:
+        provider: "openai_images", "openai_responses", "google_tts" 등
+        func: 인자 없이 호출할 API 함수.
+        tokens: TPM 버킷에서 차감할 양 (토큰 또는 문자 수).
+        max_retries: 최대 재시도 횟수.
+        label: 로그 출력용 호출 이름.
+
+    Raises:
+        CircuitOpenError: 서킷이 열려 있는 경우
+        마지막 시도에서 발생한 예외
+    """
+    limiter = get_provider_limiter(provider)
+
+    def attempt() -> T:
+        limiter.breaker.before_call()
+        try:
+            waited = limiter.acquire(tokens)
+            if waited:
+                sp.add("rate_limit_wait", waited)
+            with api_slot(provider):
+                result = func()
+        except BaseException as exc:
+            if isinstance(exc, Exception) and is_retryable_error(exc):
+                limiter.breaker.record_failure()
+            else:
+                limiter.breaker.release_probe()
+            raise
+        limiter.breaker.record_success()
+        return result
+
+    with span(
+        f"api.{provider}", kind="api", provider=provider, label=label, tokens=tokens
+    ) as sp:
+        return call_with_retry(
+            attempt,
+            max_retries=max_retries,
+            label=label or provider,
+        )
@@ -2,13 +2,153 @@
 
 import json
 import os
-import subprocess
-from moviepy.editor import AudioFileClip
+
+from utils.audio_utils import get_audio_duration
+from utils.encoder_utils import select_video_encoder, video_encoder_args
+from utils.img_gen_prompt import get_chapter_image_filename
+from utils.sentence_index import SentenceIndex, chapter_timeline_from_index, sentence_index_path
+from utils.subtitle_modes import (
+    build_sprite_track,
+    soft_subtitle_args,
+    subtitle_json_to_vtt,
+    validate_subtitle_mode,
+)
+from utils.tracing import run_ffmpeg
 
 FFMPEG = "ffmpeg"
 FPS = 8
 WIDTH = 960
 HEIGHT = 540
+# 이미지 입력 프레임레이트 (image2 demuxer 기본값과 동일)
+INPUT_FPS = 25
+
+
+def chapter_timeline(total_duration, chapter_count, fps=INPUT_FPS):
+    """전체 길이를 챕터 수로 균등 분할한 (start, end) 구간 리스트를 반환합니다.
+
+    구간 경계를 프레임 단위로 맞춰 두어, 세그먼트를 이어 붙여도
+    반올림 오차가 누적되지 않습니다.
+    """
+    boundaries = [
+        round(total_duration * i / chapter_count * fps) / fps
+        for i in range(chapter_count + 1)
+    ]
+    boundaries[-1] = total_duration
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def load_sentence_index(subtitle_json_path):
+    """자막 JSON 옆에 저장된 문장 인덱스를 읽습니다 (없으면 None)."""
+    return SentenceIndex.load(sentence_index_path(subtitle_json_path))
+
+
+def resolve_chapter_timeline(
+    subtitle_json_path, chapters, total_duration, fps=INPUT_FPS, index=None
+):
+    """챕터별 (start, end) 구간을 실제 챕터 첫 문장의 TTS 시각으로 결정합니다.
+
+    문장 인덱스가 있으면 `chapter_start_sentence`를 찾아 경계를 정하고
+    (찾지 못한 챕터는 앞뒤 경계 사이를 균등 분할),
+    인덱스가 없으면 전체 길이를 균등 분할합니다.
+    """
+    if index is None:
+        index = load_sentence_index(subtitle_json_path)
+    if index is None or not len(index):
+        return chapter_timeline(total_duration, len(chapters), fps)
+
+    timeline, matched = chapter_timeline_from_index(index, chapters, total_duration, fps)
+    print(f"📍 챕터 경계: 문장 인덱스로 {matched}/{len(chapters)}개 확정")
+    return timeline
+
+
+def chapter_image_paths(generated_images_dir, chapters):
+    """챕터 순서대로 원본 이미지 경로 리스트를 반환합니다 (T2I 저장 이름과 동일)."""
+    return [
+        os.path.join(generated_images_dir, get_chapter_image_filename(ch))
+        for ch in chapters
+    ]
+
+
+def still_image_filter(width, height, prescaled=False):
+    """정지 이미지 입력을 출력 프레임 형식으로 맞추는 필터 체인.
+
+    `prescaled`면 이미지가 이미 목표 해상도로 전처리되어 있으므로 scale을 생략합니다.
+    """
+    if prescaled:
+        return "setsar=1,format=yuv420p"
+    return f"scale={width}:{height},setsar=1,format=yuv420p"
+
+
+def audio_mix_args(audio_index, final_audio_path, bgm_path=None, bgm_db=0.0):
+    """오디오 입력 인자와 (fused 모드일 때) BGM 믹싱 필터를 구성합니다.
+
+    Args:
+        audio_index: 오디오 입력의 ffmpeg 입력 인덱스.
+        final_audio_path: 최종 오디오 (또는 fused 모드의 TTS 원본) 경로.
+        bgm_path: BGM 파일 경로 (None이면 믹싱 없음).
+        bgm_db: BGM 볼륨 (dB).
+
+    Returns:
+        (input_args, filter, map) 튜플. 믹싱이 없으면 filter는 빈 문자열.
+    """
+    input_args = ["-i", final_audio_path]
+    if not bgm_path:
+        return input_args, "", f"{audio_index}:a"
+
+    # BGM 무한루프, duration=first → TTS 길이에 맞춰 자동 컷
+    input_args += ["-stream_loop", "-1", "-i", bgm_path]
+    audio_filter = (
+        f"[{audio_index + 1}:a]volume={bgm_db}dB[bgm]"
+        f";[{audio_index}:a][bgm]amix=inputs=2:duration=first:dropout_transition=2[a]"
+    )
+    return input_args, audio_filter, "[a]"
+
+
+def _overlay_slideshow(image_paths, timeline, width, height, prescaled=False):
+    """전체 길이 루프 이미지 + 시간 조건 overlay 체인 (기존 방식)."""
+    input_args = []
+    for img_path in image_paths:
+        input_args += ["-loop", "1", "-i", img_path]
+
+    filters = []
+
+    # 1️⃣ 첫 이미지: 베이스
+    filters.append(
+        f"[0:v]{still_image_filter(width, height, prescaled)}[base]"
+    )
+
+    # 2️⃣ 나머지 이미지: 시간 조건 overlay
+    for i in range(1, len(image_paths)):
+        start, end = timeline[i]
+        filters.append(
+            f"[base][{i}:v]overlay="
+            f"enable='between(t,{start},{end})'[base]"
+        )
+
+    return input_args, filters
+
+
+def _concat_slideshow(image_paths, timeline, width, height, prescaled=False):
+    """챕터별 정확한 길이의 세그먼트를 concat 필터로 잇는 선형 그래프."""
+    input_args = []
+    filters = []
+    labels = []
+    for i, (img_path, (start, end)) in enumerate(zip(image_paths, timeline)):
+        duration = max(end - start, 1.0 / INPUT_FPS)
+        # 마지막 구간은 오디오보다 짧아지지 않도록 여유를 둠 (-shortest로 컷)
+        if i == len(image_paths) - 1:
+            duration += 1.0
+        input_args += [
+            "-loop", "1", "-framerate", str(INPUT_FPS),
+            "-t", f"{duration:.6f}", "-i", img_path,
+        ]
+        filters.append(
+            f"[{i}:v]{still_image_filter(width, height, prescaled)}[s{i}]"
+        )
+        labels.append(f"[s{i}]")
+
+    filters.append(f"{''.join(labels)}concat=n={len(labels)}:v=1:a=0[base]")
+    return input_args, filters
 
 
 def subtitle_json_to_ass(subs, ass_path):
@@ -46,8 +186,37 @@ def run_final_merge(
     font_path,
     width,
     height,
+    bgm_path=None,            # 지정 시 렌더링 중 BGM 믹싱 (fused 모드)
+    bgm_db=0.0,
+    slideshow_mode="concat",  # "concat" | "overlay"
+    video_encoder="auto",     # "auto" | "h264_nvenc" | "libx264" | "libx265"
+    image_paths=None,         # 전처리된 챕터 이미지 (목표 해상도, 지정 시 scale 생략)
+    subtitle_mode="burn",     # "burn" | "soft" | "sprite"
 ):
-    """최종 비디오 렌더링을 수행합니다."""
+    """최종 비디오 렌더링을 수행합니다.
+
+    `slideshow_mode`
+    - "concat": 챕터마다 정확한 길이의 세그먼트를 만들어 concat 필터로 잇습니다.
+      각 프레임은 한 번의 scale만 거치고, 이미지 디코더는 자기 구간에서만 동작하므로
+      챕터 수가 늘어도 프레임당 비용이 일정합니다.
+    - "overlay": 기존 방식. 모든 이미지를 전체 길이로 루프하고 overlay를 N번 체인합니다.
+
+    `video_encoder`가 "auto"면 NVENC를 쓸 수 있을 때만 사용하고,
+    없으면 정지 이미지용으로 튜닝된 libx264로 인코딩합니다.
+
+    `bgm_path`가 주어지면 `final_audio_path`를 원본 TTS 트랙으로 보고,
+    BGM 루프 입력과 함께 같은 filter_complex 안에서 volume + amix 로 믹싱합니다.
+    이렇게 하면 별도의 믹싱 프로세스와 중간 파일 없이 오디오를 한 번만 인코딩합니다.
+
+    `image_paths`가 주어지면 이미 렌더링 해상도로 전처리된 이미지로 보고,
+    프레임마다 반복되던 scale 없이 픽셀 형식만 맞춥니다.
+
+    `subtitle_mode`
+    - "burn": libass `subtitles` 필터로 자막을 영상에 입힙니다 (기본값).
+    - "soft": 자막을 그리지 않고 mov_text 트랙으로 mux하며 `subtitle.vtt` 사이드카를 씁니다.
+    - "sprite": 자막 줄마다 한 번 그린 투명 PNG 스프라이트를 VFR 스트림으로 overlay합니다.
+    """
+    validate_subtitle_mode(subtitle_mode)
     os.makedirs(output_dir, exist_ok=True)
 
     # ---------- 자막 ----------
@@ -56,62 +225,85 @@ def run_final_merge(
 
     ass_path = os.path.join(output_dir, "subtitle.ass")
     subtitle_json_to_ass(subs, ass_path)
+    if subtitle_mode == "soft":
+        subtitle_json_to_vtt(subs, os.path.join(output_dir, "subtitle.vtt"))
 
     # ---------- 오디오 길이 (최종 오디오 기준) ----------
-    audio = AudioFileClip(final_audio_path)
-    total_duration = audio.duration
-    audio.close()
+    total_duration = get_audio_duration(final_audio_path)
 
     # ---------- 챕터 ----------
     with open(chapters_json_path, "r", encoding="utf-8") as f:
         chapters = json.load(f)
 
     chapter_count = len(chapters)
-    chapter_duration = total_duration / chapter_count
+    prescaled = image_paths is not None
+    if not prescaled:
+        image_paths = chapter_image_paths(generated_images_dir, chapters)
+    timeline = resolve_chapter_timeline(subtitle_json_path, chapters, total_duration)
 
-    # ---------- ffmpeg 입력 ----------
+    # ---------- ffmpeg 입력 + 슬라이드쇼 filter ----------
     cmd = [FFMPEG, "-y"]
+    if slideshow_mode == "overlay":
+        input_args, filters = _overlay_slideshow(
+            image_paths, timeline, width, height, prescaled
+        )
+    elif slideshow_mode == "concat":
+        input_args, filters = _concat_slideshow(
+            image_paths, timeline, width, height, prescaled
+        )
+    else:
+        raise ValueError(f"지원하지 않는 slideshow_mode 입니다: {slideshow_mode}")
+    cmd += input_args
 
-    # 챕터별 이미지
-    for i, ch in enumerate(chapters):
-        img = f"{i+1}_{ch['chapter_title']}.png"
-        img_path = os.path.join(generated_images_dir, img)
-        cmd += ["-loop", "1", "-i", img_path]
-
-    # 최종 오디오 (TTS-only or TTS+BGM)
-    cmd += ["-i", final_audio_path]
-
-    # ---------- filter_complex ----------
-    filters = []
-
-    # 1️⃣ 첫 이미지: 베이스
-    filters.append(
-        f"[0:v]scale={width}:{height},format=yuv420p[base]"
+    # 최종 오디오 (TTS-only or TTS+BGM) + fused 모드 BGM
+    audio_inputs, audio_filter, audio_map = audio_mix_args(
+        chapter_count, final_audio_path, bgm_path, bgm_db
     )
+    cmd += audio_inputs
+    next_index = chapter_count + (2 if bgm_path else 1)
 
-    # 2️⃣ 나머지 이미지: 시간 조건 overlay
-    for i in range(1, chapter_count):
-        start = i * chapter_duration
-        end = (i + 1) * chapter_duration
-        filters.append(
-            f"[base][{i}:v]overlay="
-            f"enable='between(t,{start},{end})'[base]"
+    # 3️⃣ 자막
+    subtitle_output_args = []
+    if subtitle_mode == "burn":
+        subtitle_filter = f"[base]subtitles={ass_path}[v]"
+    elif subtitle_mode == "soft":
+        subtitle_filter = "[base]null[v]"
+        subtitle_inputs, subtitle_output_args = soft_subtitle_args(ass_path, next_index)
+        cmd += subtitle_inputs
+    else:
+        list_path, sprite_y = build_sprite_track(
+            subs, total_duration, width, height, output_dir, font_path=font_path
+        )
+        cmd += ["-f", "concat", "-safe", "0", "-i", list_path]
+        subtitle_filter = (
+            f"[base][{next_index}:v]overlay=0:{sprite_y}:eof_action=pass,format=yuv420p[v]"
         )
+    filter_complex = ";".join(filters) + ";" + subtitle_filter
 
-    # 3️⃣ 자막
-    filter_complex = ";".join(filters) + f";[base]subtitles={ass_path}[v]"
+    # 4️⃣ fused 모드: TTS + BGM 믹싱
+    if audio_filter:
+        filter_complex += ";" + audio_filter
 
     cmd += [
         "-filter_complex", filter_complex,
         "-map", "[v]",
-        "-map", f"{chapter_count}:a",
-        "-c:v", "h264_nvenc",
-        "-preset", "p4",
-        "-cq", "18",
+        "-map", audio_map,
+    ]
+    cmd += subtitle_output_args
+    encoder = select_video_encoder(video_encoder)
+    print(f"🎞 비디오 인코더: {encoder}")
+    cmd += video_encoder_args(encoder, INPUT_FPS)
+    cmd += [
         "-c:a", "aac",
+        "-b:a", "192k",
         "-shortest",
         output_video,
     ]
 
-    subprocess.run(cmd, check=True)
+    run_ffmpeg(
+        cmd,
+        "render",
+        inputs=image_paths + [final_audio_path] + ([bgm_path] if bgm_path else []),
+        output=output_video,
+    )
 
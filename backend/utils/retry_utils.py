@@ -0,0 +1,102 @@
+"""외부 API 호출 재시도 유틸리티"""
+
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+from utils.tracing import current_span
+
+T = TypeVar("T")
+
+# 재시도 대상 HTTP 상태 코드 (408: 요청 시간 초과, 429: Rate limit, 일시적 5xx)
+# 501/505 등 다시 보내도 실패할 5xx와 409(Conflict)는 제외
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """예외가 재시도할 만한 일시적 오류인지 판단합니다.
+
+    OpenAI SDK의 `APIStatusError`(status_code 속성)와
+    Google API의 `GoogleAPICallError`(code 속성)를 모두 처리하며,
+    연결/타임아웃 오류도 재시도 대상으로 봅니다.
+
+    Args:
+        exc: 발생한 예외.
+
+    Returns:
+        재시도해야 하면 True.
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        code = getattr(exc, "code", None)
+        status = code if isinstance(code, int) else getattr(code, "value", None)
+        if isinstance(status, tuple):
+            # grpc.StatusCode 값은 (int, str) 튜플
+            status = None
+
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+
+    name = type(exc).__name__
+    return any(
+        keyword in name
+        for keyword in ("Timeout", "Connection", "RateLimit", "ServiceUnavailable", "TooManyRequests")
+    )
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 30.0) -> float:
+    """지수 백오프 + 지터(jitter) 대기 시간을 계산합니다.
+
+    Args:
+        attempt: 0부터 시작하는 재시도 횟수.
+        base_delay: 첫 재시도 대기 시간(초).
+        max_delay: 최대 대기 시간(초).
+
+    Returns:
+        대기 시간(초).
+    """
+    delay = min(max_delay, base_delay * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    is_retryable: Callable[[BaseException], bool] = is_retryable_error,
+    label: Optional[str] = None,
+) -> T:
+    """일시적 오류 발생 시 지수 백오프로 재시도하며 함수를 호출합니다.
+
+    Args:
+        func: 인자 없이 호출할 함수.
+        max_retries: 최대 재시도 횟수 (첫 시도 제외).
+        base_delay: 첫 재시도 대기 시간(초).
+        max_delay: 최대 대기 시간(초).
+        is_retryable: 예외의 재시도 여부 판단 함수.
+        label: 로그 출력용 호출 이름.
+
+    재시도 횟수는 현재 트레이스 스팬의 `retries` 속성에 누적됩니다.
+
+    Returns:
+        func의 반환값.
+
+    Raises:
+        마지막 시도에서 발생한 예외 또는 재시도 불가능한 예외.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as exc:
+            if attempt >= max_retries or not is_retryable(exc):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            print(
+                f"🔁 재시도 {attempt + 1}/{max_retries}"
+                f"{f' ({label})' if label else ''}: {exc} → {delay:.1f}초 후"
+            )
+            current_span().add("retries")
+            time.sleep(delay)
+            attempt += 1
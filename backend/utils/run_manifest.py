@@ -0,0 +1,146 @@
+"""실행 매니페스트 - 스테이지/항목 단위 체크포인트를 출력 디렉터리에 기록합니다."""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# 출력 디렉터리 안의 매니페스트 파일 이름
+MANIFEST_FILENAME = "run_manifest.json"
+# 항목 체크포인트는 한 줄씩 덧붙이는 JSON Lines 로그에 따로 기록
+ITEM_LOG_FILENAME = "run_manifest.items.jsonl"
+MANIFEST_VERSION = 2
+
+
+class RunManifest:
+    """`output_dir/run_manifest.json`에 스테이지별 입력 해시, 출력, 상태를 기록합니다.
+
+    - 스테이지: {"status", "inputs_hash", "outputs", "files", "error", "updated_at"}
+    - 항목(챕터 이미지, TTS 청크 등): 스테이지 안의 세부 작업 단위 체크포인트
+
+    완료된 스테이지/항목은 입력 해시가 같고 기록된 파일이 모두 남아 있을 때만
+    재사용되므로, 입력이 바뀌었거나 파일이 지워진 경우에는 다시 실행됩니다.
+    T2I와 TTS 스테이지가 동시에 기록하므로 모든 갱신은 잠금 안에서 이루어집니다.
+    스테이지 상태는 매니페스트 전체를 원자적으로 다시 쓰고, 자주 생기는 항목 완료는
+    `run_manifest.items.jsonl`에 한 줄씩 덧붙이기만 합니다 (불러올 때 순서대로 재생).
+
+    Args:
+        output_dir: 파이프라인 출력 디렉터리.
+        resume: False이면 기존 매니페스트를 버리고 새로 시작합니다.
+    """
+
+    def __init__(self, output_dir: str, resume: bool = False):
+        self.output_dir = os.path.abspath(output_dir)
+        self.path = os.path.join(self.output_dir, MANIFEST_FILENAME)
+        self.item_log_path = os.path.join(self.output_dir, ITEM_LOG_FILENAME)
+        self.resume = resume
+        self._lock = threading.Lock()
+        self._data = self._load() if resume else None
+        if self._data is None:
+            self._data = {"version": MANIFEST_VERSION, "stages": {}}
+            if os.path.exists(self.item_log_path):
+                os.remove(self.item_log_path)
+        self._data["items"] = self._load_items()
+        self._save()
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return data
+
+    def _load_items(self) -> Dict[str, Dict[str, Any]]:
+        """항목 로그를 재생해 스테이지별 최신 항목 기록을 만듭니다.
+
+        기록 도중 중단되어 잘린 마지막 줄은 건너뛰고, 다음 기록이 새 줄에서 시작하도록 줄을 끝맺습니다.
+        """
+        items: Dict[str, Dict[str, Any]] = {}
+        if not self.resume or not os.path.exists(self.item_log_path):
+            return items
+        line = "\n"
+        with open(self.item_log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                stage, item = entry.pop("stage"), entry.pop("item")
+                items.setdefault(stage, {})[item] = entry
+        if not line.endswith("\n"):
+            with open(self.item_log_path, "a", encoding="utf-8") as f:
+                f.write("\n")
+        return items
+
+    def _save(self) -> None:
+        """스테이지 상태를 원자적으로 저장합니다 (항목은 로그에 있으므로 제외)."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        data = {key: value for key, value in self._data.items() if key != "items"}
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    # --------------------------------------------------------------------------
+    # 스테이지
+    # --------------------------------------------------------------------------
+
+    def completed_outputs(self, stage: str, inputs_hash: str) -> Optional[Any]:
+        """재사용 가능한 완료 스테이지의 출력을 반환합니다 (없으면 None)."""
+        with self._lock:
+            record = self._data["stages"].get(stage)
+        if not record or record.get("status") != "completed":
+            return None
+        if record.get("inputs_hash") != inputs_hash:
+            return None
+        if not all(os.path.exists(path) for path in record.get("files", [])):
+            return None
+        return record.get("outputs")
+
+    def _set_stage(self, stage: str, **fields: Any) -> None:
+        with self._lock:
+            record = self._data["stages"].setdefault(stage, {})
+            record.update(fields)
+            record["updated_at"] = time.time()
+            self._save()
+
+    def start_stage(self, stage: str, inputs_hash: str) -> None:
+        self._set_stage(stage, status="running", inputs_hash=inputs_hash, error=None)
+
+    def complete_stage(self, stage: str, outputs: Any, files: List[str]) -> None:
+        self._set_stage(stage, status="completed", outputs=outputs, files=list(files))
+
+    def fail_stage(self, stage: str, error: BaseException) -> None:
+        self._set_stage(stage, status="failed", error=f"{type(error).__name__}: {error}")
+
+    # --------------------------------------------------------------------------
+    # 스테이지 내부 항목
+    # --------------------------------------------------------------------------
+
+    def get_item(self, stage: str, item: str, key: str, path: str) -> Optional[Dict[str, Any]]:
+        """완료된 항목 기록을 반환합니다.
+
+        resume 모드가 아니거나, 키가 다르거나, 결과 파일이 없으면 None입니다.
+        """
+        if not self.resume:
+            return None
+        with self._lock:
+            record = self._data["items"].get(stage, {}).get(item)
+        if not record or record.get("key") != key:
+            return None
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        return record
+
+    def mark_item(self, stage: str, item: str, key: str, **data: Any) -> None:
+        """항목 완료를 기록합니다 (`data`는 재사용 시 함께 복원할 값)."""
+        record = {"key": key, **data}
+        line = json.dumps({"stage": stage, "item": item, **record}, ensure_ascii=False)
+        with self._lock:
+            self._data["items"].setdefault(stage, {})[item] = record
+            with open(self.item_log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
@@ -0,0 +1,219 @@
+"""문장 → 시각 인덱스 - TTS SSML mark 시각으로 챕터 경계를 정확히 찾습니다.
+
+TTS 단계에서 문장마다 전체 오디오 기준 시작 시각을 기록해
+`stt_subtitle_data.json` 옆에 `sentence_index.json`으로 저장합니다.
+렌더링 단계는 이 인덱스에서 LLM이 돌려준 `chapter_start_sentence`의 시각을 찾아
+챕터 구간을 만들고, 인덱스가 없으면 기존 균등 분할로 대체합니다.
+"""
+
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SENTENCE_INDEX_FILENAME = "sentence_index.json"
+SENTENCE_INDEX_VERSION = 1
+
+# 정확히 일치하는 문장이 없을 때 앞부분 비교에 쓰는 글자 수
+PREFIX_MATCH_CHARS = 12
+
+_IGNORED_CHARS = re.compile(r"[\s\"'“”‘’.,!?…·~\-]+")
+
+
+def normalize_sentence(text: str) -> str:
+    """비교용 문장 키 (공백, 따옴표, 문장부호 제거)."""
+    return _IGNORED_CHARS.sub("", text or "")
+
+
+def sentence_index_path(subtitle_json_path: str) -> str:
+    """자막 JSON과 같은 디렉터리의 문장 인덱스 경로."""
+    return os.path.join(
+        os.path.dirname(os.path.abspath(subtitle_json_path)), SENTENCE_INDEX_FILENAME
+    )
+
+
+class SentenceIndex:
+    """TTS 문장 순서대로 정렬된 (문장, 시작 시각) 인덱스.
+
+    - 같은 문장이 여러 번 나와도 위치 리스트를 bisect로 찾아
+      "앞 챕터 이후 첫 번째 등장"을 O(log n)에 구합니다.
+    - 앞부분 일치 대체 경로도 정렬된 키 리스트를 bisect로 찾으므로
+      문장 수에 선형으로 스캔하지 않습니다 (O(log n + 일치 후보 수)).
+    - `starts`는 정렬되어 있으므로 세그먼트 분할 지점(문장 시작) 조회에도 bisect를 씁니다.
+    """
+
+    def __init__(self, sentences: Sequence[Tuple[str, float]]):
+        self.texts = [text for text, _ in sentences]
+        self.starts = [float(start) for _, start in sentences]
+        self._keys = [normalize_sentence(text) for text in self.texts]
+        self._positions: Dict[str, List[int]] = {}
+        for position, key in enumerate(self._keys):
+            if key:
+                self._positions.setdefault(key, []).append(position)
+        # 앞부분 일치 조회용: 정렬된 고유 키 (같은 접두어를 가진 키는 연속 구간)
+        self._sorted_keys = sorted(self._positions)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def from_chunks(
+        cls, chunk_results: Sequence[Tuple[float, Sequence[Tuple[str, float]]]]
+    ) -> "SentenceIndex":
+        """청크별 (길이, [(문장, 청크 기준 시각)]) 결과를 전체 오디오 기준으로 합칩니다."""
+        sentences: List[Tuple[str, float]] = []
+        offset = 0.0
+        for duration, sentence_times in chunk_results:
+            for text, start in sorted(sentence_times, key=lambda item: item[1]):
+                sentences.append((text.strip(), round(offset + start, 3)))
+            offset += duration
+        return cls(sentences)
+
+    def write(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        payload = {
+            "version": SENTENCE_INDEX_VERSION,
+            "sentences": [
+                {"text": text, "start": start}
+                for text, start in zip(self.texts, self.starts)
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SentenceIndex"]:
+        """저장된 인덱스를 읽습니다 (없거나 버전이 다르면 None)."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != SENTENCE_INDEX_VERSION:
+            return None
+        return cls([(item["text"], item["start"]) for item in payload["sentences"]])
+
+    def find(self, sentence: str, after: int = 0) -> Optional[int]:
+        """`after` 위치 이후에서 문장이 처음 나오는 위치를 찾습니다.
+
+        정규화한 문장이 정확히 일치하는 위치를 먼저 찾고,
+        없으면 앞부분(`PREFIX_MATCH_CHARS`자)이 같거나 챕터 문장의 앞부분인 문장을 찾습니다.
+        LLM이 챕터 첫 문장을 약간 바꿔 적거나 TTS 문장 분리와 경계가 다를 때를 위한 대체 경로입니다.
+        """
+        key = normalize_sentence(sentence)
+        if not key:
+            return None
+
+        found = self._first_after(key, after)
+        if found is not None:
+            return found
+
+        # 앞부분이 같은 문장: 정렬된 키에서 접두어 구간을 bisect로 찾음
+        prefix = key[:PREFIX_MATCH_CHARS]
+        candidates = []
+        lo = bisect_left(self._sorted_keys, prefix)
+        for candidate in self._sorted_keys[lo:]:
+            if not candidate.startswith(prefix):
+                break
+            candidates.append(self._first_after(candidate, after))
+        # 챕터 문장의 앞부분인 문장 (TTS가 문장을 더 짧게 나눈 경우)
+        for length in range(PREFIX_MATCH_CHARS, len(key)):
+            candidates.append(self._first_after(key[:length], after))
+
+        matches = [position for position in candidates if position is not None]
+        return min(matches) if matches else None
+
+    def _first_after(self, key: str, after: int) -> Optional[int]:
+        """정규화된 키가 `after` 위치 이후 처음 나오는 위치 (없으면 None)."""
+        positions = self._positions.get(key)
+        if not positions:
+            return None
+        i = bisect_left(positions, after)
+        return positions[i] if i < len(positions) else None
+
+    def chapter_starts(self, chapters: Sequence[Dict[str, Any]]) -> List[Optional[float]]:
+        """챕터별 시작 시각 (찾지 못한 챕터는 None).
+
+        챕터는 원문 순서이므로 앞 챕터 위치 이후에서만 찾습니다.
+        첫 챕터는 항상 0초에서 시작합니다.
+        """
+        starts: List[Optional[float]] = []
+        after = 0
+        for index, chapter in enumerate(chapters):
+            if index == 0:
+                starts.append(0.0)
+                continue
+            position = self.find(chapter.get("chapter_start_sentence", ""), after + 1)
+            if position is None:
+                starts.append(None)
+                continue
+            starts.append(self.starts[position])
+            after = position
+        return starts
+
+
+def _fill_missing(starts: List[Optional[float]], total_duration: float) -> List[float]:
+    """찾지 못한 챕터 시작 시각을 앞뒤로 찾은 시각 사이에서 균등하게 채웁니다."""
+    filled = list(starts)
+    index = 0
+    while index < len(filled):
+        if filled[index] is not None:
+            index += 1
+            continue
+        gap_end = index
+        while gap_end < len(filled) and filled[gap_end] is None:
+            gap_end += 1
+        left = filled[index - 1]
+        right = filled[gap_end] if gap_end < len(filled) else total_duration
+        steps = gap_end - index + 1
+        for k in range(index, gap_end):
+            filled[k] = left + (right - left) * (k - index + 1) / steps
+        index = gap_end
+    return filled
+
+
+def chapter_timeline_from_index(
+    index: SentenceIndex,
+    chapters: Sequence[Dict[str, Any]],
+    total_duration: float,
+    fps: int,
+) -> Tuple[List[Tuple[float, float]], int]:
+    """문장 인덱스로 챕터별 (start, end) 구간을 만듭니다.
+
+    경계는 `render.chapter_timeline`과 같이 프레임 단위로 맞추고,
+    모든 챕터가 최소 한 프레임 이상이 되도록 단조 증가시킵니다.
+
+    Returns:
+        (timeline, matched) 튜플. matched는 문장으로 시작 시각을 찾은 챕터 수 (첫 챕터 포함)
+    """
+    raw_starts = index.chapter_starts(chapters)
+    matched = sum(1 for start in raw_starts if start is not None)
+    starts = _fill_missing(raw_starts, total_duration)
+
+    frame = 1.0 / fps
+    boundaries: List[float] = []
+    for start in starts:
+        start = round(start * fps) / fps
+        if boundaries:
+            start = max(start, boundaries[-1] + frame)
+        boundaries.append(start)
+    boundaries.append(total_duration)
+    boundaries = [min(boundary, total_duration) for boundary in boundaries]
+    return list(zip(boundaries[:-1], boundaries[1:])), matched
+
+
+def subtitle_bounds(subs: Sequence[Dict[str, Any]]) -> Tuple[List[float], List[float]]:
+    """자막 시작/끝 시각 리스트 (`slice_subtitles`의 bisect 조회용).
+
+    자막은 시간 순으로 정렬되어 있고 서로 겹치지 않으므로 끝 시각도 정렬되어 있습니다.
+    """
+    return [sub["start"] for sub in subs], [sub["end"] for sub in subs]
+
+
+def subtitle_range(
+    bounds: Tuple[List[float], List[float]], start: float, end: float
+) -> Tuple[int, int]:
+    """[start, end) 구간에 걸친 자막의 인덱스 범위 [lo, hi)를 O(log n)에 구합니다."""
+    starts, ends = bounds
+    return bisect_right(ends, start), bisect_left(starts, end)
@@ -0,0 +1,179 @@
+"""파이프라인 스테이지 스케줄러 - 의존성 그래프에 따라 스테이지를 병렬 실행합니다."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.time_utils import format_hms
+from utils.tracing import propagate, span
+
+# 스테이지 정의: {이름: (함수, 의존 스테이지 목록)}
+# 함수는 지금까지 완료된 스테이지 결과 딕셔너리를 인자로 받습니다.
+StageFunc = Callable[[Dict[str, Any]], Any]
+StageGraph = Dict[str, Tuple[StageFunc, Sequence[str]]]
+# 스테이지 이벤트 콜백: (스테이지 이름, "started" | "completed" | "failed")
+StageEventCallback = Callable[[str, str], None]
+
+
+def _validate_graph(stages: StageGraph) -> None:
+    """존재하지 않는 의존성이나 순환 의존성이 있으면 예외를 발생시킵니다."""
+    for name, (_, deps) in stages.items():
+        for dep in deps:
+            if dep not in stages:
+                raise ValueError(f"스테이지 '{name}'의 의존성 '{dep}'이(가) 정의되지 않았습니다.")
+
+    visiting, visited = set(), set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"스테이지 의존성에 순환이 있습니다: {name}")
+        visiting.add(name)
+        for dep in stages[name][1]:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in stages:
+        visit(name)
+
+
+def critical_path(
+    stages: StageGraph,
+    timings: Dict[str, Dict[str, float]],
+) -> List[str]:
+    """가장 늦게 끝난 스테이지에서 거꾸로 따라가며 크리티컬 패스를 구합니다.
+
+    각 스테이지에서 가장 늦게 끝난 의존 스테이지를 선택하므로,
+    전체 소요 시간을 결정한 스테이지들의 체인이 반환됩니다.
+    """
+    if not timings:
+        return []
+
+    current = max(timings, key=lambda name: timings[name]["end"])
+    path = [current]
+    while True:
+        deps = [dep for dep in stages[current][1] if dep in timings]
+        if not deps:
+            break
+        current = max(deps, key=lambda name: timings[name]["end"])
+        path.append(current)
+
+    path.reverse()
+    return path
+
+
+def run_stage_graph(
+    stages: StageGraph,
+    max_workers: Optional[int] = None,
+    on_event: Optional[StageEventCallback] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+    """의존성 그래프에 따라 스테이지를 실행합니다.
+
+    의존 스테이지가 모두 끝난 스테이지는 즉시 스레드 풀에 제출되므로,
+    서로 독립적인 스테이지는 동시에 실행됩니다.
+    하나의 스테이지라도 실패하면 아직 시작하지 않은 스테이지는 실행하지 않고,
+    실행 중인 스테이지가 끝나기를 기다린 뒤 첫 번째 예외를 다시 발생시킵니다.
+
+    Args:
+        stages: {스테이지 이름: (함수, 의존 스테이지 이름 목록)}
+        max_workers: 동시에 실행할 최대 스테이지 수 (None이면 스테이지 수)
+        on_event: 스테이지 시작/완료/실패 시 호출되는 콜백 (진행 상황 보고용)
+
+    Returns:
+        (results, timings) 튜플
+        - results: 스테이지 이름 → 반환값
+        - timings: 스테이지 이름 → {"start", "end", "elapsed"} (그래프 시작 기준 초)
+    """
+    _validate_graph(stages)
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+    pending = dict(stages)
+    running = {}
+    graph_start = time.perf_counter()
+
+    def notify(name: str, event: str) -> None:
+        if on_event is None:
+            return
+        try:
+            on_event(name, event)
+        except Exception as exc:
+            # 진행 상황 보고 실패가 파이프라인을 멈추지 않도록 함
+            print(f"⚠️ 스테이지 이벤트 콜백 실패 ({name}, {event}): {exc}")
+
+    def execute(name: str, func: StageFunc, inputs: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        notify(name, "started")
+        try:
+            with span(f"stage.{name}", kind="stage", stage=name):
+                result = func(inputs)
+        except BaseException:
+            notify(name, "failed")
+            raise
+        else:
+            notify(name, "completed")
+            return result
+        finally:
+            end = time.perf_counter()
+            timings[name] = {
+                "start": start - graph_start,
+                "end": end - graph_start,
+                "elapsed": end - start,
+            }
+
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(stages), 1)) as executor:
+        while pending or running:
+            if error is None:
+                ready = [
+                    name
+                    for name, (_, deps) in pending.items()
+                    if all(dep in results for dep in deps)
+                ]
+                for name in ready:
+                    func, _ = pending.pop(name)
+                    future = executor.submit(propagate(execute), name, func, dict(results))
+                    running[future] = name
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except BaseException as exc:
+                    if error is None:
+                        error = exc
+
+    if error is not None:
+        raise error
+
+    return results, timings
+
+
+def print_stage_report(
+    stages: StageGraph,
+    timings: Dict[str, Dict[str, float]],
+    labels: Optional[Dict[str, str]] = None,
+) -> None:
+    """스테이지별 소요 시간과 크리티컬 패스를 출력합니다."""
+    labels = labels or {}
+    path = critical_path(stages, timings)
+
+    for name in stages:
+        if name not in timings:
+            continue
+        t = timings[name]
+        marker = "★" if name in path else " "
+        print(
+            f"{marker} {labels.get(name, name)}: {format_hms(t['elapsed'])} "
+            f"({t['start']:.1f}s → {t['end']:.1f}s)"
+        )
+
+    if path:
+        path_label = " → ".join(labels.get(name, name) for name in path)
+        print(f"🧭 크리티컬 패스: {path_label}")
@@ -0,0 +1,308 @@
+"""자막 출력 방식 - 번인(burn) 외에 소프트 자막 트랙과 사전 래스터화 스프라이트를 지원합니다.
+
+- "burn": libass(`subtitles` 필터)가 매 프레임 자막을 그려 영상에 입힙니다 (기존 방식).
+- "soft": 영상에는 그리지 않고 mov_text 자막 트랙으로 mux하며 WebVTT 사이드카를 함께 씁니다.
+  자막 렌더링 비용이 0이고, 플레이어에서 켜고 끌 수 있습니다.
+- "sprite": 서로 다른 자막 줄마다 투명 PNG를 한 번만 그려 (text, style, resolution) 키로 캐시하고,
+  자막 구간에만 해당 스프라이트가 보이도록 하나의 VFR 오버레이 스트림으로 합성합니다.
+"""
+
+import os
+import subprocess
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.cache_utils import DiskCache, get_named_cache, make_cache_key
+from utils.tracing import span
+
+SUBTITLE_MODES = ("burn", "soft", "sprite")
+
+# 번인 자막(ASS Default 스타일)과 같은 모양을 내기 위한 값
+# ASS에 PlayRes가 없으면 libass는 384x288 기준으로 스타일 값을 확대합니다.
+SUBTITLE_FONT_FAMILY = "Noto Sans CJK KR"
+ASS_PLAY_RES = (384, 288)
+ASS_FONT_SIZE = 48
+ASS_OUTLINE = 3
+ASS_MARGIN = 10
+
+# 스타일이 바뀌면 올려서 기존 스프라이트 캐시를 무효화합니다.
+SPRITE_STYLE_VERSION = 1
+
+# 스프라이트 시각 정밀도 (ASS 자막과 같은 1/100초)
+SPRITE_DECIMALS = 2
+
+
+def validate_subtitle_mode(subtitle_mode: str, supported=SUBTITLE_MODES) -> None:
+    """지원하지 않는 자막 방식이면 ValueError를 발생시킵니다."""
+    if subtitle_mode not in supported:
+        raise ValueError(
+            f"지원하지 않는 subtitle_mode 입니다: {subtitle_mode} (가능: {', '.join(supported)})"
+        )
+
+
+# ---------- soft ----------
+
+def subtitle_json_to_vtt(subs: List[Dict[str, Any]], vtt_path: str) -> str:
+    """자막 JSON을 WebVTT 사이드카 파일로 저장합니다."""
+    def fmt(t):
+        ms = int(round(t * 1000))
+        h, ms = divmod(ms, 3600 * 1000)
+        m, ms = divmod(ms, 60 * 1000)
+        s, ms = divmod(ms, 1000)
+        return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+    with open(vtt_path, "w", encoding="utf-8") as f:
+        f.write("WEBVTT\n\n")
+        for index, sub in enumerate(subs, start=1):
+            f.write(f"{index}\n{fmt(sub['start'])} --> {fmt(sub['end'])}\n{sub['text']}\n\n")
+    return vtt_path
+
+
+def soft_subtitle_args(subtitle_path: str, input_index: int) -> Tuple[List[str], List[str]]:
+    """자막 파일을 mov_text 트랙으로 mux하는 ffmpeg 입력/출력 인자를 만듭니다.
+
+    Args:
+        subtitle_path: ASS/SRT 자막 파일 경로
+        input_index: 자막 입력의 ffmpeg 입력 인덱스
+
+    Returns:
+        (input_args, output_args) 튜플
+    """
+    input_args = ["-i", subtitle_path]
+    output_args = [
+        "-map", f"{input_index}:s",
+        "-c:s", "mov_text",
+        "-metadata:s:s:0", "language=kor",
+    ]
+    return input_args, output_args
+
+
+# ---------- sprite ----------
+
+def get_sprite_cache() -> DiskCache:
+    """자막 스프라이트 캐시를 반환합니다.
+
+    - `SUBTITLE_SPRITE_CACHE_DIR`: 캐시 디렉터리
+    - `SUBTITLE_SPRITE_CACHE_MAX_BYTES`: 용량 제한 (기본값: 512MB)
+    """
+    return get_named_cache(
+        "subtitle_sprites",
+        env_dir="SUBTITLE_SPRITE_CACHE_DIR",
+        env_max_bytes="SUBTITLE_SPRITE_CACHE_MAX_BYTES",
+        default_max_bytes=512 * 1024 ** 2,
+        suffix=".png",
+    )
+
+
+@lru_cache(maxsize=8)
+def resolve_subtitle_font(fallback_path: Optional[str] = None) -> Tuple[str, int]:
+    """번인 자막과 같은 폰트 파일을 fontconfig로 찾습니다 (프로세스당 1회).
+
+    libass도 fontconfig로 `SUBTITLE_FONT_FAMILY`를 찾으므로 같은 글꼴이 선택됩니다.
+    찾지 못하면 `fallback_path`(렌더링 font_path)를 사용합니다.
+
+    Returns:
+        (폰트 파일 경로, 컬렉션 내 인덱스) 튜플
+    """
+    try:
+        proc = subprocess.run(
+            ["fc-match", "-f", "%{file}\t%{index}", SUBTITLE_FONT_FAMILY],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        path, _, index = proc.stdout.partition("\t")
+        if path and os.path.isfile(path):
+            return path, int(index or 0)
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        pass
+    if fallback_path and os.path.isfile(fallback_path):
+        return fallback_path, 0
+    raise FileNotFoundError(f"자막 폰트를 찾을 수 없습니다: {SUBTITLE_FONT_FAMILY}")
+
+
+def sprite_style(width: int, height: int, font_file: str, font_index: int) -> Dict[str, Any]:
+    """ASS Default 스타일을 출력 해상도 픽셀 단위로 환산합니다."""
+    scale_x = width / ASS_PLAY_RES[0]
+    scale_y = height / ASS_PLAY_RES[1]
+    return {
+        "version": SPRITE_STYLE_VERSION,
+        "font_file": font_file,
+        "font_index": font_index,
+        "font_size": max(1, round(ASS_FONT_SIZE * scale_y)),
+        "outline": max(1, round(ASS_OUTLINE * scale_y)),
+        "margin_h": round(ASS_MARGIN * scale_x),
+        "margin_v": round(ASS_MARGIN * scale_y),
+    }
+
+
+def _wrap_text(draw, text: str, font, max_width: int) -> List[str]:
+    """한 줄 폭이 max_width를 넘지 않도록 단어(없으면 글자) 단위로 줄바꿈합니다."""
+    lines: List[str] = []
+    current = ""
+    for word in text.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if current and draw.textlength(candidate, font=font) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+        # 공백 없는 긴 단어는 글자 단위로 자릅니다.
+        while draw.textlength(current, font=font) > max_width and len(current) > 1:
+            cut = len(current) - 1
+            while cut > 1 and draw.textlength(current[:cut], font=font) > max_width:
+                cut -= 1
+            lines.append(current[:cut])
+            current = current[cut:]
+    if current:
+        lines.append(current)
+    return lines
+
+
+def rasterize_sprite(text: str, width: int, style: Dict[str, Any]) -> bytes:
+    """자막 한 줄을 흰 글자 + 검은 외곽선의 투명 PNG로 그립니다.
+
+    가로는 출력 폭, 세로는 글자 높이에 맞춘 RGBA 이미지이며 글자는 가운데 정렬됩니다.
+    """
+    from io import BytesIO
+
+    from PIL import Image, ImageDraw, ImageFont
+
+    font = ImageFont.truetype(style["font_file"], style["font_size"], index=style["font_index"])
+    outline = style["outline"]
+    measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    lines = _wrap_text(measure, text, font, width - 2 * style["margin_h"]) or [""]
+
+    ascent, descent = font.getmetrics()
+    line_height = ascent + descent
+    sprite_height = line_height * len(lines) + 2 * outline
+
+    image = Image.new("RGBA", (width, sprite_height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for row, line in enumerate(lines):
+        draw.text(
+            (width / 2, outline + row * line_height),
+            line,
+            font=font,
+            anchor="ma",
+            fill=(255, 255, 255, 255),
+            stroke_width=outline,
+            stroke_fill=(0, 0, 0, 255),
+        )
+
+    buffer = BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _sprite_track_events(
+    subs: List[Dict[str, Any]], total_duration: float
+) -> List[Tuple[float, Optional[str]]]:
+    """(duration, text) 구간 리스트. text가 None이면 자막이 없는 구간입니다."""
+    end_time = round(total_duration, SPRITE_DECIMALS)
+    events: List[Tuple[float, Optional[str]]] = []
+    cursor = 0.0
+    for sub in sorted(subs, key=lambda s: s["start"]):
+        start = max(round(sub["start"], SPRITE_DECIMALS), cursor)
+        end = min(round(sub["end"], SPRITE_DECIMALS), end_time)
+        if end <= start:
+            continue
+        if start > cursor:
+            events.append((round(start - cursor, SPRITE_DECIMALS), None))
+        events.append((round(end - start, SPRITE_DECIMALS), sub["text"]))
+        cursor = end
+    if end_time > cursor:
+        events.append((round(end_time - cursor, SPRITE_DECIMALS), None))
+    return events
+
+
+def build_sprite_track(
+    subs: List[Dict[str, Any]],
+    total_duration: float,
+    width: int,
+    height: int,
+    output_dir: str,
+    font_path: Optional[str] = None,
+    cache: Optional[DiskCache] = None,
+) -> Tuple[str, int]:
+    """자막 스프라이트 오버레이 스트림(concat demuxer 목록)을 만듭니다.
+
+    1. 서로 다른 자막 줄마다 스프라이트를 한 번만 만들고 캐시합니다
+       (키: 텍스트 + 스타일 + 해상도).
+    2. 모든 스프라이트를 같은 높이(가장 높은 스프라이트 기준) 띠 이미지로 맞춰
+       출력 디렉터리에 저장합니다. 자막 없는 구간은 투명 띠 하나를 공유합니다.
+    3. 구간마다 띠 이미지와 길이를 적은 ffconcat 목록을 씁니다.
+       각 항목은 프레임 하나가 되므로 오버레이 입력은 자막 변경 시점에만 디코딩됩니다.
+
+    Args:
+        subs: 자막 리스트
+        total_duration: 전체 길이(초)
+        width: 출력 가로 해상도
+        height: 출력 세로 해상도
+        output_dir: 스프라이트와 목록을 저장할 디렉터리
+        font_path: fontconfig로 자막 폰트를 찾지 못할 때 쓸 폰트
+        cache: 스프라이트 캐시 (None이면 `get_sprite_cache()`)
+
+    Returns:
+        (ffconcat 목록 경로, 오버레이 y 좌표) 튜플
+    """
+    from io import BytesIO
+
+    from PIL import Image
+
+    cache = cache or get_sprite_cache()
+    font_file, font_index = resolve_subtitle_font(font_path)
+    style = sprite_style(width, height, font_file, font_index)
+    events = _sprite_track_events(subs, total_duration)
+    texts = list(dict.fromkeys(text for _, text in events if text is not None))
+
+    sprite_dir = os.path.join(output_dir, "subtitle_sprites")
+    os.makedirs(sprite_dir, exist_ok=True)
+
+    sprites: Dict[str, Any] = {}
+    rendered = 0
+    with span("subtitle.sprites", kind="subtitle", sprites=len(texts)) as sp:
+        for text in texts:
+            key = make_cache_key("subtitle_sprite", text, style, width, height)
+            data = cache.get_bytes(key)
+            if data is None:
+                data = rasterize_sprite(text, width, style)
+                cache.put_bytes(key, data)
+                rendered += 1
+            sp.add("bytes", len(data))
+            sprites[text] = Image.open(BytesIO(data))
+        sp.set(rendered=rendered, cache_hits=len(texts) - rendered)
+
+    band_height = min(height, max((image.height for image in sprites.values()), default=1))
+    band_y = max(0, height - style["margin_v"] - band_height)
+
+    def save_band(image, path):
+        band = Image.new("RGBA", (width, band_height), (0, 0, 0, 0))
+        if image is not None:
+            band.paste(image, (0, band_height - min(image.height, band_height)))
+        band.save(path, format="PNG")
+        return path
+
+    blank_path = save_band(None, os.path.join(sprite_dir, "blank.png"))
+    band_paths = {
+        text: save_band(image, os.path.join(sprite_dir, f"{index:05d}.png"))
+        for index, (text, image) in enumerate(sprites.items())
+    }
+
+    def entry(path: str) -> str:
+        escaped = os.path.abspath(path).replace("'", "'\\''")
+        return f"file '{escaped}'\n"
+
+    list_path = os.path.join(sprite_dir, "sprites.ffconcat")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("ffconcat version 1.0\n")
+        for duration, text in events:
+            f.write(entry(band_paths[text] if text is not None else blank_path))
+            f.write(f"duration {duration:.{SPRITE_DECIMALS}f}\n")
+        # concat demuxer는 마지막 항목의 duration을 무시하므로 마지막 파일을 한 번 더 적습니다.
+        last = events[-1][1] if events else None
+        f.write(entry(band_paths[last] if last is not None else blank_path))
+
+    print(f"🔤 자막 스프라이트: 서로 다른 줄 {len(texts)}개, 구간 {len(events)}개")
+    return list_path, band_y
+
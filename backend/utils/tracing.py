@@ -0,0 +1,276 @@
+"""트레이싱/메트릭 - 스테이지, 외부 API 호출, ffmpeg 서브프로세스 단위 스팬을 기록합니다.
+
+활성 트레이스와 현재 스팬은 `contextvars`로 전달되므로,
+스레드 풀에 작업을 넘길 때는 `propagate`로 감싸야 부모-자식 관계가 유지됩니다.
+활성 트레이스가 없으면 `span`은 아무것도 기록하지 않습니다.
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# OTLP 내보내기 시 사용하는 계측 범위 이름
+INSTRUMENTATION_SCOPE = "ai-story-video"
+
+# 스팬 종류 (attributes["kind"])
+# - stage: 파이프라인 스테이지
+# - llm / image / tts: 외부 API를 사용하는 작업 단위
+# - api: 레이트 리밋/재시도가 적용된 개별 공급자 호출
+# - ffmpeg: ffmpeg 서브프로세스
+
+
+class Span:
+    """하나의 작업 구간. 시간은 Unix 시각(초)으로 기록합니다."""
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def set(self, **attributes: Any) -> None:
+        """속성을 설정합니다 (예: `cache_hit=True`)."""
+        with self._lock:
+            self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """숫자 속성을 누적합니다 (예: 재시도 횟수, 바이트 수)."""
+        with self._lock:
+            self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "status": self.status,
+            "error": self.error,
+            "attributes": dict(self.attributes),
+        }
+
+
+class _NoopSpan:
+    """활성 트레이스가 없을 때 사용하는 빈 스팬."""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """파이프라인 한 번 실행 동안의 스팬 모음 (스레드 안전)."""
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.trace_id = secrets.token_hex(16)
+        self.attributes = dict(attributes)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """종료된 스팬들을 시작 시각 순으로 반환합니다."""
+        with self._lock:
+            spans = list(self.spans)
+        return [span.to_dict() for span in sorted(spans, key=lambda s: s.start)]
+
+    def write_jsonl(self, path: str) -> str:
+        """스팬을 한 줄에 하나씩 JSON Lines로 저장합니다."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.to_dicts():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return path
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OpenTelemetry OTLP/JSON(`ExportTraceServiceRequest`) 형식으로 변환합니다.
+
+        결과를 그대로 OTLP/HTTP 수집기의 `/v1/traces`에 POST할 수 있습니다.
+        """
+        spans = []
+        for record in self.to_dicts():
+            otlp_span = {
+                "traceId": record["trace_id"],
+                "spanId": record["span_id"],
+                "name": record["name"],
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(int(record["start"] * 1e9)),
+                "endTimeUnixNano": str(int((record["end"] or record["start"]) * 1e9)),
+                "attributes": _otlp_attributes(record["attributes"]),
+                "status": (
+                    {"code": 2, "message": record["error"] or ""}
+                    if record["status"] == "error"
+                    else {"code": 1}
+                ),
+            }
+            if record["parent_id"]:
+                otlp_span["parentSpanId"] = record["parent_id"]
+            spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes(
+                            {"service.name": self.name, **self.attributes}
+                        )
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": INSTRUMENTATION_SCOPE}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+
+    def write_otlp(self, path: str) -> str:
+        """OTLP/JSON 형식으로 저장합니다."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_otlp(), f, ensure_ascii=False)
+        return path
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace]:
+    """새 트레이스를 활성화합니다. 블록 안의 `span`은 이 트레이스에 기록됩니다."""
+    trace = Trace(name, **attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """현재 스팬의 자식 스팬을 열고 블록 실행 시간을 기록합니다.
+
+    예외가 발생하면 스팬 상태를 "error"로 기록한 뒤 예외를 다시 발생시킵니다.
+    활성 트레이스가 없으면 `NOOP_SPAN`을 반환합니다.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    current = Span(trace, name, parent.span_id if parent else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        current.end = time.time()
+        _current_span.reset(token)
+        trace._record(current)
+
+
+def current_span() -> Any:
+    """현재 스팬을 반환합니다 (없으면 `NOOP_SPAN`)."""
+    return _current_span.get() or NOOP_SPAN
+
+
+def propagate(func: Callable[..., T]) -> Callable[..., T]:
+    """현재 트레이스 컨텍스트를 다른 스레드에서도 이어받도록 함수를 감쌉니다.
+
+    `executor.submit(propagate(func), ...)`처럼 사용합니다.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return context.copy().run(func, *args, **kwargs)
+
+    return run
+
+
+def _file_size(path: Optional[str]) -> Optional[int]:
+    if path and os.path.isfile(path):
+        return os.path.getsize(path)
+    return None
+
+
+def run_ffmpeg(
+    cmd: Sequence[str],
+    name: str,
+    inputs: Sequence[str] = (),
+    output: Optional[str] = None,
+    **kwargs: Any,
+) -> subprocess.CompletedProcess:
+    """ffmpeg 서브프로세스를 실행하고 `ffmpeg.{name}` 스팬으로 기록합니다.
+
+    입력 파일 크기 합계(bytes_in)와 출력 파일 크기(bytes_out)를 함께 기록합니다.
+    `kwargs`는 `subprocess.run`에 그대로 전달됩니다 (기본값: check=True).
+
+    Args:
+        cmd: 실행할 명령
+        name: 스팬 이름 접미사 (예: "render", "bgm_mix")
+        inputs: 입력 파일 경로들
+        output: 출력 파일 경로
+    """
+    kwargs.setdefault("check", True)
+    with span(f"ffmpeg.{name}", kind="ffmpeg") as sp:
+        sp.set(bytes_in=sum(_file_size(path) or 0 for path in inputs))
+        result = subprocess.run(cmd, **kwargs)
+        sp.set(returncode=result.returncode, bytes_out=_file_size(output))
+        return result
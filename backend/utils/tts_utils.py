@@ -1,20 +1,33 @@
 """TTS 관련 유틸리티"""
 
+import hashlib
 import json
 import os
 import re
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
-from moviepy.audio.AudioClip import concatenate_audioclips
-from moviepy.editor import AudioFileClip
 from google.cloud import texttospeech_v1beta1 as texttospeech
 
+from utils.audio_utils import concat_audio_files, get_audio_duration, mp3_duration
 from utils.auth import get_tts_client
+from utils.cache_utils import DiskCache, get_named_cache, make_cache_key
+from utils.rate_limiter import rate_limited_call
+from utils.run_manifest import RunManifest
+from utils.sentence_index import SentenceIndex, sentence_index_path
+from utils.tracing import current_span, propagate, span
 
 # 설정 상수
 VOICE_NAME = "ko-KR-Wavenet-C"
 MAX_SUBTITLE_CHARS = 24
 FPS = 24
+DEFAULT_TTS_MAX_WORKERS = 8
+# SSML 구성 방식(문장 사이 break 등)이 바뀌면 올려서 기존 TTS 캐시를 무효화합니다.
+TTS_CACHE_VERSION = 1
+# 청크 경계: max_bytes의 이 비율 이상 채운 뒤 문장 해시가 CHUNK_BREAK_MODULUS로
+# 나누어떨어지면 자름 (청크를 거의 가득 채워 TTS 요청 수는 기존과 비슷하게 유지)
+CHUNK_MIN_RATIO = 0.8
+CHUNK_BREAK_MODULUS = 4
 
 
 def split_sentences(text: str) -> List[str]:
@@ -45,8 +58,27 @@ def split_sentences(text: str) -> List[str]:
     return sentences
 
 
-def chunk_text_by_bytes(text: str, max_bytes: int = 3000) -> List[str]:
-    """UTF-8 바이트 길이를 기준으로 텍스트를 여러 청크로 나눕니다."""
+def _is_chunk_break(sentence: str) -> bool:
+    """문장 내용만으로 정해지는 청크 경계 후보인지 판단합니다 (content-defined chunking)."""
+    digest = hashlib.sha1(sentence.encode("utf-8")).digest()
+    return digest[0] % CHUNK_BREAK_MODULUS == 0
+
+
+def chunk_text_by_bytes(
+    text: str,
+    max_bytes: int = 3000,
+    min_bytes: Optional[int] = None,
+) -> List[str]:
+    """UTF-8 바이트 길이를 기준으로 텍스트를 여러 청크로 나눕니다.
+
+    앞에서부터 꽉 채우면 원고 앞부분을 고칠 때 이후 모든 청크 경계가 밀려
+    TTS 캐시가 거의 전부 빗나갑니다. 그래서 `min_bytes`(기본값: max_bytes의
+    `CHUNK_MIN_RATIO`) 이상 모인 뒤에는 내용 해시로 고른 경계 문장(`_is_chunk_break`)에서
+    자르고, 다음 문장이 `max_bytes`를 넘길 때는 기존처럼 자릅니다.
+    경계가 대부분 문장 내용으로 정해지므로 수정된 문장 근처 청크만 다시 합성됩니다.
+    """
+    if min_bytes is None:
+        min_bytes = int(max_bytes * CHUNK_MIN_RATIO)
     sentences = split_sentences(text)
     chunks: List[str] = []
     current = ""
@@ -55,9 +87,11 @@ def chunk_text_by_bytes(text: str, max_bytes: int = 3000) -> List[str]:
         candidate = (current + " " + sentence).strip()
         if len(candidate.encode("utf-8")) > max_bytes and current:
             chunks.append(current)
-            current = sentence
-        else:
-            current = candidate
+            candidate = sentence
+        current = candidate
+        if len(current.encode("utf-8")) >= min_bytes and _is_chunk_break(sentence):
+            chunks.append(current)
+            current = ""
 
     if current:
         chunks.append(current)
@@ -122,19 +156,21 @@ def split_segment_by_length(seg: Dict[str, Any], max_chars: int) -> List[Dict[st
     return results
 
 
-def synthesize_chunk(
-    client,
+def build_chunk_request(
     chunk_text: str,
     chunk_index: int,
-    offset: float,
-    tts_audio_dir: str,
     voice_name: str,
     speaking_rate: float,
-) -> Tuple[float, List[Dict[str, Any]]]:
-    """SSML `<mark>`를 사용해 청크 단위 TTS를 생성합니다."""
+) -> Tuple[Any, List[Tuple[str, str]]]:
+    """청크 텍스트로 SSML `<mark>` 기반 TTS 요청을 구성합니다.
+
+    Returns:
+        (request, marks) 튜플. 문장이 없으면 request는 None입니다.
+        - marks: (mark 이름, 문장) 리스트
+    """
     sentences = split_sentences(chunk_text)
     if not sentences:
-        return 0.0, []
+        return None, []
 
     ssml_parts = ["<speak>"]
     marks: List[Tuple[str, str]] = []
@@ -164,30 +200,145 @@ def synthesize_chunk(
             texttospeech.SynthesizeSpeechRequest.TimepointType.SSML_MARK
         ],
     )
+    return request, marks
 
-    try:
-        response = client.synthesize_speech(request=request)
-    except Exception as exc:
-        print(f"❌ TTS 실패: {exc}")
+
+def get_tts_cache() -> DiskCache:
+    """TTS 청크 캐시를 반환합니다.
+
+    - `TTS_CACHE_DIR`: 캐시 디렉터리
+    - `TTS_CACHE_MAX_BYTES`: 용량 제한 (기본값: 2GB)
+    """
+    return get_named_cache(
+        "tts",
+        env_dir="TTS_CACHE_DIR",
+        env_max_bytes="TTS_CACHE_MAX_BYTES",
+        default_max_bytes=2 * 1024 ** 3,
+    )
+
+
+def _tts_cache_keys(
+    marks: List[Tuple[str, str]],
+    voice_name: str,
+    speaking_rate: float,
+) -> Tuple[str, str]:
+    """(음성, 속도, 정규화된 문장 목록)으로 오디오/메타 캐시 키를 만듭니다.
+
+    mark 이름에는 청크 번호가 들어가므로 키에서 제외합니다.
+    덕분에 앞쪽 청크가 바뀌어 번호가 밀려도 같은 문장 묶음은 캐시에 적중합니다.
+    """
+    sentences = [sentence.strip() for _, sentence in marks]
+    audio_key = make_cache_key(
+        "tts", TTS_CACHE_VERSION, voice_name, speaking_rate, sentences
+    )
+    return audio_key, make_cache_key(audio_key, "meta")
+
+
+def synthesize_chunk_audio(
+    client,
+    chunk_text: str,
+    chunk_index: int,
+    tts_audio_dir: str,
+    voice_name: str,
+    speaking_rate: float,
+    cache: Optional[DiskCache] = None,
+    manifest: Optional[RunManifest] = None,
+) -> Tuple[float, List[Tuple[str, float]]]:
+    """청크 TTS를 생성해 `chunk_{index}.mp3`로 저장합니다.
+
+    오프셋과 무관하게 동작하므로 여러 청크를 동시에 호출할 수 있습니다.
+    `cache`가 주어지면 오디오와 문장별 mark 시각, 길이를 함께 캐시하므로
+    적중 시 Google TTS 호출 없이 동일한 자막 타이밍을 복원합니다.
+    `manifest`가 resume 모드이면 같은 문장 묶음으로 이미 저장된 청크 파일을 그대로 재사용합니다.
+
+    Returns:
+        (duration, sentence_times) 튜플
+        - duration: 청크 오디오 길이(초)
+        - sentence_times: (문장, 청크 시작 기준 시각) 리스트
+    """
+    request, marks = build_chunk_request(
+        chunk_text, chunk_index, voice_name, speaking_rate
+    )
+    if request is None:
         return 0.0, []
 
     os.makedirs(tts_audio_dir, exist_ok=True)
     out_path = os.path.join(tts_audio_dir, f"chunk_{chunk_index}.mp3")
+    audio_key, meta_key = _tts_cache_keys(marks, voice_name, speaking_rate)
+    item = f"chunk_{chunk_index}"
+    sp = current_span()
+    sp.set(bytes_in=len(chunk_text.encode("utf-8")))
+
+    if manifest is not None:
+        record = manifest.get_item("tts", item, audio_key, out_path)
+        if record is not None:
+            sp.set(resumed=True, bytes_out=os.path.getsize(out_path))
+            sentence_times = [(text, float(t)) for text, t in record["sentence_times"]]
+            return float(record["duration"]), sentence_times
+
+    if cache is not None:
+        meta = cache.get_json(meta_key)
+        if meta is not None and cache.copy_to(audio_key, out_path):
+            sp.set(cache_hit=True, bytes_out=os.path.getsize(out_path))
+            sentence_times = [(text, float(t)) for text, t in meta["sentence_times"]]
+            if manifest is not None:
+                manifest.mark_item(
+                    "tts", item, audio_key,
+                    duration=float(meta["duration"]), sentence_times=sentence_times,
+                )
+            return float(meta["duration"]), sentence_times
+
+    # 실패한 청크를 조용히 건너뛰면 오디오가 빠진 채로 렌더링되므로,
+    # 재시도 후에도 실패하면 예외를 발생시킵니다.
+    try:
+        response = rate_limited_call(
+            "google_tts",
+            lambda: client.synthesize_speech(request=request),
+            tokens=len(chunk_text),
+            label=f"chunk_{chunk_index}",
+        )
+    except Exception as exc:
+        print(f"❌ TTS 실패: {exc}")
+        raise RuntimeError(f"TTS 청크 {chunk_index} 합성 실패: {exc}") from exc
 
     with open(out_path, "wb") as file:
         file.write(response.audio_content)
+    sp.set(cache_hit=False, bytes_out=len(response.audio_content))
 
-    clip = AudioFileClip(out_path)
-    duration = clip.duration
-    clip.close()
+    # 응답 MP3의 프레임 헤더로 길이 계산 (디코더 프로세스 없음)
+    duration = mp3_duration(response.audio_content)
+    if duration is None:
+        duration = get_audio_duration(out_path)
 
     time_map = {tp.mark_name: float(tp.time_seconds) for tp in response.timepoints}
 
+    sentence_times = [
+        (sent_text, time_map[name]) for name, sent_text in marks if name in time_map
+    ]
+
+    if cache is not None:
+        cache.put_bytes(audio_key, response.audio_content)
+        cache.put_json(
+            meta_key,
+            {"duration": duration, "sentence_times": sentence_times},
+        )
+    if manifest is not None:
+        manifest.mark_item(
+            "tts", item, audio_key, duration=duration, sentence_times=sentence_times
+        )
+
+    return duration, sentence_times
+
+
+def build_chunk_segments(
+    sentence_times: List[Tuple[str, float]],
+    offset: float,
+    duration: float,
+) -> List[Dict[str, Any]]:
+    """청크 내 문장 시각에 오프셋을 더해 자막 세그먼트를 만듭니다."""
     segments: List[Dict[str, Any]] = []
-    for name, sent_text in marks:
-        if name not in time_map:
-            continue
-        start = quantize_time(offset + time_map[name])
+    for sent_text, sent_time in sentence_times:
+        start = quantize_time(offset + sent_time)
         segments.append({"text": sent_text.strip(), "start": start})
 
     segments.sort(key=lambda item: item["start"])
@@ -198,7 +349,23 @@ def synthesize_chunk(
         else:
             segment["end"] = quantize_time(offset + duration)
 
-    return duration, segments
+    return segments
+
+
+def synthesize_chunk(
+    client,
+    chunk_text: str,
+    chunk_index: int,
+    offset: float,
+    tts_audio_dir: str,
+    voice_name: str,
+    speaking_rate: float,
+) -> Tuple[float, List[Dict[str, Any]]]:
+    """SSML `<mark>`를 사용해 청크 단위 TTS를 생성합니다."""
+    duration, sentence_times = synthesize_chunk_audio(
+        client, chunk_text, chunk_index, tts_audio_dir, voice_name, speaking_rate
+    )
+    return duration, build_chunk_segments(sentence_times, offset, duration)
 
 
 def generate_tts_and_subtitle(
@@ -209,10 +376,23 @@ def generate_tts_and_subtitle(
     google_key_file: str = None,
     voice_name: str = None,
     speaking_rate: float = 1.0,
+    max_workers: int = DEFAULT_TTS_MAX_WORKERS,
+    cache: Optional[DiskCache] = None,
+    concat_method: str = "auto",
+    manifest: Optional[RunManifest] = None,
 ) -> None:
     """
     입력 텍스트로부터 TTS 오디오와 자막 JSON 파일을 생성합니다.
     
+    청크들은 최대 `max_workers`개씩 동시에 합성되고,
+    각 청크의 오프셋은 합성이 끝난 뒤 청크 순서대로 길이를 누적해 계산하므로
+    자막 타이밍은 순차 실행과 동일합니다.
+    `cache`가 주어지면 바뀌지 않은 청크는 Google TTS를 호출하지 않습니다.
+    청크 오디오는 디코딩 없이 병합합니다 (`concat_method`, 기본값: "auto").
+    `manifest`가 resume 모드이면 이전 실행에서 완료된 청크는 다시 합성하지 않습니다.
+    문장별 전체 오디오 기준 시작 시각은 자막 JSON 옆 `sentence_index.json`에 저장되어
+    렌더링 단계에서 챕터 경계를 찾는 데 쓰입니다.
+    
     주의: GCP 인증은 이미 설정되어 있어야 합니다.
     google_key_file 파라미터는 호환성을 위해 유지되지만 사용되지 않습니다.
     """
@@ -229,20 +409,31 @@ def generate_tts_and_subtitle(
 
     selected_voice = voice_name or VOICE_NAME
 
-    for index, chunk in enumerate(chunks):
-        duration, segments = synthesize_chunk(
-            client,
-            chunk,
-            index,
-            offset,
-            tts_audio_dir,
-            selected_voice,
-            speaking_rate,
-        )
+    def synthesize(index: int) -> Tuple[float, List[Tuple[str, float]]]:
+        with span("tts.chunk", kind="tts", chunk=index):
+            return synthesize_chunk_audio(
+                client,
+                chunks[index],
+                index,
+                tts_audio_dir,
+                selected_voice,
+                speaking_rate,
+                cache,
+                manifest,
+            )
+
+    workers = max(1, min(max_workers, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk_results = list(executor.map(propagate(synthesize), range(len(chunks))))
+
+    for index, (duration, sentence_times) in enumerate(chunk_results):
         audio_paths.append(os.path.join(tts_audio_dir, f"chunk_{index}.mp3"))
-        all_segments.extend(segments)
+        all_segments.extend(build_chunk_segments(sentence_times, offset, duration))
         offset += duration
 
+    if cache is not None:
+        print(f"♻️ TTS 캐시 통계: {cache.stats()}")
+
     refined: List[Dict[str, Any]] = []
     for segment in all_segments:
         refined.extend(split_segment_by_length(segment, MAX_SUBTITLE_CHARS))
@@ -255,25 +446,28 @@ def generate_tts_and_subtitle(
             continue
         clean.append(segment)
 
-    clips: List[AudioFileClip] = []
+    existing_paths: List[str] = []
     for path in audio_paths:
         if not os.path.exists(path):
             print(f"⚠️ 오디오 파일이 존재하지 않아 건너뜁니다: {path}")
             continue
-        clips.append(AudioFileClip(path))
+        existing_paths.append(path)
 
-    if not clips:
+    if not existing_paths:
         print("❌ 병합할 오디오 클립이 없습니다.")
         return
 
-    final_audio = concatenate_audioclips(clips)
-    final_audio.write_audiofile(tts_output_path)
+    method = concat_audio_files(existing_paths, tts_output_path, method=concat_method)
+    print(f"🔗 오디오 병합 완료 ({method}): {len(existing_paths)}개 청크")
 
     os.makedirs(os.path.dirname(subtitle_json_path), exist_ok=True)
     with open(subtitle_json_path, "w", encoding="utf-8") as file:
         json.dump(clean, file, ensure_ascii=False, indent=4)
+    sentence_index = SentenceIndex.from_chunks(chunk_results)
+    sentence_index.write(sentence_index_path(subtitle_json_path))
 
     print(
-        f"🎉 완료! 자막 {len(clean)}개 생성, TTS 저장됨 → {tts_output_path}"
+        f"🎉 완료! 자막 {len(clean)}개, 문장 인덱스 {len(sentence_index)}개 생성, "
+        f"TTS 저장됨 → {tts_output_path}"
     )
 